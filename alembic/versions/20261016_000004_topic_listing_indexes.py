@@ -0,0 +1,42 @@
+"""topic listing indexes
+
+Revision ID: 20261016_000004
+Revises: 20260216_000003
+Create Date: 2026-10-16 00:00:04
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_000004"
+down_revision: Union[str, Sequence[str], None] = "20260216_000003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_topics_created_at_id", "topics", ["created_at", "id"], unique=False)
+    op.create_index(
+        "ix_topics_slug_pattern",
+        "topics",
+        ["slug"],
+        unique=False,
+        postgresql_ops={"slug": "varchar_pattern_ops"},
+    )
+    op.create_index(
+        "ix_topics_tags",
+        "topics",
+        ["tags"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"tags": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_topics_tags", table_name="topics")
+    op.drop_index("ix_topics_slug_pattern", table_name="topics")
+    op.drop_index("ix_topics_created_at_id", table_name="topics")
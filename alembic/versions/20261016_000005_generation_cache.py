@@ -0,0 +1,42 @@
+"""generation cache
+
+Revision ID: 20261016_000005
+Revises: 20261016_000004
+Create Date: 2026-10-16 00:00:05
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_000005"
+down_revision: Union[str, Sequence[str], None] = "20261016_000004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "generation_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=255), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("ix_generation_cache_expires_at", "generation_cache", ["expires_at"], unique=False)
+    op.create_index("ix_generation_cache_last_used_at", "generation_cache", ["last_used_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_generation_cache_last_used_at", table_name="generation_cache")
+    op.drop_index("ix_generation_cache_expires_at", table_name="generation_cache")
+    op.drop_table("generation_cache")
@@ -0,0 +1,75 @@
+"""batch shards
+
+Revision ID: 20261016_000006
+Revises: 20261016_000005
+Create Date: 2026-10-16 00:00:06
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_000006"
+down_revision: Union[str, Sequence[str], None] = "20261016_000005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+batch_status = postgresql.ENUM("queued", "running", "succeeded", "failed", name="batch_status", create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "batch_shards",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("batch_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("shard_index", sa.Integer(), nullable=False),
+        sa.Column("status", batch_status, nullable=False, server_default=sa.text("'queued'")),
+        sa.Column("openai_batch_id", sa.String(length=255), nullable=True),
+        sa.Column("input_file_id", sa.String(length=255), nullable=True),
+        sa.Column("remote_status", sa.String(length=64), nullable=True),
+        sa.Column("request_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("byte_size", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["batch_id"], ["batches.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_batch_shards_batch_id", "batch_shards", ["batch_id"], unique=False)
+
+    op.add_column("batch_items", sa.Column("shard_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        "batch_items_shard_id_fkey", "batch_items", "batch_shards", ["shard_id"], ["id"], ondelete="SET NULL"
+    )
+    op.create_index("ix_batch_items_shard_id", "batch_items", ["shard_id"], unique=False)
+
+    op.execute(
+        """
+        INSERT INTO batch_shards (id, batch_id, shard_index, status, openai_batch_id, request_count, created_at, updated_at)
+        SELECT gen_random_uuid(), b.id, 0, b.status, b.openai_batch_id,
+               (SELECT count(*) FROM batch_items i WHERE i.batch_id = b.id), b.created_at, b.updated_at
+        FROM batches b
+        WHERE b.openai_batch_id IS NOT NULL
+        """
+    )
+    op.execute(
+        """
+        UPDATE batch_items i
+        SET shard_id = s.id
+        FROM batch_shards s
+        WHERE s.batch_id = i.batch_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_batch_items_shard_id", table_name="batch_items")
+    op.drop_constraint("batch_items_shard_id_fkey", "batch_items", type_="foreignkey")
+    op.drop_column("batch_items", "shard_id")
+    op.drop_index("ix_batch_shards_batch_id", table_name="batch_shards")
+    op.drop_table("batch_shards")
@@ -0,0 +1,30 @@
+"""batch shard ingest progress
+
+Revision ID: 20261016_000007
+Revises: 20261016_000006
+Create Date: 2026-10-16 00:00:07
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_000007"
+down_revision: Union[str, Sequence[str], None] = "20261016_000006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("batch_shards", sa.Column("output_file_id", sa.String(length=255), nullable=True))
+    op.add_column(
+        "batch_shards", sa.Column("ingested_lines", sa.BigInteger(), nullable=False, server_default=sa.text("0"))
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("batch_shards", "ingested_lines")
+    op.drop_column("batch_shards", "output_file_id")
@@ -0,0 +1,39 @@
+"""unique artifact per run and lang
+
+Revision ID: 20261016_000008
+Revises: 20261016_000007
+Create Date: 2026-10-16 00:00:08
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_000008"
+down_revision: Union[str, Sequence[str], None] = "20261016_000007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        DELETE FROM artifacts a
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY run_id, lang ORDER BY updated_at DESC, created_at DESC, id DESC
+            ) AS position
+            FROM artifacts
+        ) ranked
+        WHERE a.id = ranked.id AND ranked.position > 1
+        """
+    )
+    op.drop_index("ix_artifacts_run_id_lang", table_name="artifacts")
+    op.create_index("ix_artifacts_run_id_lang", "artifacts", ["run_id", "lang"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_artifacts_run_id_lang", table_name="artifacts")
+    op.create_index("ix_artifacts_run_id_lang", "artifacts", ["run_id", "lang"], unique=False)
@@ -0,0 +1,34 @@
+"""batch auto polling
+
+Revision ID: 20261016_000009
+Revises: 20261016_000008
+Create Date: 2026-10-16 00:00:09
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_000009"
+down_revision: Union[str, Sequence[str], None] = "20261016_000008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("batches", sa.Column("next_poll_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "ix_batches_running_next_poll_at",
+        "batches",
+        ["next_poll_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'running'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_batches_running_next_poll_at", table_name="batches")
+    op.drop_column("batches", "next_poll_at")
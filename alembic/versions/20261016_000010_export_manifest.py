@@ -0,0 +1,40 @@
+"""export manifest
+
+Revision ID: 20261016_000010
+Revises: 20261016_000009
+Create Date: 2026-10-16 00:00:10
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_000010"
+down_revision: Union[str, Sequence[str], None] = "20261016_000009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+artifact_lang = postgresql.ENUM("fr", "en", name="artifact_lang", create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_manifest",
+        sa.Column("slug", sa.String(length=255), nullable=False),
+        sa.Column("lang", artifact_lang, nullable=False),
+        sa.Column("path", sa.Text(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("artifact_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("artifact_updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("exported_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("slug", "lang"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("export_manifest")
@@ -0,0 +1,55 @@
+"""run ledger
+
+Revision ID: 20261016_000013
+Revises: 20261016_000012
+Create Date: 2026-10-16 00:00:13
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_000013"
+down_revision: Union[str, Sequence[str], None] = "20261016_000012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "run_ledger",
+        sa.Column("run_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("model", sa.String(length=255), nullable=False),
+        sa.Column("mode", sa.String(length=16), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("retries", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("enqueued_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("queue_wait_ms", sa.Integer(), nullable=True),
+        sa.Column("model_latency_ms", sa.Integer(), nullable=True),
+        sa.Column("parse_ms", sa.Integer(), nullable=True),
+        sa.Column("persist_ms", sa.Integer(), nullable=True),
+        sa.Column("total_ms", sa.Integer(), nullable=True),
+        sa.Column("input_tokens", sa.Integer(), nullable=True),
+        sa.Column("output_tokens", sa.Integer(), nullable=True),
+        sa.Column("cached_tokens", sa.Integer(), nullable=True),
+        sa.Column("total_tokens", sa.Integer(), nullable=True),
+        sa.Column("cost_usd", sa.Numeric(14, 6), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["run_id"], ["runs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("run_id"),
+    )
+    op.create_index("ix_run_ledger_finished_at", "run_ledger", ["finished_at"], unique=False)
+    op.create_index("ix_run_ledger_model_finished_at", "run_ledger", ["model", "finished_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_run_ledger_model_finished_at", table_name="run_ledger")
+    op.drop_index("ix_run_ledger_finished_at", table_name="run_ledger")
+    op.drop_table("run_ledger")
@@ -0,0 +1,26 @@
+"""run trace id
+
+Revision ID: 20261016_000014
+Revises: 20261016_000013
+Create Date: 2026-10-16 00:00:14
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261016_000014"
+down_revision: Union[str, Sequence[str], None] = "20261016_000013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("runs", sa.Column("trace_id", sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("runs", "trace_id")
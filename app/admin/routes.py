@@ -1,11 +1,8 @@
 import json
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any
 from uuid import UUID
 
-import yaml
-from fastapi import APIRouter, Depends, Form, Request, Response, status
+from fastapi import APIRouter, Depends, Form, Query, Request, Response, status
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy import select
@@ -14,14 +11,22 @@ from sqlalchemy.orm import Session, selectinload
 
 from app.admin.auth import require_admin_access
 from app.admin.utils import compute_export_gate
-from app.batch_pipeline import create_openai_batch, poll_openai_batch
+from app.batch_pipeline import BatchPollInProgress, create_openai_batch, poll_openai_batch
+from app.batch_tasks import reparse_failed
 from app.config import settings
 from app.dependencies import get_db
+from app.events import run_status_stream
+from app.export import export_runs
+from app.mdx import render_artifact
 from app.models import Artifact, ArtifactLang, Batch, BatchItem, Run, RunStatus, Topic
-from app.tasks import generate_run
+from app.pagination import paginate_topics
+from app.streaming import read_partial
+from app.tasks import enqueue_generation
+from app.tracing import trace_url
 
 router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_access)])
 templates = Jinja2Templates(directory="app/templates")
+templates.env.globals["trace_url"] = trace_url
 
 
 def _tags_from_input(tags_input: str) -> dict:
@@ -132,20 +137,35 @@ def _run_context(run: Run, export_message: str | None = None, export_files: dict
     }
 
 
-def _render_mdx(frontmatter: dict[str, Any], body_mdx: str) -> str:
-    fm_text = yaml.safe_dump(frontmatter or {}, sort_keys=False, allow_unicode=True).strip()
-    return f"---\n{fm_text}\n---\n\n{(body_mdx or '').rstrip()}\n"
-
-
 @router.get("")
 def admin_index() -> RedirectResponse:
     return RedirectResponse(url="/admin/topics", status_code=302)
 
 
 @router.get("/topics")
-def admin_topics(request: Request, db: Session = Depends(get_db)):
-    topics = list(db.scalars(select(Topic).order_by(Topic.created_at.desc())))
-    return templates.TemplateResponse("admin/topics.html", {"request": request, "topics": topics})
+def admin_topics(
+    request: Request,
+    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    slug_prefix: str = "",
+    tag: str = "",
+):
+    slug_prefix = slug_prefix.strip()
+    tag = tag.strip()
+    try:
+        topics, next_cursor = paginate_topics(db, cursor=cursor, slug_prefix=slug_prefix or None, tag=tag or None)
+    except ValueError:
+        return RedirectResponse(url="/admin/topics", status_code=302)
+
+    context = {
+        "request": request,
+        "topics": topics,
+        "next_cursor": next_cursor,
+        "filters": {"slug_prefix": slug_prefix, "tag": tag},
+    }
+    if cursor and request.headers.get("HX-Request") == "true":
+        return templates.TemplateResponse("admin/partials/topic_rows.html", context)
+    return templates.TemplateResponse("admin/topics.html", context)
 
 
 @router.get("/topics/new")
@@ -349,7 +369,7 @@ def admin_generate_topic(id: UUID, request: Request, db: Session = Depends(get_d
     db.commit()
     db.refresh(run)
 
-    generate_run.delay(str(run.id))
+    enqueue_generation(run.id)
     target_url = f"/admin/runs/{run.id}"
     if request.headers.get("HX-Request") == "true":
         response = Response(status_code=status.HTTP_200_OK)
@@ -363,7 +383,7 @@ def admin_run_detail(run_id: UUID, request: Request, db: Session = Depends(get_d
     run = db.scalar(select(Run).options(selectinload(Run.topic), selectinload(Run.artifacts)).where(Run.id == run_id))
     if run is None:
         return RedirectResponse(url="/admin/topics", status_code=302)
-    context = {"request": request, **_run_context(run)}
+    context = {"request": request, **_run_context(run), "run_id": run.id, "partial": None}
     return templates.TemplateResponse("admin/run_detail.html", context)
 
 
@@ -375,6 +395,30 @@ def admin_run_status(run_id: UUID, request: Request, db: Session = Depends(get_d
     return templates.TemplateResponse("admin/partials/run_status.html", {"request": request, "run": run, "topic": run.topic})
 
 
+@router.get("/runs/{run_id}/events")
+async def admin_run_events(run_id: UUID):
+    response = await run_status_stream(run_id)
+    if response is None:
+        return Response("Run not found", status_code=404)
+    return response
+
+
+@router.get("/runs/{run_id}/stream")
+def admin_run_stream(run_id: UUID, request: Request):
+    partial = read_partial(run_id)
+    return templates.TemplateResponse(
+        "admin/partials/run_stream.html", {"request": request, "run_id": run_id, "partial": partial}
+    )
+
+
+@router.get("/artifacts/{artifact_id}/preview")
+def admin_preview_artifact(artifact_id: UUID, db: Session = Depends(get_db)):
+    artifact = db.get(Artifact, artifact_id)
+    if artifact is None:
+        return Response("Artifact not found", status_code=404)
+    return Response(render_artifact(artifact), media_type="text/plain; charset=utf-8")
+
+
 @router.patch("/artifacts/{artifact_id}")
 def admin_patch_artifact(
     artifact_id: UUID,
@@ -432,78 +476,82 @@ def admin_export_run(run_id: UUID, request: Request, db: Session = Depends(get_d
             status_code=500,
         )
 
-    repo_root = Path(settings.blog_repo_path)
-    fr_path = repo_root / "src" / "content" / "blog" / "fr" / f"{run.topic.slug}.mdx"
-    en_path = repo_root / "src" / "content" / "blog" / "en" / f"{run.topic.slug}.mdx"
-
-    fr_path.parent.mkdir(parents=True, exist_ok=True)
-    en_path.parent.mkdir(parents=True, exist_ok=True)
-
-    fr_artifact = context["fr_artifact"]
-    en_artifact = context["en_artifact"]
-    fr_path.write_text(_render_mdx(fr_artifact.frontmatter, fr_artifact.body_mdx), encoding="utf-8")
-    en_path.write_text(_render_mdx(en_artifact.frontmatter, en_artifact.body_mdx), encoding="utf-8")
+    result = export_runs(db, [run])[0]
+    if result["status"] == "error":
+        context["export_gate"]["ready"] = False
+        context["export_gate"]["reasons"].extend(result["reasons"])
+        return templates.TemplateResponse(
+            "admin/partials/export_panel.html",
+            {"request": request, **context},
+            status_code=500,
+        )
 
-    context = _run_context(
-        run,
-        export_message="Export completed. Both FR+EN files were written.",
-        export_files={"fr": str(fr_path), "en": str(en_path)},
-    )
+    if result["skipped"]:
+        export_message = f"Export completed. Written: {', '.join(result['written']) or 'none'}; unchanged: {', '.join(result['skipped'])}."
+    else:
+        export_message = "Export completed. Both FR+EN files were written."
+    context = _run_context(run, export_message=export_message, export_files=result["files"])
     return templates.TemplateResponse("admin/partials/export_panel.html", {"request": request, **context})
 
 
-@router.get("/batches")
-def admin_batches(request: Request, db: Session = Depends(get_db)):
+def _batches_page(request: Request, db: Session, message: str | None = None, level: str = "info", status_code: int = 200):
     topics = list(db.scalars(select(Topic).order_by(Topic.slug.asc())))
     batches = list(db.scalars(select(Batch).order_by(Batch.created_at.desc()).limit(30)))
     return templates.TemplateResponse(
         "admin/batches.html",
-        {"request": request, "topics": topics, "batches": batches, "message": None, "level": "info"},
+        {"request": request, "topics": topics, "batches": batches, "message": message, "level": level},
+        status_code=status_code,
     )
 
 
+REPARSE_QUEUED_MESSAGE = "Re-parse of failed runs queued; statuses update as the maintenance worker processes them."
+BATCH_NOTICES = {"reparse-queued": (REPARSE_QUEUED_MESSAGE, "info")}
+
+
+def _enqueue_reparse(batch_id: UUID | None = None) -> tuple[str, str]:
+    try:
+        reparse_failed.delay(str(batch_id) if batch_id else None)
+    except Exception as exc:
+        return f"Re-parse enqueue failed: {exc}", "error"
+    return REPARSE_QUEUED_MESSAGE, "info"
+
+
+@router.get("/batches")
+def admin_batches(request: Request, db: Session = Depends(get_db), notice: str | None = Query(None)):
+    message, level = BATCH_NOTICES.get(notice, (None, "info"))
+    return _batches_page(request, db, message, level)
+
+
 @router.post("/batches")
 def admin_create_batch(request: Request, db: Session = Depends(get_db), topic_ids: list[str] = Form(default=[]), model: str = Form("")):
     if not topic_ids:
-        topics = list(db.scalars(select(Topic).order_by(Topic.slug.asc())))
-        batches = list(db.scalars(select(Batch).order_by(Batch.created_at.desc()).limit(30)))
-        return templates.TemplateResponse(
-            "admin/batches.html",
-            {
-                "request": request,
-                "topics": topics,
-                "batches": batches,
-                "message": "Select at least one topic to create a batch.",
-                "level": "error",
-            },
-            status_code=400,
-        )
+        return _batches_page(request, db, "Select at least one topic to create a batch.", "error", status_code=400)
 
     try:
         batch = create_openai_batch(db, [UUID(topic_id) for topic_id in topic_ids], model.strip() or None)
     except Exception as exc:
-        topics = list(db.scalars(select(Topic).order_by(Topic.slug.asc())))
-        batches = list(db.scalars(select(Batch).order_by(Batch.created_at.desc()).limit(30)))
-        return templates.TemplateResponse(
-            "admin/batches.html",
-            {
-                "request": request,
-                "topics": topics,
-                "batches": batches,
-                "message": f"Batch creation failed: {exc}",
-                "level": "error",
-            },
-            status_code=502,
-        )
+        return _batches_page(request, db, f"Batch creation failed: {exc}", "error", status_code=502)
 
     return RedirectResponse(url=f"/admin/batches/{batch.id}", status_code=status.HTTP_303_SEE_OTHER)
 
 
+@router.post("/runs/reparse-failed")
+def admin_reparse_failed_runs(request: Request, db: Session = Depends(get_db)):
+    message, level = _enqueue_reparse()
+    if level == "error":
+        return _batches_page(request, db, message, level, status_code=503)
+    return RedirectResponse(url="/admin/batches?notice=reparse-queued", status_code=status.HTTP_303_SEE_OTHER)
+
+
 @router.get("/batches/{batch_id}")
 def admin_batch_detail(batch_id: UUID, request: Request, db: Session = Depends(get_db)):
     batch = db.scalar(
         select(Batch)
-        .options(selectinload(Batch.items).selectinload(BatchItem.run), selectinload(Batch.items).selectinload(BatchItem.topic))
+        .options(
+            selectinload(Batch.shards),
+            selectinload(Batch.items).selectinload(BatchItem.run),
+            selectinload(Batch.items).selectinload(BatchItem.topic),
+        )
         .where(Batch.id == batch_id)
     )
     if batch is None:
@@ -514,14 +562,43 @@ def admin_batch_detail(batch_id: UUID, request: Request, db: Session = Depends(g
 
 @router.post("/batches/{batch_id}/poll")
 def admin_batch_poll(batch_id: UUID, request: Request, db: Session = Depends(get_db)):
+    message = None
     try:
         poll_openai_batch(db, batch_id)
+    except BatchPollInProgress:
+        message = "This batch is already being polled; showing its current state."
     except Exception as exc:
         return Response(f"Batch poll failed: {exc}", status_code=502)
 
     batch = db.scalar(
         select(Batch)
-        .options(selectinload(Batch.items).selectinload(BatchItem.run), selectinload(Batch.items).selectinload(BatchItem.topic))
+        .options(
+            selectinload(Batch.shards),
+            selectinload(Batch.items).selectinload(BatchItem.run),
+            selectinload(Batch.items).selectinload(BatchItem.topic),
+        )
         .where(Batch.id == batch_id)
     )
-    return templates.TemplateResponse("admin/partials/batch_detail_panel.html", {"request": request, "batch": batch})
+    return templates.TemplateResponse(
+        "admin/partials/batch_detail_panel.html", {"request": request, "batch": batch, "message": message, "level": "info"}
+    )
+
+
+@router.post("/batches/{batch_id}/reparse")
+def admin_batch_reparse(batch_id: UUID, request: Request, db: Session = Depends(get_db)):
+    message, level = _enqueue_reparse(batch_id)
+    batch = db.scalar(
+        select(Batch)
+        .options(
+            selectinload(Batch.shards),
+            selectinload(Batch.items).selectinload(BatchItem.run),
+            selectinload(Batch.items).selectinload(BatchItem.topic),
+        )
+        .where(Batch.id == batch_id)
+    )
+    if batch is None:
+        return Response("Batch not found", status_code=404)
+    return templates.TemplateResponse(
+        "admin/partials/batch_detail_panel.html",
+        {"request": request, "batch": batch, "message": message, "level": level},
+    )
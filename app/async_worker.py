@@ -0,0 +1,297 @@
+import argparse
+import asyncio
+import logging
+import queue
+import signal
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from celery import states
+from celery.utils.time import get_exponential_backoff_interval
+from kombu.message import Message
+from openai import RateLimitError
+from opentelemetry.trace import Status, StatusCode
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.celery_app import BULK_GENERATION_QUEUE, INTERACTIVE_GENERATION_QUEUE, celery_app
+from app.config import settings
+from app.db_pool import engine_options
+from app.events import TERMINAL_RUN_STATUSES, defer_run_events, publish_run_statuses_async
+from app.generation_runner import (
+    RATE_LIMIT_ERRORS,
+    GenerationJob,
+    begin_generation,
+    complete_generation,
+    fail_generation,
+    model_call_span,
+    record_response_usage,
+    requeue_generation,
+)
+from app.ledger import elapsed_ms
+from app.metrics import observe_openai_call, observe_task, start_metrics_server
+from app.openai_client import get_async_openai_client
+from app.rate_limit import acquire_capacity_async, observe_rate_limit_headers_async, record_usage_async
+from app.streaming import astream_response, finish_partial_async
+from app.tracing import configure_tracing, task_span, traced
+from app.tasks import generate_run
+
+logger = logging.getLogger(__name__)
+
+GENERATION_QUEUES = (INTERACTIVE_GENERATION_QUEUE, BULK_GENERATION_QUEUE)
+DRAIN_TIMEOUT_SECONDS = 0.2
+
+
+async def acall_model(job: GenerationJob) -> Any:
+    with traced("openai.rate_limit.acquire", model=job.model, estimated_tokens=job.estimated_tokens):
+        await acquire_capacity_async(job.model, job.estimated_tokens)
+    client = get_async_openai_client()
+    started = time.perf_counter()
+    with model_call_span(job) as span, observe_openai_call("responses.create", job.model):
+        if settings.generation_streaming_enabled:
+            response = await astream_response(
+                client, job.run_id, job.request, on_headers=lambda headers: observe_rate_limit_headers_async(job.model, headers)
+            )
+        else:
+            raw = await client.responses.with_raw_response.create(**job.request)
+            await observe_rate_limit_headers_async(job.model, raw.headers)
+            response = raw.parse()
+        record_response_usage(span, response)
+    job.ledger["model_latency_ms"] = elapsed_ms(started, time.perf_counter())
+    await record_usage_async(job.model, job.estimated_tokens, response)
+    return response
+
+
+class GenerationRequeued(Exception):
+    def __init__(self, countdown: float) -> None:
+        super().__init__(f"Requeued after {countdown:.1f}s")
+        self.countdown = countdown
+
+
+class AsyncGenerationWorker:
+    def __init__(self, queue_names: list[str], concurrency: int) -> None:
+        self.queue_names = queue_names
+        self.concurrency = concurrency
+        self.engine = create_async_engine(settings.database_url, **engine_options("async_worker", is_async=True))
+        self.sessions = async_sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+        self._settled: queue.SimpleQueue = queue.SimpleQueue()
+        self._accepting = threading.Event()
+        self._finished = threading.Event()
+        self._in_flight: set[asyncio.Task] = set()
+        self._slots = asyncio.Semaphore(concurrency)
+        # Messages waiting for their ETA hold no slot; the consumer widens prefetch by this many.
+        self._delayed = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop: asyncio.Event | None = None
+
+    async def _transition(self, fn: Any, *args: Any) -> Any:
+        # The DB session is only held around the short state transitions, never across the model call.
+        # Status events are published afterwards on the async Redis client so the loop never blocks on Redis.
+        async with self.sessions() as session:
+            events = defer_run_events(session.sync_session)
+            try:
+                return await session.run_sync(fn, *args)
+            finally:
+                if events:
+                    await publish_run_statuses_async(events)
+                for payload in events:
+                    if payload["status"] in TERMINAL_RUN_STATUSES:
+                        await finish_partial_async(payload["run_id"])
+
+    async def generate(self, run_id: UUID, use_cache: bool | None, retries: int) -> dict[str, Any]:
+        job, result = await self._transition(begin_generation, run_id, use_cache, retries)
+        if job is None:
+            return result
+
+        try:
+            response = await acall_model(job)
+        except RATE_LIMIT_ERRORS as exc:
+            if retries >= settings.openai_rate_limit_max_requeues:
+                await self._transition(fail_generation, job.run_id, exc, job.ledger)
+                raise
+            if isinstance(exc, RateLimitError):
+                await observe_rate_limit_headers_async(job.model, exc.response.headers, blocked=True)
+            countdown = await self._transition(requeue_generation, job, exc, False)
+            raise GenerationRequeued(countdown) from exc
+        except Exception as exc:
+            await self._transition(fail_generation, job.run_id, exc, job.ledger)
+            raise
+
+        return await self._transition(complete_generation, job, response)
+
+    def _republish(self, message: Message, args: list, kwargs: dict, retries: int, countdown: float) -> None:
+        generate_run.apply_async(
+            args=args,
+            kwargs=kwargs,
+            task_id=message.headers["id"],
+            retries=retries,
+            countdown=countdown,
+            queue=message.delivery_info.get("routing_key") or INTERACTIVE_GENERATION_QUEUE,
+            priority=message.properties.get("priority"),
+        )
+
+    async def _handle(self, message: Message) -> None:
+        headers = message.headers
+        if headers.get("task") != generate_run.name:
+            logger.error("Async worker cannot run task %s; requeueing", headers.get("task"))
+            self._settled.put((message, "requeue"))
+            return
+
+        args, kwargs, _ = message.decode()
+        task_id = headers["id"]
+        retries = int(headers.get("retries") or 0)
+        if not await self._acquire_slot(headers.get("eta")):
+            self._settled.put((message, "requeue"))
+            return
+        try:
+            await self._run_message(message, args, kwargs, task_id, retries)
+        finally:
+            self._slots.release()
+
+    async def _acquire_slot(self, eta: str | None) -> bool:
+        delay = 0.0
+        if eta:
+            eta_at = datetime.fromisoformat(eta)
+            if eta_at.tzinfo is None:
+                eta_at = eta_at.replace(tzinfo=timezone.utc)
+            delay = (eta_at - datetime.now(timezone.utc)).total_seconds()
+        if delay <= 0:
+            await self._slots.acquire()
+            return True
+
+        self._delayed += 1
+        try:
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                await self._slots.acquire()
+                return True
+            # Shutting down before the ETA: hand the message back instead of holding up the drain.
+            return False
+        finally:
+            self._delayed -= 1
+
+    async def _run_message(self, message: Message, args: list, kwargs: dict, task_id: str, retries: int) -> None:
+        headers = message.headers
+        with task_span(task_id, generate_run.name, headers) as span:
+            started = time.perf_counter()
+            outcome = states.SUCCESS
+            try:
+                result = await self.generate(UUID(args[0]), kwargs.get("use_cache"), retries)
+                await asyncio.to_thread(celery_app.backend.store_result, task_id, result, states.SUCCESS)
+            except GenerationRequeued as exc:
+                outcome = states.RETRY
+                await asyncio.to_thread(self._republish, message, args, kwargs, retries + 1, exc.countdown)
+            except Exception as exc:
+                span.record_exception(exc)
+                if retries < generate_run.max_retries:
+                    outcome = states.RETRY
+                    countdown = get_exponential_backoff_interval(
+                        factor=int(getattr(generate_run, "retry_backoff", True)),
+                        retries=retries,
+                        maximum=getattr(generate_run, "retry_backoff_max", 600),
+                        full_jitter=getattr(generate_run, "retry_jitter", True),
+                    )
+                    logger.warning("Generation %s failed, retrying in %ss", task_id, countdown, exc_info=True)
+                    await asyncio.to_thread(self._republish, message, args, kwargs, retries + 1, countdown)
+                else:
+                    outcome = states.FAILURE
+                    span.set_status(Status(StatusCode.ERROR))
+                    logger.error("Generation %s failed after %s retries", task_id, retries, exc_info=True)
+                    await asyncio.to_thread(celery_app.backend.store_result, task_id, exc, states.FAILURE)
+            finally:
+                span.set_attribute("celery.state", outcome)
+                observe_task(generate_run.name, outcome.lower(), time.perf_counter() - started)
+                self._settled.put((message, "ack"))
+
+    def _spawn(self, message: Message) -> None:
+        task = asyncio.create_task(self._handle(message))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    def _on_message(self, _body: Any, message: Message) -> None:
+        self._loop.call_soon_threadsafe(self._spawn, message)
+
+    def _settle_messages(self) -> None:
+        while True:
+            try:
+                message, action = self._settled.get_nowait()
+            except queue.Empty:
+                return
+            if action == "ack":
+                message.ack()
+            else:
+                message.requeue()
+
+    def _consume(self) -> None:
+        try:
+            self._consume_messages()
+        except Exception:
+            logger.exception("Generation consumer stopped")
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+    def _consume_messages(self) -> None:
+        # kombu channels are not thread-safe: this thread owns the connection and performs every ack.
+        queues = [celery_app.amqp.queues[name] for name in self.queue_names]
+        with celery_app.connection_for_read() as connection:
+            with connection.Consumer(
+                queues, callbacks=[self._on_message], accept=["json"], prefetch_count=self.concurrency
+            ) as consumer:
+                prefetch_count = self.concurrency
+                while not self._finished.is_set():
+                    self._settle_messages()
+                    if prefetch_count != self.concurrency + self._delayed:
+                        prefetch_count = self.concurrency + self._delayed
+                        consumer.qos(prefetch_count=prefetch_count)
+                    if not self._accepting.is_set():
+                        self._finished.wait(DRAIN_TIMEOUT_SECONDS)
+                        continue
+                    try:
+                        connection.drain_events(timeout=DRAIN_TIMEOUT_SECONDS)
+                    except socket.timeout:
+                        pass
+                self._settle_messages()
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            self._loop.add_signal_handler(sig, self._stop.set)
+
+        self._accepting.set()
+        consumer = threading.Thread(target=self._consume, name="generation-consumer", daemon=True)
+        consumer.start()
+        logger.info("Async generation worker consuming %s with %s in flight", ",".join(self.queue_names), self.concurrency)
+
+        await self._stop.wait()
+        logger.info("Stopping: waiting for %s in-flight generations", len(self._in_flight))
+        self._accepting.clear()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        self._finished.set()
+        await asyncio.to_thread(consumer.join)
+        await self.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run generate_run tasks on an asyncio event loop.")
+    parser.add_argument("-Q", "--queues", default=",".join(GENERATION_QUEUES))
+    parser.add_argument("-c", "--concurrency", type=int, default=settings.async_worker_concurrency)
+    args = parser.parse_args()
+
+    queue_names = [name.strip() for name in args.queues.split(",") if name.strip()]
+    unknown = [name for name in queue_names if name not in GENERATION_QUEUES]
+    if unknown:
+        parser.error(f"only generation queues are supported: {', '.join(unknown)}")
+
+    logging.basicConfig(level=settings.log_level)
+    start_metrics_server(settings.worker_metrics_port)
+    configure_tracing("async-worker")
+    asyncio.run(AsyncGenerationWorker(queue_names, args.concurrency).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,269 +1,689 @@
 import json
+import logging
 import os
 import tempfile
-from datetime import datetime, timezone
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from openai import OpenAI
-from sqlalchemy import select
+from redis import RedisError
+from redis.lock import Lock
+from sqlalchemy import func, insert, literal_column, or_, select, update
 from sqlalchemy.orm import Session, selectinload
 
 from app.config import settings
-from app.generation import RESPONSE_SCHEMA, build_prompt, parse_response_json_from_body, upsert_artifact
-from app.models import ArtifactLang, Batch, BatchItem, BatchStatus, Run, RunStatus, Topic
-
-
-def _client() -> OpenAI:
-    return OpenAI(api_key=settings.openai_api_key)
-
-
-def _build_request_line(run: Run, topic: Topic, model: str) -> dict[str, Any]:
+from app.db import chunked
+from app.events import commit_and_publish
+from app.generation import (
+    artifact_rows,
+    build_prompt,
+    build_response_request,
+    parse_response_json_from_body,
+    upsert_artifacts,
+)
+from app.generation_cache import cache_enabled, cache_hit_meta, generation_cache_key, get_cached_generations
+from app.ledger import elapsed_ms, ledger_row, ms_between, record_ledger, usage_tokens
+from app.metrics import observe_batch_chunk, observe_openai_call
+from app.models import Batch, BatchItem, BatchShard, BatchStatus, Run, RunResponse, RunStatus, Topic
+from app.openai_client import get_openai_client
+from app.redis_client import get_redis
+from app.run_responses import load_run_responses, run_response_row, upsert_run_responses
+from app.tracing import traced, with_current_context
+
+logger = logging.getLogger(__name__)
+
+REMOTE_RUNNING_STATUSES = {"validating", "in_progress", "finalizing"}
+REMOTE_POLL_INTERVALS = {"validating": 60.0, "in_progress": 120.0, "finalizing": 15.0}
+PENDING_ITEM_STATUSES = (BatchStatus.QUEUED, BatchStatus.RUNNING)
+
+
+class ShardFile:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.positions: list[int] = []
+        self.byte_size = 0
+
+
+def _build_request_line(run_id: UUID, topic: Topic, model: str) -> dict[str, Any]:
     return {
-        "custom_id": f"run:{run.id}",
+        "custom_id": f"run:{run_id}",
         "method": "POST",
         "url": "/v1/responses",
-        "body": {
-            "model": model,
-            "input": [
-                {
-                    "role": "system",
-                    "content": [{"type": "input_text", "text": "You are a precise content generation engine."}],
-                },
-                {
-                    "role": "user",
-                    "content": [{"type": "input_text", "text": build_prompt(topic)}],
-                },
-            ],
-            "text": {
-                "format": {
-                    "type": "json_schema",
-                    "name": RESPONSE_SCHEMA["name"],
-                    "strict": RESPONSE_SCHEMA["strict"],
-                    "schema": RESPONSE_SCHEMA["schema"],
-                }
-            },
-        },
+        "body": build_response_request(build_prompt(topic), model),
     }
 
 
-def create_openai_batch(db: Session, topic_ids: list[UUID], model: str | None) -> Batch:
-    topics = list(db.scalars(select(Topic).where(Topic.id.in_(topic_ids))))
-    topic_map = {topic.id: topic for topic in topics}
+def _iter_request_lines(pending: Iterable[tuple[int, UUID, Topic]], model: str) -> Iterator[tuple[int, bytes]]:
+    for position, run_id, topic in pending:
+        line = _build_request_line(run_id, topic, model)
+        yield position, (json.dumps(line, ensure_ascii=True) + "\n").encode("utf-8")
+
+
+def _open_shard_file() -> tuple[ShardFile, Any]:
+    handle = tempfile.NamedTemporaryFile(mode="wb", suffix=".jsonl", delete=False)
+    return ShardFile(handle.name), handle
+
+
+def _write_shard_files(lines: Iterator[tuple[int, bytes]]) -> tuple[list[ShardFile], list[int]]:
+    shard_files: list[ShardFile] = []
+    oversized: list[int] = []
+    current: ShardFile | None = None
+    handle = None
+
+    try:
+        for position, data in lines:
+            if len(data) > settings.openai_batch_max_bytes:
+                oversized.append(position)
+                continue
+            if current is not None and (
+                len(current.positions) >= settings.openai_batch_max_requests
+                or current.byte_size + len(data) > settings.openai_batch_max_bytes
+            ):
+                handle.close()
+                current = None
+            if current is None:
+                current, handle = _open_shard_file()
+                shard_files.append(current)
+            handle.write(data)
+            current.positions.append(position)
+            current.byte_size += len(data)
+    except Exception:
+        _remove_shard_files(shard_files)
+        raise
+    finally:
+        if handle is not None:
+            handle.close()
+
+    return shard_files, oversized
+
+
+def _remove_shard_files(shard_files: list[ShardFile]) -> None:
+    for shard_file in shard_files:
+        if os.path.exists(shard_file.path):
+            os.remove(shard_file.path)
+
+
+def _submit_shard(path: str) -> tuple[str, str]:
+    client = get_openai_client()
+    with traced("batch.submit_shard", bytes=os.path.getsize(path)) as span:
+        with open(path, "rb") as file_handle, observe_openai_call("files.create"):
+            uploaded = client.files.create(file=file_handle, purpose="batch")
+
+        with observe_openai_call("batches.create"):
+            batch_job = client.batches.create(
+                input_file_id=uploaded.id,
+                endpoint="/v1/responses",
+                completion_window="24h",
+            )
+        span.set_attribute("openai.batch_id", batch_job.id)
+    return uploaded.id, batch_job.id
+
+
+def _fail_item(item: BatchItem, error: str, now: datetime) -> None:
+    item.status = BatchStatus.FAILED
+    item.error = error
+    item.run.status = RunStatus.FAILED
+    item.run.error = error
+    item.run.finished_at = now
+
+
+def _fail_shard_runs(db: Session, shard_id: UUID, error: str, now: datetime) -> list[Run]:
+    db.execute(
+        update(BatchItem)
+        .where(BatchItem.shard_id == shard_id)
+        .values(status=BatchStatus.FAILED, error=error)
+        .execution_options(synchronize_session=False)
+    )
+    return list(
+        db.scalars(
+            update(Run)
+            .where(Run.id.in_(select(BatchItem.run_id).where(BatchItem.shard_id == shard_id)))
+            .values(status=RunStatus.FAILED, error=error, finished_at=now)
+            .returning(Run)
+            .execution_options(synchronize_session=False)
+        )
+    )
+
+
+def _refresh_batch_status(db: Session, batch: Batch) -> None:
+    if any(shard.status in (BatchStatus.QUEUED, BatchStatus.RUNNING) for shard in batch.shards):
+        batch.status = BatchStatus.RUNNING
+        failed_shards = sum(1 for shard in batch.shards if shard.status == BatchStatus.FAILED)
+        batch.error = f"{failed_shards} of {len(batch.shards)} shards failed" if failed_shards else None
+        return
+
+    counts = _item_status_counts(db, BatchItem.batch_id == batch.id)
+    total = sum(counts.values())
+    failed_count = total - counts.get(BatchStatus.SUCCEEDED, 0)
+    if failed_count:
+        batch.status = BatchStatus.FAILED
+        batch.error = f"{failed_count} of {total} items failed"
+    else:
+        batch.status = BatchStatus.SUCCEEDED
+        batch.error = None
+
+
+def batch_poll_delay(remote_statuses: Iterable[str | None], created_at: datetime, now: datetime) -> float:
+    intervals = [
+        REMOTE_POLL_INTERVALS.get(remote_status or "validating", settings.batch_poll_min_interval_seconds)
+        for remote_status in remote_statuses
+    ]
+    base = min(intervals, default=settings.batch_poll_min_interval_seconds)
+    age_hours = max(0.0, (now - created_at).total_seconds() / 3600)
+    delay = base * (1 + age_hours)
+    return min(max(delay, settings.batch_poll_min_interval_seconds), settings.batch_poll_max_interval_seconds)
+
+
+def _schedule_next_poll(batch: Batch, now: datetime) -> None:
+    if batch.status != BatchStatus.RUNNING:
+        batch.next_poll_at = None
+        return
+    remote_statuses = [shard.remote_status for shard in batch.shards if shard.status == BatchStatus.RUNNING]
+    batch.next_poll_at = now + timedelta(seconds=batch_poll_delay(remote_statuses, batch.created_at, now))
+
+
+def create_openai_batch(db: Session, topic_ids: list[UUID], model: str | None, use_cache: bool | None = None) -> Batch:
+    unique_ids = list(dict.fromkeys(topic_ids))
+    topic_map: dict[UUID, Topic] = {}
+    for chunk in chunked(unique_ids):
+        topic_map.update((topic.id, topic) for topic in db.scalars(select(Topic).where(Topic.id.in_(chunk))))
     missing = [str(topic_id) for topic_id in topic_ids if topic_id not in topic_map]
     if missing:
         raise ValueError(f"Topic IDs not found: {', '.join(missing)}")
 
     batch_model = model or settings.openai_model
-    batch = Batch(status=BatchStatus.QUEUED, model=batch_model)
+    batch = Batch(id=uuid4(), status=BatchStatus.QUEUED, model=batch_model)
     db.add(batch)
-    db.flush()
 
-    lines: list[dict[str, Any]] = []
-    for topic_id in topic_ids:
-        topic = topic_map[topic_id]
-        run = Run(topic_id=topic.id, status=RunStatus.QUEUED, model=batch_model, meta={})
-        db.add(run)
-        db.flush()
+    cache_keys: list[str | None] = [None] * len(topic_ids)
+    if cache_enabled(use_cache):
+        cache_keys = [generation_cache_key(build_prompt(topic_map[topic_id]), batch_model) for topic_id in topic_ids]
+    cached_entries = get_cached_generations(db, [key for key in cache_keys if key is not None])
 
-        line = _build_request_line(run, topic, batch_model)
-        lines.append(line)
+    now = datetime.now(timezone.utc)
+    run_rows: list[dict[str, Any]] = []
+    item_rows: list[dict[str, Any]] = []
+    cached_artifacts: list[dict[str, Any]] = []
+    pending: list[tuple[int, UUID, Topic]] = []
+    for position, topic_id in enumerate(topic_ids):
+        run_id = uuid4()
+        run_row = {
+            "id": run_id,
+            "topic_id": topic_id,
+            "status": RunStatus.QUEUED,
+            "model": batch_model,
+            "meta": {},
+            "error": None,
+            "started_at": None,
+            "finished_at": None,
+        }
+        item_row = {
+            "id": uuid4(),
+            "batch_id": batch.id,
+            "run_id": run_id,
+            "topic_id": topic_id,
+            "shard_id": None,
+            "custom_id": f"run:{run_id}",
+            "status": BatchStatus.QUEUED,
+            "error": None,
+        }
+
+        cached = cached_entries.get(cache_keys[position])
+        if cached is not None:
+            run_row.update(
+                status=RunStatus.SUCCEEDED,
+                meta=cache_hit_meta(cached.payload["meta"], cached),
+                started_at=now,
+                finished_at=now,
+            )
+            item_row["status"] = BatchStatus.SUCCEEDED
+            cached_artifacts.extend(artifact_rows(run_id, cached.payload))
+        else:
+            pending.append((position, run_id, topic_map[topic_id]))
 
-        db.add(
-            BatchItem(
+        run_rows.append(run_row)
+        item_rows.append(item_row)
+
+    shard_files, oversized = _write_shard_files(_iter_request_lines(pending, batch_model))
+    try:
+        for position in oversized:
+            error = "Request exceeds the batch file size limit"
+            run_rows[position].update(status=RunStatus.FAILED, error=error, finished_at=now)
+            item_rows[position].update(status=BatchStatus.FAILED, error=error)
+
+        shards: list[BatchShard] = []
+        for index, shard_file in enumerate(shard_files):
+            shard = BatchShard(
+                id=uuid4(),
                 batch_id=batch.id,
-                run_id=run.id,
-                topic_id=topic.id,
-                custom_id=line["custom_id"],
+                shard_index=index,
                 status=BatchStatus.QUEUED,
+                request_count=len(shard_file.positions),
+                byte_size=shard_file.byte_size,
             )
-        )
+            db.add(shard)
+            for position in shard_file.positions:
+                item_rows[position]["shard_id"] = shard.id
+            shards.append(shard)
+        if shards:
+            # Shards are committed before submission; if this process dies in between, the poller picks the
+            # batch up after the lease and fails the shards that never reached the provider.
+            batch.status = BatchStatus.RUNNING
+            batch.next_poll_at = now + timedelta(seconds=settings.openai_batch_submit_lease_seconds)
 
-    db.commit()
-    db.refresh(batch)
-
-    try:
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False, encoding="utf-8") as tmp:
-            tmp_path = tmp.name
-            for line in lines:
-                tmp.write(json.dumps(line, ensure_ascii=True) + "\n")
+        db.flush()
+        queued_rows = [row for row in run_rows if row["status"] == RunStatus.QUEUED]
+        settled_rows = [row for row in run_rows if row["status"] != RunStatus.QUEUED]
+        if queued_rows:
+            db.execute(insert(Run), queued_rows)
+        settled_runs = list(db.scalars(insert(Run).returning(Run), settled_rows)) if settled_rows else []
+        db.execute(insert(BatchItem), item_rows)
+        upsert_artifacts(db, cached_artifacts)
+        commit_and_publish(db, settled_runs)
+
+        if not shard_files:
+            _refresh_batch_status(db, batch)
+            db.commit()
+            db.refresh(batch)
+            return batch
+
+        with ThreadPoolExecutor(max_workers=min(len(shard_files), settings.openai_batch_concurrency)) as pool:
+            futures = [pool.submit(with_current_context(_submit_shard), shard_file.path) for shard_file in shard_files]
+    finally:
+        _remove_shard_files(shard_files)
 
-        client = _client()
-        with open(tmp_path, "rb") as file_handle:
-            uploaded = client.files.create(file=file_handle, purpose="batch")
+    failed_runs: list[Run] = []
+    submission_errors: list[str] = []
+    now = datetime.now(timezone.utc)
+    for shard, future in zip(shards, futures):
+        try:
+            shard.input_file_id, shard.openai_batch_id = future.result()
+        except Exception as exc:
+            shard.status = BatchStatus.FAILED
+            shard.error = str(exc)
+            submission_errors.append(str(exc))
+            failed_runs.extend(_fail_shard_runs(db, shard.id, f"Batch submission failed: {exc}", now))
+            continue
+        shard.status = BatchStatus.RUNNING
+        shard.error = None
 
-        batch_job = client.batches.create(
-            input_file_id=uploaded.id,
-            endpoint="/v1/responses",
-            completion_window="24h",
-        )
+    batch.openai_batch_id = shards[0].openai_batch_id if len(shards) == 1 else None
+    _refresh_batch_status(db, batch)
+    _schedule_next_poll(batch, now)
+    commit_and_publish(db, failed_runs)
+    db.refresh(batch)
 
-        batch.openai_batch_id = batch_job.id
-        batch.status = BatchStatus.RUNNING
-        batch.error = None
-        db.commit()
-        db.refresh(batch)
-        return batch
+    if len(submission_errors) == len(shards):
+        raise RuntimeError(f"Batch submission failed: {submission_errors[0]}")
+    return batch
 
-    except Exception as exc:
-        batch.status = BatchStatus.FAILED
-        batch.error = str(exc)
 
-        for item in batch.items:
-            item.status = BatchStatus.FAILED
-            item.error = f"Batch submission failed: {exc}"
-            run = item.run
-            run.status = RunStatus.FAILED
-            run.error = str(exc)
-            run.finished_at = datetime.now(timezone.utc)
+def _download_output_file(client: Any, output_file_id: str) -> str:
+    with tempfile.NamedTemporaryFile(suffix=".jsonl", delete=False) as tmp:
+        tmp_path = tmp.name
 
-        db.commit()
+    try:
+        with observe_openai_call("files.content"), client.files.with_streaming_response.content(output_file_id) as response:
+            response.stream_to_file(tmp_path)
+    except Exception:
+        os.remove(tmp_path)
         raise
+    return tmp_path
+
+
+def _iter_output_chunks(path: str, start_line: int, chunk_size: int) -> Iterator[tuple[int, list[dict[str, Any]]]]:
+    rows: list[dict[str, Any]] = []
+    line_number = 0
+    with open(path, "rb") as file_handle:
+        for line in file_handle:
+            line_number += 1
+            if line_number <= start_line or not line.strip():
+                continue
+            row = json.loads(line)
+            if row.get("custom_id"):
+                rows.append(row)
+            if len(rows) >= chunk_size:
+                yield line_number, rows
+                rows = []
+    yield line_number, rows
+
+
+def _pending_items(db: Session, shard_id: UUID, custom_ids: list[str] | None = None, limit: int | None = None) -> list[BatchItem]:
+    query = (
+        select(BatchItem)
+        .options(selectinload(BatchItem.run))
+        .where(BatchItem.shard_id == shard_id, BatchItem.status.in_(PENDING_ITEM_STATUSES))
+    )
+    if custom_ids is not None:
+        query = query.where(BatchItem.custom_id.in_(custom_ids))
+    if limit is not None:
+        query = query.order_by(BatchItem.id).limit(limit)
+    return list(db.scalars(query))
+
+
+def _item_status_counts(db: Session, *criteria: Any) -> dict[BatchStatus, int]:
+    rows = db.execute(select(BatchItem.status, func.count()).where(*criteria).group_by(BatchItem.status))
+    return {item_status: count for item_status, count in rows}
+
+
+def _fail_pending_items(db: Session, shard_id: UUID, error: str) -> None:
+    while True:
+        items = _pending_items(db, shard_id, limit=settings.openai_batch_ingest_chunk_size)
+        if not items:
+            return
+        now = datetime.now(timezone.utc)
+        for item in items:
+            _fail_item(item, error, now)
+        commit_and_publish(db, [item.run for item in items])
+
+
+def _apply_output_row(
+    item: BatchItem,
+    row: dict[str, Any],
+    now: datetime,
+    artifacts: list[dict[str, Any]],
+    responses: list[dict[str, Any]],
+) -> dict[str, Any]:
+    error = row.get("error")
+    response = row.get("response") or {}
+    status_code = response.get("status_code")
+    body = response.get("body") or {}
+    item.response_code = status_code
+    measured = usage_tokens(body.get("usage"))
+
+    if error:
+        _fail_item(item, str(error), now)
+        return measured
+
+    if isinstance(status_code, int) and status_code >= 400:
+        _fail_item(item, json.dumps(body)[:2000], now)
+        return measured
+
+    responses.append(run_response_row(item.run.id, item.run.model, body))
+
+    parse_started = time.perf_counter()
+    try:
+        payload = parse_response_json_from_body(body)
+        rows = artifact_rows(item.run.id, payload)
+    except Exception as exc:
+        _fail_item(item, str(exc), now)
+        return measured
+    measured["parse_ms"] = elapsed_ms(parse_started, time.perf_counter())
+
+    artifacts.extend(rows)
+    item.run.meta = payload["meta"]
+    item.run.status = RunStatus.SUCCEEDED
+    if item.run.started_at is None:
+        item.run.started_at = now
+    item.run.finished_at = now
+    item.run.error = None
+    item.status = BatchStatus.SUCCEEDED
+    item.error = None
+    return measured
+
+
+def _remote_time(remote: Any, field: str) -> datetime | None:
+    value = getattr(remote, field, None)
+    return datetime.fromtimestamp(value, timezone.utc) if value else None
+
+
+def _ingest_shard_output(db: Session, client: Any, shard: BatchShard, remote: Any, lock: Lock | None) -> None:
+    shard.output_file_id = remote.output_file_id
+    submitted_at = _remote_time(remote, "created_at")
+    completed_at = _remote_time(remote, "completed_at")
+    path = _download_output_file(client, remote.output_file_id)
+    try:
+        for line_number, rows in _iter_output_chunks(path, shard.ingested_lines, settings.openai_batch_ingest_chunk_size):
+            if lock is not None:
+                # Raises LockNotOwnedError if the lease lapsed, so two pollers never ingest the same lines.
+                lock.reacquire()
+            chunk_started = time.perf_counter()
+            with traced("batch.ingest_chunk", shard_id=shard.id, rows=len(rows), end_line=line_number):
+                rows_by_custom_id = {row["custom_id"]: row for row in rows}
+                items = _pending_items(db, shard.id, custom_ids=list(rows_by_custom_id)) if rows_by_custom_id else []
+                now = datetime.now(timezone.utc)
+                artifacts: list[dict[str, Any]] = []
+                responses: list[dict[str, Any]] = []
+                measured = {
+                    item.id: _apply_output_row(item, rows_by_custom_id[item.custom_id], now, artifacts, responses)
+                    for item in items
+                }
+                persist_started = time.perf_counter()
+                upsert_run_responses(db, responses)
+                upsert_artifacts(db, artifacts)
+                # Persistence is chunked, so each run is charged an even share of the chunk's write time.
+                persist_ms = elapsed_ms(persist_started, time.perf_counter()) // max(len(items), 1)
+                record_ledger(
+                    db,
+                    [
+                        ledger_row(
+                            item.run,
+                            {
+                                **measured[item.id],
+                                "mode": "batch",
+                                "queue_wait_ms": ms_between(item.run.created_at, submitted_at),
+                                "model_latency_ms": ms_between(submitted_at, completed_at),
+                                "persist_ms": persist_ms,
+                            },
+                        )
+                        for item in items
+                    ],
+                )
+                shard.ingested_lines = line_number
+                succeeded = sum(item.status == BatchStatus.SUCCEEDED for item in items)
+                commit_and_publish(db, [item.run for item in items])
+            observe_batch_chunk(succeeded, len(items) - succeeded, time.perf_counter() - chunk_started)
     finally:
-        if "tmp_path" in locals() and os.path.exists(tmp_path):
-            os.remove(tmp_path)
-
-
-def _extract_file_text(file_content: Any) -> str:
-    text = getattr(file_content, "text", None)
-    if isinstance(text, str):
-        return text
+        os.remove(path)
 
-    read_method = getattr(file_content, "read", None)
-    if callable(read_method):
-        data = read_method()
-        if isinstance(data, bytes):
-            return data.decode("utf-8")
-        if isinstance(data, str):
-            return data
+    _fail_pending_items(db, shard.id, "No batch output row for custom_id")
+    _refresh_shard_status(db, shard)
 
-    if isinstance(file_content, bytes):
-        return file_content.decode("utf-8")
 
-    raise ValueError("Unable to decode OpenAI batch output file")
+def _refresh_shard_status(db: Session, shard: BatchShard) -> None:
+    counts = _item_status_counts(db, BatchItem.shard_id == shard.id)
+    total = sum(counts.values())
+    failed_count = total - counts.get(BatchStatus.SUCCEEDED, 0)
+    if failed_count:
+        shard.status = BatchStatus.FAILED
+        shard.error = f"{failed_count} of {total} items failed"
+    else:
+        shard.status = BatchStatus.SUCCEEDED
+        shard.error = None
 
 
-def _to_batch_status(openai_status: str) -> BatchStatus:
-    if openai_status in {"validating", "in_progress", "finalizing"}:
-        return BatchStatus.RUNNING
-    if openai_status == "completed":
-        return BatchStatus.SUCCEEDED
-    return BatchStatus.FAILED
+def _retrieve_remote_batch(client: Any, openai_batch_id: str) -> Any:
+    with observe_openai_call("batches.retrieve"):
+        return client.batches.retrieve(openai_batch_id)
 
 
-def poll_openai_batch(db: Session, batch_id: UUID) -> Batch:
-    batch = db.scalar(select(Batch).options(selectinload(Batch.items).selectinload(BatchItem.run)).where(Batch.id == batch_id))
-    if batch is None:
-        raise ValueError("Batch not found")
-    if not batch.openai_batch_id:
-        raise ValueError("Batch has no openai_batch_id")
+@contextmanager
+def _batch_poll_lock(batch_id: UUID) -> Iterator[Lock | None]:
+    # Ingest commits per chunk, so a row lock would not survive it; a Redis lease covers the whole poll.
+    lock = get_redis().lock(f"batch:{batch_id}:poll", timeout=settings.batch_poll_lock_seconds)
+    try:
+        acquired = lock.acquire(blocking=False)
+    except RedisError:
+        logger.warning("Batch poll lock unavailable, polling batch %s unlocked", batch_id, exc_info=True)
+        yield None
+        return
+    if not acquired:
+        raise BatchPollInProgress(batch_id)
+    try:
+        yield lock
+    finally:
+        try:
+            lock.release()
+        except RedisError:
+            logger.warning("Failed to release poll lock for batch %s", batch_id, exc_info=True)
 
-    client = _client()
-    remote = client.batches.retrieve(batch.openai_batch_id)
-    remote_status = getattr(remote, "status", "")
 
-    if remote_status in {"validating", "in_progress", "finalizing"}:
-        batch.status = BatchStatus.RUNNING
-        db.commit()
-        db.refresh(batch)
-        return batch
+class BatchPollInProgress(Exception):
+    def __init__(self, batch_id: UUID) -> None:
+        super().__init__(f"Batch {batch_id} is already being polled")
+        self.batch_id = batch_id
 
-    if remote_status != "completed":
-        batch.status = BatchStatus.FAILED
-        batch.error = f"OpenAI batch ended with status={remote_status}"
-        for item in batch.items:
-            if item.status not in (BatchStatus.SUCCEEDED, BatchStatus.FAILED):
-                item.status = BatchStatus.FAILED
-                item.error = batch.error
-                item.run.status = RunStatus.FAILED
-                item.run.error = batch.error
-                item.run.finished_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(batch)
-        return batch
 
-    output_file_id = getattr(remote, "output_file_id", None)
-    if not output_file_id:
-        batch.status = BatchStatus.FAILED
-        batch.error = "OpenAI batch completed without output_file_id"
-        db.commit()
-        db.refresh(batch)
-        return batch
+def poll_openai_batch(db: Session, batch_id: UUID) -> Batch:
+    with _batch_poll_lock(batch_id) as lock:
+        return _poll_openai_batch(db, batch_id, lock)
 
-    file_content = client.files.content(output_file_id)
-    lines_text = _extract_file_text(file_content)
 
-    results_by_custom_id: dict[str, dict[str, Any]] = {}
-    for line in lines_text.splitlines():
-        if not line.strip():
-            continue
-        row = json.loads(line)
-        custom_id = row.get("custom_id")
-        if custom_id:
-            results_by_custom_id[custom_id] = row
+def _poll_openai_batch(db: Session, batch_id: UUID, lock: Lock | None) -> Batch:
+    batch = db.scalar(select(Batch).options(selectinload(Batch.shards)).where(Batch.id == batch_id))
+    if batch is None:
+        raise ValueError("Batch not found")
+    if not batch.shards:
+        raise ValueError("Batch has no submitted shards")
 
     now = datetime.now(timezone.utc)
-    succeeded_count = 0
-
-    for item in batch.items:
-        row = results_by_custom_id.get(item.custom_id)
-        if row is None:
-            item.status = BatchStatus.FAILED
-            item.error = "No batch output row for custom_id"
-            item.run.status = RunStatus.FAILED
-            item.run.error = item.error
-            item.run.finished_at = now
+    failed_runs: list[Run] = []
+    stale_before = now - timedelta(seconds=settings.openai_batch_submit_lease_seconds)
+    for shard in batch.shards:
+        if shard.status == BatchStatus.QUEUED and shard.created_at <= stale_before:
+            error = "Batch submission did not complete"
+            failed_runs.extend(_fail_shard_runs(db, shard.id, error, now))
+            shard.status = BatchStatus.FAILED
+            shard.error = error
+
+    pending = [shard for shard in batch.shards if shard.status == BatchStatus.RUNNING and shard.openai_batch_id]
+    client = get_openai_client()
+    with ThreadPoolExecutor(max_workers=max(1, min(len(pending), settings.openai_batch_concurrency))) as pool:
+        retrieve = with_current_context(_retrieve_remote_batch)
+        remotes = list(pool.map(lambda shard: retrieve(client, shard.openai_batch_id), pending))
+
+    for shard, remote in zip(pending, remotes):
+        remote_status = getattr(remote, "status", "")
+        shard.remote_status = remote_status
+        if remote_status in REMOTE_RUNNING_STATUSES:
             continue
 
-        error = row.get("error")
-        response = row.get("response") or {}
-        status_code = response.get("status_code")
-        body = response.get("body") or {}
-        item.response_code = status_code
-
-        if error:
-            item.status = BatchStatus.FAILED
-            item.error = str(error)
-            item.run.status = RunStatus.FAILED
-            item.run.error = item.error
-            item.run.finished_at = now
+        if remote_status == "completed" and getattr(remote, "output_file_id", None):
+            _ingest_shard_output(db, client, shard, remote, lock)
             continue
 
-        if isinstance(status_code, int) and status_code >= 400:
-            item.status = BatchStatus.FAILED
-            item.error = json.dumps(body)[:2000]
-            item.run.status = RunStatus.FAILED
-            item.run.error = item.error
-            item.run.finished_at = now
-            continue
+        if remote_status == "completed":
+            error = "OpenAI batch completed without output_file_id"
+        else:
+            error = f"OpenAI batch ended with status={remote_status}"
+        _fail_pending_items(db, shard.id, error)
+        shard.status = BatchStatus.FAILED
+        shard.error = error
+
+    _refresh_batch_status(db, batch)
+    _schedule_next_poll(batch, datetime.now(timezone.utc))
+    commit_and_publish(db, failed_runs)
+    db.refresh(batch)
+    return batch
 
-        try:
-            payload = parse_response_json_from_body(body)
-            item.run.meta = payload["meta"]
-            upsert_artifact(db, item.run.id, ArtifactLang.FR, payload["artifacts"]["fr"])
-            upsert_artifact(db, item.run.id, ArtifactLang.EN, payload["artifacts"]["en"])
-            item.run.status = RunStatus.SUCCEEDED
-            if item.run.started_at is None:
-                item.run.started_at = now
-            item.run.finished_at = now
-            item.run.error = None
-            item.status = BatchStatus.SUCCEEDED
-            item.error = None
-            succeeded_count += 1
-        except Exception as exc:
-            item.status = BatchStatus.FAILED
-            item.error = str(exc)
-            item.run.status = RunStatus.FAILED
-            item.run.error = str(exc)
-            item.run.finished_at = now
-
-    if succeeded_count == len(batch.items):
-        batch.status = BatchStatus.SUCCEEDED
-        batch.error = None
-    else:
-        batch.status = BatchStatus.FAILED
-        batch.error = f"{len(batch.items) - succeeded_count} of {len(batch.items)} items failed"
 
+def claim_due_batches(db: Session, limit: int, lease_seconds: float) -> list[UUID]:
+    now = datetime.now(timezone.utc)
+    # Inline the status literal so the planner can match the partial index predicate.
+    due = (
+        select(Batch.id)
+        .where(Batch.status == literal_column("'running'"), or_(Batch.next_poll_at.is_(None), Batch.next_poll_at <= now))
+        .order_by(Batch.next_poll_at.asc().nulls_first())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    batch_ids = list(
+        db.scalars(
+            update(Batch)
+            .where(Batch.id.in_(due))
+            .values(next_poll_at=now + timedelta(seconds=lease_seconds))
+            .returning(Batch.id)
+            .execution_options(synchronize_session=False)
+        )
+    )
     db.commit()
-    db.refresh(batch)
-    return batch
+    return batch_ids
+
+
+def _refresh_reparsed_batches(db: Session, run_ids: list[UUID]) -> None:
+    batch_ids: set[UUID] = set()
+    for chunk in chunked(run_ids):
+        batch_ids.update(db.scalars(select(BatchItem.batch_id).where(BatchItem.run_id.in_(chunk)).distinct()))
+    batches = [
+        batch
+        for chunk in chunked(list(batch_ids))
+        for batch in db.scalars(select(Batch).options(selectinload(Batch.shards)).where(Batch.id.in_(chunk)))
+    ]
+    now = datetime.now(timezone.utc)
+    for batch in batches:
+        if batch.status == BatchStatus.RUNNING:
+            continue
+        for shard in batch.shards:
+            if shard.status == BatchStatus.FAILED and shard.output_file_id:
+                _refresh_shard_status(db, shard)
+        _refresh_batch_status(db, batch)
+        _schedule_next_poll(batch, now)
+
+
+def reparse_failed_runs(db: Session, run_ids: list[UUID] | None = None, batch_id: UUID | None = None) -> dict[str, int]:
+    query = select(Run.id).join(RunResponse, RunResponse.run_id == Run.id).where(Run.status == RunStatus.FAILED)
+    if run_ids is not None:
+        query = query.where(Run.id.in_(run_ids))
+    if batch_id is not None:
+        query = query.where(Run.id.in_(select(BatchItem.run_id).where(BatchItem.batch_id == batch_id)))
+    candidate_ids = list(db.scalars(query.order_by(Run.id)))
+
+    counts = {"candidates": len(candidate_ids), "reparsed": 0, "failed": 0}
+    reparsed_ids: list[UUID] = []
+    chunk_size = settings.openai_batch_ingest_chunk_size
+    for start in range(0, len(candidate_ids), chunk_size):
+        chunk = candidate_ids[start : start + chunk_size]
+        runs = list(
+            db.scalars(
+                select(Run)
+                .where(Run.id.in_(chunk), Run.status == RunStatus.FAILED)
+                .with_for_update(skip_locked=True)
+            )
+        )
+        bodies = load_run_responses(db, [run.id for run in runs])
+        now = datetime.now(timezone.utc)
+        artifacts: list[dict[str, Any]] = []
+        succeeded: list[UUID] = []
+        measured: dict[UUID, dict[str, Any]] = {}
+        for run in runs:
+            parse_started = time.perf_counter()
+            try:
+                payload = parse_response_json_from_body(bodies[run.id])
+                rows = artifact_rows(run.id, payload)
+            except Exception as exc:
+                run.error = str(exc)
+                counts["failed"] += 1
+                continue
+            measured[run.id] = {"mode": "reparse", "parse_ms": elapsed_ms(parse_started, time.perf_counter())}
+            artifacts.extend(rows)
+            run.meta = payload["meta"]
+            run.status = RunStatus.SUCCEEDED
+            run.finished_at = now
+            run.error = None
+            succeeded.append(run.id)
+
+        persist_started = time.perf_counter()
+        upsert_artifacts(db, artifacts)
+        persist_ms = elapsed_ms(persist_started, time.perf_counter()) // max(len(succeeded), 1)
+        record_ledger(
+            db, [ledger_row(run, {**measured[run.id], "persist_ms": persist_ms}) for run in runs if run.id in measured]
+        )
+        if succeeded:
+            db.execute(
+                update(BatchItem)
+                .where(BatchItem.run_id.in_(succeeded))
+                .values(status=BatchStatus.SUCCEEDED, error=None)
+                .execution_options(synchronize_session=False)
+            )
+        counts["reparsed"] += len(succeeded)
+        reparsed_ids.extend(succeeded)
+        commit_and_publish(db, runs)
+
+    if reparsed_ids:
+        _refresh_reparsed_batches(db, reparsed_ids)
+        db.commit()
+    return counts
@@ -1,8 +1,27 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from uuid import UUID
 
-from app.batch_pipeline import poll_openai_batch
+from app.batch_pipeline import BatchPollInProgress, claim_due_batches, poll_openai_batch, reparse_failed_runs
 from app.celery_app import celery_app
+from app.config import settings
 from app.db import SessionLocal
+from app.tracing import traced, with_current_context
+
+logger = logging.getLogger(__name__)
+
+
+def _poll_result(batch_id: UUID) -> dict:
+    with SessionLocal() as db, traced("batch.poll", batch_id=batch_id):
+        batch = poll_openai_batch(db, batch_id)
+        return {
+            "batch_id": str(batch.id),
+            "status": batch.status.value,
+            "openai_batch_id": batch.openai_batch_id,
+            "shards": len(batch.shards),
+            "next_poll_at": batch.next_poll_at.isoformat() if batch.next_poll_at else None,
+            "error": batch.error,
+        }
 
 
 @celery_app.task(
@@ -13,11 +32,35 @@ from app.db import SessionLocal
     max_retries=5,
 )
 def poll_batch(self, batch_id: str) -> dict:
+    try:
+        return _poll_result(UUID(batch_id))
+    except BatchPollInProgress as exc:
+        return {"batch_id": batch_id, "status": "skipped", "error": str(exc)}
+
+
+def _poll_claimed_batch(batch_id: UUID) -> dict:
+    try:
+        return _poll_result(batch_id)
+    except BatchPollInProgress as exc:
+        return {"batch_id": str(batch_id), "status": "skipped", "error": str(exc)}
+    except Exception as exc:
+        logger.warning("Scheduled poll failed for batch %s", batch_id, exc_info=True)
+        return {"batch_id": str(batch_id), "status": "error", "error": str(exc)}
+
+
+@celery_app.task
+def poll_running_batches() -> dict:
     with SessionLocal() as db:
-        batch = poll_openai_batch(db, UUID(batch_id))
-        return {
-            "batch_id": str(batch.id),
-            "status": batch.status.value,
-            "openai_batch_id": batch.openai_batch_id,
-            "error": batch.error,
-        }
+        batch_ids = claim_due_batches(db, settings.batch_poll_limit, settings.batch_poll_min_interval_seconds)
+    if not batch_ids:
+        return {"polled": 0, "results": []}
+
+    with ThreadPoolExecutor(max_workers=min(len(batch_ids), settings.batch_poll_concurrency)) as pool:
+        results = list(pool.map(with_current_context(_poll_claimed_batch), batch_ids))
+    return {"polled": len(results), "results": results}
+
+
+@celery_app.task
+def reparse_failed(batch_id: str | None = None) -> dict:
+    with SessionLocal() as db, traced("batch.reparse_failed", batch_id=batch_id):
+        return reparse_failed_runs(db, batch_id=UUID(batch_id) if batch_id else None)
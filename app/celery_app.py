@@ -1,6 +1,34 @@
 from celery import Celery
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from kombu import Queue
 
 from app.config import settings
+from app.metrics import mark_process_dead, start_metrics_server, task_finished, task_started
+from app.tracing import (
+    configure_tracing,
+    end_task_span,
+    inject_trace_headers,
+    record_task_exception,
+    start_task_span,
+    trace_header_fields,
+)
+
+INTERACTIVE_GENERATION_QUEUE = "generation.interactive"
+BULK_GENERATION_QUEUE = "generation.bulk"
+BATCH_POLLING_QUEUE = "batches.polling"
+MAINTENANCE_QUEUE = "maintenance"
+
+# Redis delivers lower numbers first.
+INTERACTIVE_PRIORITY = 0
+BULK_PRIORITY = 6
 
 celery_app = Celery(
     "datasaaslab-platform",
@@ -16,4 +44,107 @@ celery_app.conf.update(
     accept_content=["json"],
     timezone="UTC",
     enable_utc=True,
+    # Listed in consumption order: a worker bound to several queues drains the earlier ones first.
+    task_queues=(
+        Queue(INTERACTIVE_GENERATION_QUEUE, routing_key=INTERACTIVE_GENERATION_QUEUE),
+        Queue(BATCH_POLLING_QUEUE, routing_key=BATCH_POLLING_QUEUE),
+        Queue(BULK_GENERATION_QUEUE, routing_key=BULK_GENERATION_QUEUE),
+        Queue(MAINTENANCE_QUEUE, routing_key=MAINTENANCE_QUEUE),
+    ),
+    task_default_queue=MAINTENANCE_QUEUE,
+    task_default_exchange="celery",
+    task_routes={
+        "app.tasks.generate_run": {"queue": INTERACTIVE_GENERATION_QUEUE, "priority": INTERACTIVE_PRIORITY},
+        "app.batch_tasks.*": {"queue": BATCH_POLLING_QUEUE},
+        "app.tasks.purge_idempotency_keys": {"queue": MAINTENANCE_QUEUE},
+        "app.tasks.evict_generation_cache_entries": {"queue": MAINTENANCE_QUEUE},
+        "app.batch_tasks.reparse_failed": {"queue": MAINTENANCE_QUEUE},
+    },
+    task_default_priority=3,
+    broker_transport_options={
+        "queue_order_strategy": "priority",
+        "priority_steps": list(range(10)),
+        "sep": ":",
+    },
+    worker_prefetch_multiplier=settings.celery_prefetch_multiplier,
 )
+
+celery_app.conf.beat_schedule = {
+    "purge-idempotency-keys": {
+        "task": "app.tasks.purge_idempotency_keys",
+        "schedule": 3600.0,
+    },
+    "evict-generation-cache": {
+        "task": "app.tasks.evict_generation_cache_entries",
+        "schedule": 600.0,
+    },
+}
+
+if settings.batch_auto_poll_enabled:
+    celery_app.conf.beat_schedule["poll-running-batches"] = {
+        "task": "app.batch_tasks.poll_running_batches",
+        "schedule": settings.batch_poll_schedule_seconds,
+    }
+
+
+@worker_init.connect
+def _use_worker_pool_profile(**_: object) -> None:
+    from app.db import use_pool_profile
+
+    use_pool_profile("worker")
+
+
+@worker_process_init.connect
+def _reset_pool_after_fork(**_: object) -> None:
+    from app import db
+
+    db.engine.dispose(close=False)
+
+
+@worker_init.connect
+def _start_metrics_server(**_: object) -> None:
+    # Started in the parent; prefork children report through PROMETHEUS_MULTIPROC_DIR.
+    start_metrics_server(settings.worker_metrics_port)
+
+
+@worker_process_shutdown.connect
+def _mark_metrics_process_dead(pid: int, **_: object) -> None:
+    mark_process_dead(pid)
+
+
+@task_prerun.connect
+def _start_task_timer(task_id: str, **_: object) -> None:
+    task_started(task_id)
+
+
+@task_postrun.connect
+def _observe_task(task_id: str, task: object, state: str | None = None, **_: object) -> None:
+    task_finished(task_id, task.name, state)
+
+
+@worker_init.connect
+def _configure_worker_tracing(**_: object) -> None:
+    configure_tracing("worker")
+
+
+@before_task_publish.connect
+def _inject_trace_context(headers: dict | None = None, **_: object) -> None:
+    if headers is not None:
+        inject_trace_headers(headers)
+
+
+@task_prerun.connect
+def _start_task_span(task_id: str, task: object, **_: object) -> None:
+    # Custom message headers are exposed as attributes of the task request.
+    carrier = {field: value for field in trace_header_fields() if (value := getattr(task.request, field, None))}
+    start_task_span(task_id, task.name, carrier)
+
+
+@task_failure.connect
+def _record_task_exception(task_id: str, exception: BaseException, **_: object) -> None:
+    record_task_exception(task_id, exception)
+
+
+@task_postrun.connect
+def _end_task_span(task_id: str, state: str | None = None, **_: object) -> None:
+    end_task_span(task_id, state)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,13 +11,98 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
 
     database_url: str
+    api_async_db: bool = False
+    db_pgbouncer: bool = False
+
+    api_db_pool_size: int = 10
+    api_db_max_overflow: int = 10
+    api_db_pool_timeout: float = 10.0
+    api_db_pool_recycle: int = 1800
+    api_db_null_pool: bool = False
+
+    worker_db_pool_size: int = 2
+    worker_db_max_overflow: int = 2
+    worker_db_pool_timeout: float = 30.0
+    worker_db_pool_recycle: int = 1800
+    worker_db_null_pool: bool = False
+    celery_prefetch_multiplier: int = 1
+
+    async_worker_concurrency: int = 200
+    async_worker_db_pool_size: int = 5
+    async_worker_db_max_overflow: int = 5
+    async_worker_db_pool_timeout: float = 30.0
+    async_worker_db_pool_recycle: int = 1800
+    async_worker_db_null_pool: bool = False
+    worker_metrics_port: int = 9808
     redis_url: str
     blog_repo_path: str = ""
+    export_concurrency: int = 8
+    mdx_render_cache_size: int = 2048
+    idempotency_ttl_seconds: int = 24 * 3600
+    idempotency_pending_timeout_seconds: int = 600
     admin_user: str = ""
     admin_pass: str = ""
 
     openai_api_key: str = ""
     openai_model: str = "gpt-4.1-mini"
+    openai_base_url: str = ""
+    openai_connect_timeout: float = 10.0
+    openai_read_timeout: float = 600.0
+    openai_max_retries: int = 2
+    openai_max_connections: int = 50
+    openai_max_keepalive_connections: int = 20
+    openai_keepalive_expiry: float = 60.0
+
+    openai_rate_limit_enabled: bool = True
+    openai_rate_limit_rpm: int = 500
+    openai_rate_limit_tpm: int = 200_000
+    openai_rate_limit_headroom: float = 0.9
+    openai_rate_limit_output_tokens: int = 4000
+    openai_rate_limit_max_wait_seconds: float = 30.0
+    openai_rate_limit_max_requeues: int = 50
+
+    # USD per 1M tokens; override with a JSON object in OPENAI_PRICES.
+    openai_prices: dict[str, dict[str, float]] = {
+        "gpt-4.1": {"input": 2.0, "cached_input": 0.5, "output": 8.0},
+        "gpt-4.1-mini": {"input": 0.4, "cached_input": 0.1, "output": 1.6},
+        "gpt-4.1-nano": {"input": 0.1, "cached_input": 0.025, "output": 0.4},
+        "gpt-5": {"input": 1.25, "cached_input": 0.125, "output": 10.0},
+        "gpt-5-mini": {"input": 0.25, "cached_input": 0.025, "output": 2.0},
+        "gpt-5-nano": {"input": 0.05, "cached_input": 0.005, "output": 0.4},
+    }
+    openai_batch_discount: float = 0.5
+
+    openai_batch_max_requests: int = 50000
+    openai_batch_max_bytes: int = 200_000_000
+    openai_batch_concurrency: int = 4
+    openai_batch_ingest_chunk_size: int = 500
+    openai_batch_submit_lease_seconds: float = 3600.0
+
+    batch_auto_poll_enabled: bool = True
+    batch_poll_schedule_seconds: float = 15.0
+    batch_poll_min_interval_seconds: float = 15.0
+    batch_poll_max_interval_seconds: float = 1800.0
+    batch_poll_concurrency: int = 4
+    batch_poll_limit: int = 100
+    batch_poll_lock_seconds: float = 300.0
+
+    generation_streaming_enabled: bool = True
+    generation_stream_flush_interval: float = 0.5
+    generation_stream_ttl_seconds: int = 3600
+
+    generation_cache_enabled: bool = True
+    generation_cache_ttl_seconds: int = 7 * 24 * 3600
+    generation_cache_max_entries: int = 10000
+
+    run_response_compression_level: int = 6
+
+    tracing_exporter: Literal["none", "file", "otlp", "console"] = "none"
+    tracing_service_name: str = "datasaaslab-platform"
+    tracing_file_path: str = "traces/spans.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    tracing_sample_ratio: float = 1.0
+    # e.g. http://localhost:16686/trace/{trace_id} to link runs to a Jaeger UI
+    tracing_trace_url: str = ""
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
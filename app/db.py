@@ -1,12 +1,45 @@
+from collections.abc import Iterator, Sequence
+from typing import TypeVar
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.config import settings
+from app.db_pool import PoolProfile, engine_options, pool_status
+
+T = TypeVar("T")
+
+# Postgres caps a statement at 65535 bind parameters. Multi-row inserts and IN lists over caller-sized
+# collections are issued in slices of this many rows or ids, which stays under the cap at up to 65 columns.
+BIND_CHUNK_SIZE = 1000
+
+
+def chunked(items: Sequence[T], size: int = BIND_CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+engine = create_engine(settings.database_url, **engine_options("api"))
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+async_engine = create_async_engine(settings.database_url, **engine_options("api", is_async=True))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+def use_pool_profile(profile: PoolProfile) -> None:
+    global engine
+    engine.dispose()
+    engine = create_engine(settings.database_url, **engine_options(profile))
+    SessionLocal.configure(bind=engine)
+
+
+def pool_metrics() -> dict[str, dict]:
+    return {
+        "sync": pool_status(engine.pool),
+        "async": pool_status(async_engine.sync_engine.pool),
+    }
@@ -0,0 +1,128 @@
+import threading
+import time
+from typing import Any, Literal
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from app.config import settings
+from app.metrics import observe_pool_checkout, set_pool_connections
+
+PoolProfile = Literal["api", "worker", "async_worker"]
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_s = 0.0
+        self.wait_max_s = 0.0
+
+    def record(self, wait_s: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_s += wait_s
+            self.wait_max_s = max(self.wait_max_s, wait_s)
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_s": round(self.wait_total_s, 6),
+                "wait_avg_s": round(self.wait_total_s / attempts, 6) if attempts else 0.0,
+                "wait_max_s": round(self.wait_max_s, 6),
+            }
+
+
+class _InstrumentedPoolMixin:
+    stats: PoolStats
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> Pool:
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    @property
+    def metrics_name(self) -> str:
+        return self._orig_logging_name or type(self).__name__
+
+    def _publish_connections(self) -> None:
+        set_pool_connections(self.metrics_name, self.checkedout(), self.checkedin(), max(self.overflow(), 0))
+
+    def connect(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            wait_s = time.perf_counter() - started
+            self.stats.record(wait_s, timed_out=True)
+            observe_pool_checkout(self.metrics_name, wait_s, timed_out=True)
+            raise
+        wait_s = time.perf_counter() - started
+        self.stats.record(wait_s, timed_out=False)
+        observe_pool_checkout(self.metrics_name, wait_s, timed_out=False)
+        self._publish_connections()
+        return connection
+
+    def _do_return_conn(self, record: Any) -> None:
+        super()._do_return_conn(record)
+        self._publish_connections()
+
+    def dispose(self) -> None:
+        super().dispose()
+        self._publish_connections()
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(profile: PoolProfile, is_async: bool = False) -> dict[str, Any]:
+    options: dict[str, Any] = {"pool_pre_ping": True}
+    if settings.db_pgbouncer:
+        options["connect_args"] = {"prepare_threshold": None}
+
+    if getattr(settings, f"{profile}_db_null_pool"):
+        options["poolclass"] = NullPool
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_logging_name=f"{profile}_async" if is_async and profile == "api" else profile,
+        pool_size=getattr(settings, f"{profile}_db_pool_size"),
+        max_overflow=getattr(settings, f"{profile}_db_max_overflow"),
+        pool_timeout=getattr(settings, f"{profile}_db_pool_timeout"),
+        pool_recycle=getattr(settings, f"{profile}_db_pool_recycle"),
+    )
+    return options
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    if not isinstance(pool, QueuePool):
+        return {"poolclass": type(pool).__name__}
+
+    status: dict[str, Any] = {
+        "poolclass": type(pool).__name__,
+        "size": pool.size(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    stats = getattr(pool, "stats", None)
+    if isinstance(stats, PoolStats):
+        status.update(stats.snapshot())
+    return status
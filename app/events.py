@@ -0,0 +1,217 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+from typing import Any
+from uuid import UUID
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from redis import RedisError
+from redis.asyncio import Redis as AsyncRedis
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models import Run, RunStatus
+from app.redis_client import get_async_redis, get_redis
+from app.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+RUN_STATUS_PATTERN = "run:*:status"
+TERMINAL_RUN_STATUSES = {RunStatus.SUCCEEDED.value, RunStatus.FAILED.value}
+DEFERRED_EVENTS_KEY = "deferred_run_events"
+HEARTBEAT_SECONDS = 15.0
+SNAPSHOT_TTL_SECONDS = 24 * 3600
+
+
+def _channel(run_id: UUID | str) -> str:
+    return f"run:{run_id}:status"
+
+
+def _snapshot_key(run_id: UUID | str) -> str:
+    return f"run:{run_id}:status:last"
+
+
+def run_status_payload(run: Run) -> dict[str, Any]:
+    return {
+        "run_id": str(run.id),
+        "status": run.status.value,
+        "error": run.error,
+        "started_at": run.started_at.isoformat() if run.started_at else None,
+        "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+    }
+
+
+def _queue_run_statuses(pipeline: Any, payloads: Iterable[dict[str, Any]]) -> None:
+    for payload in payloads:
+        message = json.dumps(payload)
+        pipeline.set(_snapshot_key(payload["run_id"]), message, ex=SNAPSHOT_TTL_SECONDS)
+        pipeline.publish(_channel(payload["run_id"]), message)
+
+
+def publish_run_statuses(payloads: Iterable[dict[str, Any]]) -> None:
+    try:
+        pipeline = get_redis().pipeline(transaction=False)
+        _queue_run_statuses(pipeline, payloads)
+        pipeline.execute()
+    except RedisError:
+        logger.warning("Failed to publish run status events", exc_info=True)
+
+
+async def publish_run_statuses_async(payloads: Iterable[dict[str, Any]]) -> None:
+    try:
+        pipeline = get_async_redis().pipeline(transaction=False)
+        _queue_run_statuses(pipeline, payloads)
+        await pipeline.execute()
+    except RedisError:
+        logger.warning("Failed to publish run status events", exc_info=True)
+
+
+def defer_run_events(db: Session) -> list[dict[str, Any]]:
+    # Sync code running on an event loop (AsyncSession.run_sync) must not block on Redis: collect the
+    # status payloads on the session instead and let the async caller publish them.
+    return db.info.setdefault(DEFERRED_EVENTS_KEY, [])
+
+
+def run_events_deferred(db: Session) -> bool:
+    return DEFERRED_EVENTS_KEY in db.info
+
+
+def commit_and_publish(db: Session, runs: Iterable[Run]) -> None:
+    # Capture payloads before commit expires the instances; publish only once the new state is visible.
+    payloads = [run_status_payload(run) for run in runs]
+    with traced("db.commit"):
+        db.commit()
+    if not payloads:
+        return
+    if run_events_deferred(db):
+        db.info[DEFERRED_EVENTS_KEY].extend(payloads)
+    else:
+        publish_run_statuses(payloads)
+
+
+class RunStatusBroker:
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._redis: AsyncRedis | None = None
+        self._listener: asyncio.Task | None = None
+        self._listener_lock = asyncio.Lock()
+
+    async def _ensure_listener(self) -> None:
+        if self._listener is not None and not self._listener.done():
+            return
+        # psubscribe yields to the loop, so concurrent first subscribers must not each start a listener.
+        async with self._listener_lock:
+            if self._listener is not None and not self._listener.done():
+                return
+            if self._redis is None:
+                self._redis = AsyncRedis.from_url(settings.redis_url, decode_responses=True)
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            await pubsub.psubscribe(RUN_STATUS_PATTERN)
+            self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub: Any) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                run_id = message["channel"].split(":")[1]
+                for queue in list(self._subscribers.get(run_id, ())):
+                    queue.put_nowait(message["data"])
+        except (RedisError, OSError):
+            logger.warning("Run status listener stopped", exc_info=True)
+        finally:
+            for subscribers in self._subscribers.values():
+                for queue in subscribers:
+                    queue.put_nowait(None)
+            await pubsub.aclose()
+
+    async def subscribe(self, run_id: UUID) -> asyncio.Queue:
+        await self._ensure_listener()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[str(run_id)].add(queue)
+        return queue
+
+    def unsubscribe(self, run_id: UUID, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(str(run_id))
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[str(run_id)]
+
+    async def snapshot(self, run_id: UUID) -> str | None:
+        await self._ensure_listener()
+        return await self._redis.get(_snapshot_key(run_id))
+
+
+broker = RunStatusBroker()
+
+
+def load_run_status(run_id: UUID) -> str | None:
+    with SessionLocal() as db:
+        run = db.get(Run, run_id)
+        return json.dumps(run_status_payload(run)) if run is not None else None
+
+
+def _sse(data: str) -> str:
+    return f"event: status\ndata: {data}\n\n"
+
+
+async def _run_status_events(run_id: UUID, queue: asyncio.Queue, initial: str) -> AsyncIterator[str]:
+    try:
+        yield _sse(initial)
+        if json.loads(initial)["status"] in TERMINAL_RUN_STATUSES:
+            return
+
+        while True:
+            try:
+                data = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if data is None:
+                return
+            yield _sse(data)
+            if json.loads(data)["status"] in TERMINAL_RUN_STATUSES:
+                return
+    finally:
+        broker.unsubscribe(run_id, queue)
+
+
+async def _snapshot_only_events(initial: str) -> AsyncIterator[str]:
+    yield _sse(initial)
+
+
+def _sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def run_status_stream(run_id: UUID) -> StreamingResponse | None:
+    try:
+        queue = await broker.subscribe(run_id)
+    except (RedisError, OSError):
+        # Without pub/sub there is nothing to follow: send the current DB state once and close the stream.
+        logger.warning("Run status events unavailable, sending a snapshot for run %s", run_id, exc_info=True)
+        initial = await run_in_threadpool(load_run_status, run_id)
+        return _sse_response(_snapshot_only_events(initial)) if initial is not None else None
+
+    try:
+        initial = await broker.snapshot(run_id)
+    except (RedisError, OSError):
+        logger.warning("Failed to read run status snapshot for run %s", run_id, exc_info=True)
+        initial = None
+    initial = initial or await run_in_threadpool(load_run_status, run_id)
+    if initial is None:
+        broker.unsubscribe(run_id, queue)
+        return None
+
+    return _sse_response(_run_status_events(run_id, queue, initial))
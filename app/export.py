@@ -0,0 +1,221 @@
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload
+
+from app.config import settings
+from app.db import chunked
+from app.mdx import render_artifact
+from app.metrics import EXPORT_WRITE_SECONDS, record_export_result
+from app.models import Artifact, ArtifactLang, BatchItem, ExportManifestEntry, Run, RunStatus, Topic
+from app.tracing import traced, with_current_context
+
+EXPORT_LANGS = (ArtifactLang.FR, ArtifactLang.EN)
+
+# os.umask can only be read by setting it, so capture it once while the process is still single-threaded.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def export_gate_reasons(run: Run, fr_artifact: Artifact | None, en_artifact: Artifact | None) -> list[str]:
+    reasons: list[str] = []
+
+    if run.status != RunStatus.SUCCEEDED:
+        reasons.append(f"run.status must be 'succeeded' (current: '{run.status.value}')")
+
+    if fr_artifact is None:
+        reasons.append("missing artifact for lang='fr'")
+    if en_artifact is None:
+        reasons.append("missing artifact for lang='en'")
+
+    if fr_artifact is not None and not fr_artifact.reviewed:
+        reasons.append("artifact 'fr' must have reviewed=true")
+    if en_artifact is not None and not en_artifact.reviewed:
+        reasons.append("artifact 'en' must have reviewed=true")
+
+    meta = run.meta if isinstance(run.meta, dict) else {}
+    claims_to_verify = meta.get("claims_to_verify")
+    if claims_to_verify:
+        reasons.append("run.meta.claims_to_verify must be empty or missing")
+
+    return reasons
+
+
+def export_paths(repo_root: Path, slug: str) -> dict[ArtifactLang, Path]:
+    return {lang: repo_root / "src" / "content" / "blog" / lang.value / f"{slug}.mdx" for lang in EXPORT_LANGS}
+
+
+def write_atomic(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        mode="w", encoding="utf-8", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as tmp:
+        tmp.write(content)
+        tmp.flush()
+        os.fsync(tmp.fileno())
+    try:
+        # NamedTemporaryFile creates 0600 files; give the export the mode a plain open() would have.
+        os.chmod(tmp.name, 0o666 & ~_UMASK)
+        os.replace(tmp.name, path)
+    except OSError:
+        os.remove(tmp.name)
+        raise
+
+
+def load_export_runs(
+    db: Session,
+    run_ids: list[UUID] | None = None,
+    batch_id: UUID | None = None,
+    slug_prefix: str | None = None,
+    tag: str | None = None,
+) -> list[Run]:
+    query = select(Run).options(joinedload(Run.topic, innerjoin=True), joinedload(Run.artifacts))
+
+    if run_ids is not None:
+        query = query.where(Run.id.in_(run_ids))
+    else:
+        latest = select(Run.id).join(Run.topic).where(Run.status == RunStatus.SUCCEEDED)
+        if batch_id is not None:
+            latest = latest.where(Run.id.in_(select(BatchItem.run_id).where(BatchItem.batch_id == batch_id)))
+        if slug_prefix:
+            latest = latest.where(Topic.slug.startswith(slug_prefix, autoescape=True))
+        if tag:
+            latest = latest.where(Topic.tags.contains({"items": [tag]}))
+        latest = latest.distinct(Run.topic_id).order_by(Run.topic_id, Run.finished_at.desc().nulls_last())
+        query = query.where(Run.id.in_(latest))
+
+    return list(db.scalars(query).unique())
+
+
+def _matches_manifest(entry: ExportManifestEntry | None, path: Path) -> bool:
+    return entry is not None and entry.path == str(path) and path.exists()
+
+
+def _export_one(
+    repo_root: Path,
+    run: Run,
+    manifest: dict[tuple[str, ArtifactLang], ExportManifestEntry],
+    force: bool,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    slug = run.topic.slug
+    artifacts = {artifact.lang: artifact for artifact in run.artifacts}
+    result: dict[str, Any] = {"run_id": run.id, "slug": slug, "files": {}, "written": [], "skipped": [], "reasons": []}
+    manifest_rows: list[dict[str, Any]] = []
+
+    try:
+        for lang, path in export_paths(repo_root, slug).items():
+            artifact = artifacts[lang]
+            entry = manifest.get((slug, lang))
+            result["files"][lang.value] = str(path)
+
+            if (
+                not force
+                and _matches_manifest(entry, path)
+                and entry.artifact_id == artifact.id
+                and entry.artifact_updated_at == artifact.updated_at
+            ):
+                result["skipped"].append(lang.value)
+                continue
+
+            content = render_artifact(artifact)
+            content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            if not force and _matches_manifest(entry, path) and entry.content_hash == content_hash:
+                result["skipped"].append(lang.value)
+            else:
+                with EXPORT_WRITE_SECONDS.time(), traced("export.write_file", path=path, bytes=len(content)):
+                    write_atomic(path, content)
+                result["written"].append(lang.value)
+
+            manifest_rows.append(
+                {
+                    "slug": slug,
+                    "lang": lang,
+                    "path": str(path),
+                    "content_hash": content_hash,
+                    "artifact_id": artifact.id,
+                    "artifact_updated_at": artifact.updated_at,
+                }
+            )
+    except OSError as exc:
+        return {**result, "status": "error", "reasons": [str(exc)]}, manifest_rows
+
+    return {**result, "status": "exported" if result["written"] else "unchanged"}, manifest_rows
+
+
+def _load_manifest(db: Session, slugs: list[str]) -> dict[tuple[str, ArtifactLang], ExportManifestEntry]:
+    if not slugs:
+        return {}
+    manifest: dict[tuple[str, ArtifactLang], ExportManifestEntry] = {}
+    for chunk in chunked(slugs):
+        for entry in db.scalars(select(ExportManifestEntry).where(ExportManifestEntry.slug.in_(chunk))):
+            manifest[(entry.slug, entry.lang)] = entry
+    return manifest
+
+
+def _record_manifest(db: Session, rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+    for chunk in chunked(rows):
+        stmt = pg_insert(ExportManifestEntry).values(chunk)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ExportManifestEntry.slug, ExportManifestEntry.lang],
+                set_={
+                    "path": stmt.excluded.path,
+                    "content_hash": stmt.excluded.content_hash,
+                    "artifact_id": stmt.excluded.artifact_id,
+                    "artifact_updated_at": stmt.excluded.artifact_updated_at,
+                    "exported_at": func.now(),
+                },
+            )
+        )
+    db.commit()
+
+
+def export_runs(
+    db: Session,
+    runs: list[Run],
+    requested_ids: list[UUID] | None = None,
+    force: bool = False,
+) -> list[dict[str, Any]]:
+    repo_root = Path(settings.blog_repo_path)
+    results: dict[UUID, dict[str, Any]] = {}
+    ready: list[Run] = []
+    slugs: dict[str, UUID] = {}
+
+    for run in runs:
+        artifacts = {artifact.lang: artifact for artifact in run.artifacts}
+        reasons = export_gate_reasons(run, artifacts.get(ArtifactLang.FR), artifacts.get(ArtifactLang.EN))
+        if run.topic.slug in slugs:
+            reasons.append(f"slug '{run.topic.slug}' is already exported by run {slugs[run.topic.slug]} in this request")
+        if reasons:
+            results[run.id] = {"run_id": run.id, "slug": run.topic.slug, "status": "blocked", "reasons": reasons}
+            continue
+        slugs[run.topic.slug] = run.id
+        ready.append(run)
+
+    manifest = _load_manifest(db, list(slugs))
+    manifest_rows: list[dict[str, Any]] = []
+    if ready:
+        with ThreadPoolExecutor(max_workers=min(len(ready), settings.export_concurrency)) as pool:
+            export_one = with_current_context(_export_one)
+            for result, rows in pool.map(lambda run: export_one(repo_root, run, manifest, force), ready):
+                results[result["run_id"]] = result
+                manifest_rows.extend(rows)
+                record_export_result(result)
+    _record_manifest(db, manifest_rows)
+
+    if requested_ids is None:
+        return [results[run.id] for run in runs]
+
+    ordered: list[dict[str, Any]] = []
+    for run_id in dict.fromkeys(requested_ids):
+        ordered.append(results.get(run_id) or {"run_id": run_id, "slug": None, "status": "not_found", "reasons": ["Run not found"]})
+    return ordered
@@ -1,12 +1,16 @@
 import json
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from app.db import chunked
 from app.models import Artifact, ArtifactLang, Topic
 
+SYSTEM_PROMPT = "You are a precise content generation engine."
+
 RESPONSE_SCHEMA = {
     "name": "run_generation_result",
     "strict": True,
@@ -69,6 +73,30 @@ def build_prompt(topic: Topic) -> str:
     return json.dumps(payload, ensure_ascii=True)
 
 
+def build_response_request(prompt: str, model: str) -> dict[str, Any]:
+    return {
+        "model": model,
+        "input": [
+            {
+                "role": "system",
+                "content": [{"type": "input_text", "text": SYSTEM_PROMPT}],
+            },
+            {
+                "role": "user",
+                "content": [{"type": "input_text", "text": prompt}],
+            },
+        ],
+        "text": {
+            "format": {
+                "type": "json_schema",
+                "name": RESPONSE_SCHEMA["name"],
+                "strict": RESPONSE_SCHEMA["strict"],
+                "schema": RESPONSE_SCHEMA["schema"],
+            }
+        },
+    }
+
+
 def parse_response_json(response: Any) -> dict[str, Any]:
     parsed = getattr(response, "output_parsed", None)
     if isinstance(parsed, dict):
@@ -99,21 +127,35 @@ def parse_response_json_from_body(body: dict[str, Any]) -> dict[str, Any]:
     raise ValueError("Batch response body did not include parseable JSON output")
 
 
-def upsert_artifact(session: Session, run_id: UUID, lang: ArtifactLang, payload: dict[str, Any]) -> None:
-    artifact = session.scalar(select(Artifact).where(Artifact.run_id == run_id, Artifact.lang == lang))
-    if artifact is None:
-        artifact = Artifact(
-            run_id=run_id,
-            lang=lang,
-            frontmatter=payload["frontmatter"],
-            body_mdx=payload["body_mdx"],
-            reviewed=False,
-            review_notes=None,
-        )
-        session.add(artifact)
+def artifact_rows(run_id: UUID, payload: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {
+            "run_id": run_id,
+            "lang": lang,
+            "frontmatter": payload["artifacts"][lang.value]["frontmatter"],
+            "body_mdx": payload["artifacts"][lang.value]["body_mdx"],
+        }
+        for lang in (ArtifactLang.FR, ArtifactLang.EN)
+    ]
+
+
+def upsert_artifacts(session: Session, rows: list[dict[str, Any]]) -> None:
+    if not rows:
         return
 
-    artifact.frontmatter = payload["frontmatter"]
-    artifact.body_mdx = payload["body_mdx"]
-    artifact.reviewed = False
-    artifact.review_notes = None
+    deduped = {(row["run_id"], row["lang"]): row for row in rows}
+    values = [{**row, "id": uuid4(), "reviewed": False, "review_notes": None} for row in deduped.values()]
+    for chunk in chunked(values):
+        stmt = pg_insert(Artifact).values(chunk)
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[Artifact.run_id, Artifact.lang],
+                set_={
+                    "frontmatter": stmt.excluded.frontmatter,
+                    "body_mdx": stmt.excluded.body_mdx,
+                    "reviewed": False,
+                    "review_notes": None,
+                    "updated_at": func.now(),
+                },
+            )
+        )
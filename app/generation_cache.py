@@ -0,0 +1,95 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import chunked
+from app.generation import RESPONSE_SCHEMA, SYSTEM_PROMPT
+from app.models import GenerationCacheEntry
+
+
+def cache_enabled(use_cache: bool | None) -> bool:
+    return settings.generation_cache_enabled if use_cache is None else use_cache
+
+
+def generation_cache_key(prompt: str, model: str) -> str:
+    material = json.dumps(
+        {"system": SYSTEM_PROMPT, "prompt": prompt, "model": model, "schema": RESPONSE_SCHEMA},
+        sort_keys=True,
+        ensure_ascii=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def get_cached_generation(db: Session, key: str) -> GenerationCacheEntry | None:
+    now = datetime.now(timezone.utc)
+    return db.scalar(
+        update(GenerationCacheEntry)
+        .where(GenerationCacheEntry.key == key, GenerationCacheEntry.expires_at > now)
+        .values(hit_count=GenerationCacheEntry.hit_count + 1, last_used_at=now)
+        .returning(GenerationCacheEntry)
+    )
+
+
+def cache_hit_meta(meta: dict[str, Any], entry: GenerationCacheEntry) -> dict[str, Any]:
+    return {
+        **meta,
+        "generation_cache": {"hit": True, "key": entry.key, "cached_at": entry.created_at.isoformat()},
+    }
+
+
+def get_cached_generations(db: Session, keys: list[str]) -> dict[str, GenerationCacheEntry]:
+    if not keys:
+        return {}
+    now = datetime.now(timezone.utc)
+    unique_keys = sorted(set(keys))
+    entries: dict[str, GenerationCacheEntry] = {}
+    for chunk in chunked(unique_keys):
+        for entry in db.scalars(
+            update(GenerationCacheEntry)
+            .where(GenerationCacheEntry.key.in_(chunk), GenerationCacheEntry.expires_at > now)
+            .values(hit_count=GenerationCacheEntry.hit_count + 1, last_used_at=now)
+            .returning(GenerationCacheEntry)
+            .execution_options(synchronize_session=False)
+        ):
+            entries[entry.key] = entry
+    return entries
+
+
+def store_generation(db: Session, key: str, model: str, payload: dict[str, Any]) -> None:
+    now = datetime.now(timezone.utc)
+    values = {
+        "key": key,
+        "model": model,
+        "payload": payload,
+        "size_bytes": len(json.dumps(payload, ensure_ascii=False).encode("utf-8")),
+        "hit_count": 0,
+        "expires_at": now + timedelta(seconds=settings.generation_cache_ttl_seconds),
+        "last_used_at": now,
+    }
+    stmt = pg_insert(GenerationCacheEntry).values(**values)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[GenerationCacheEntry.key],
+            set_={name: stmt.excluded[name] for name in ("model", "payload", "size_bytes", "expires_at", "last_used_at")},
+        )
+    )
+
+
+def evict_generation_cache(db: Session) -> int:
+    # Runs from the maintenance beat task rather than on every store; reads already ignore expired entries.
+    expired = db.execute(delete(GenerationCacheEntry).where(GenerationCacheEntry.expires_at <= func.now()))
+
+    overflow = (
+        select(GenerationCacheEntry.key)
+        .order_by(GenerationCacheEntry.last_used_at.desc())
+        .offset(settings.generation_cache_max_entries)
+    )
+    evicted = db.execute(delete(GenerationCacheEntry).where(GenerationCacheEntry.key.in_(overflow)))
+    db.commit()
+    return expired.rowcount + evicted.rowcount
@@ -0,0 +1,223 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from openai import RateLimitError
+from opentelemetry.trace import Span, SpanKind
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import settings
+from app.events import commit_and_publish, run_events_deferred
+from app.generation import (
+    artifact_rows,
+    build_prompt,
+    build_response_request,
+    parse_response_json,
+    parse_response_json_from_body,
+    upsert_artifacts,
+)
+from app.generation_cache import (
+    cache_enabled,
+    cache_hit_meta,
+    generation_cache_key,
+    get_cached_generation,
+    store_generation,
+)
+from app.ledger import TOKEN_FIELDS, elapsed_ms, ledger_row, record_ledger, usage_tokens
+from app.metrics import observe_openai_call
+from app.models import Run, RunStatus
+from app.openai_client import get_openai_client
+from app.rate_limit import (
+    RateLimitTimeout,
+    acquire_capacity,
+    estimate_tokens,
+    observe_rate_limit_headers,
+    record_usage,
+    retry_after_seconds,
+)
+from app.run_responses import load_run_response, store_run_response
+from app.streaming import finish_partial, stream_response
+from app.tracing import traced
+
+RATE_LIMIT_ERRORS = (RateLimitTimeout, RateLimitError)
+
+
+class GenerationJob:
+    def __init__(self, run_id: UUID, model: str, prompt: str, cache_key: str | None, retries: int = 0) -> None:
+        self.run_id = run_id
+        self.model = model
+        self.prompt = prompt
+        self.cache_key = cache_key
+        self.estimated_tokens = estimate_tokens(prompt)
+        self.ledger: dict[str, Any] = {"model": model, "mode": "realtime", "retries": retries}
+
+    @property
+    def request(self) -> dict[str, Any]:
+        return build_response_request(self.prompt, self.model)
+
+
+@contextmanager
+def model_call_span(job: GenerationJob) -> Iterator[Span]:
+    with traced(
+        "openai.responses.create",
+        kind=SpanKind.CLIENT,
+        run_id=job.run_id,
+        **{"gen_ai.system": "openai", "gen_ai.request.model": job.model, "streaming": settings.generation_streaming_enabled},
+    ) as span:
+        yield span
+
+
+def record_response_usage(span: Span, response: Any) -> None:
+    if getattr(response, "id", None):
+        span.set_attribute("gen_ai.response.id", response.id)
+    for key, value in usage_tokens(getattr(response, "usage", None)).items():
+        if value is not None:
+            span.set_attribute(f"gen_ai.usage.{key}", value)
+
+
+def _settle(session: Session, run: Run) -> None:
+    commit_and_publish(session, [run])
+    # With deferred events the async caller finishes the partial once it publishes the terminal status.
+    if not run_events_deferred(session):
+        finish_partial(run.id)
+
+
+def _succeed(session: Session, run: Run, payload: dict[str, Any], meta: dict[str, Any], ledger: dict[str, Any]) -> None:
+    started = time.perf_counter()
+    with traced("generation.upsert_artifacts", run_id=run.id):
+        upsert_artifacts(session, artifact_rows(run.id, payload))
+    run.meta = meta
+    run.status = RunStatus.SUCCEEDED
+    run.finished_at = datetime.now(timezone.utc)
+    run.error = None
+    record_ledger(session, [ledger_row(run, {**ledger, "persist_ms": elapsed_ms(started, time.perf_counter())})])
+    _settle(session, run)
+
+
+def fail_generation(session: Session, run_id: UUID, exc: BaseException, ledger: dict[str, Any] | None = None) -> None:
+    session.rollback()
+    run = session.get(Run, run_id)
+    if run is None:
+        return
+    run.status = RunStatus.FAILED
+    run.finished_at = datetime.now(timezone.utc)
+    run.error = str(exc)
+    if ledger is not None:
+        record_ledger(session, [ledger_row(run, ledger)])
+    _settle(session, run)
+
+
+def requeue_generation(session: Session, job: GenerationJob, exc: Exception, observe_headers: bool = True) -> float:
+    if isinstance(exc, RateLimitError):
+        if observe_headers:
+            observe_rate_limit_headers(job.model, exc.response.headers, blocked=True)
+        countdown = retry_after_seconds(exc.response.headers)
+    else:
+        countdown = exc.retry_after
+    run = session.get(Run, job.run_id)
+    if run is not None:
+        run.status = RunStatus.QUEUED
+        run.started_at = None
+        commit_and_publish(session, [run])
+    return countdown
+
+
+def begin_generation(
+    session: Session, run_id: UUID, use_cache: bool | None, retries: int = 0
+) -> tuple[GenerationJob | None, dict[str, Any]]:
+    # Claim the run in one statement so duplicate deliveries of the same run cannot both reach the model.
+    claimed = session.execute(
+        update(Run)
+        .where(Run.id == run_id, Run.status.in_((RunStatus.QUEUED, RunStatus.FAILED)))
+        .values(status=RunStatus.RUNNING, started_at=datetime.now(timezone.utc), error=None)
+        .returning(Run.id)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    run = session.scalar(
+        select(Run).options(selectinload(Run.topic)).where(Run.id == run_id).execution_options(populate_existing=True)
+    )
+    if run is None:
+        session.rollback()
+        return None, {"status": "not_found", "run_id": str(run_id)}
+
+    if claimed is None:
+        session.rollback()
+        return None, {"status": "skipped", "reason": f"run already {run.status.value}", "run_id": str(run_id)}
+
+    commit_and_publish(session, [run])
+
+    try:
+        model = run.model or settings.openai_model
+        with traced("generation.build_prompt", run_id=run.id):
+            prompt = build_prompt(run.topic)
+            cache_key = generation_cache_key(prompt, model) if cache_enabled(use_cache) else None
+
+        stored = load_run_response(session, run.id)
+        if stored is not None:
+            parse_started = time.perf_counter()
+            with traced("generation.parse_response", run_id=run.id, source="stored"):
+                payload = parse_response_json_from_body(stored)
+            ledger = {
+                "model": model,
+                "mode": "reparse",
+                "retries": retries,
+                "parse_ms": elapsed_ms(parse_started, time.perf_counter()),
+                **usage_tokens(stored.get("usage")),
+            }
+            if cache_key:
+                store_generation(session, cache_key, model, payload)
+            _succeed(session, run, payload, payload["meta"], ledger)
+            return None, {"status": "succeeded", "run_id": str(run_id), "cache_hit": False, "reparsed": True}
+
+        cached = get_cached_generation(session, cache_key) if cache_key else None
+        if cached is not None:
+            ledger = {"model": model, "mode": "cache", "retries": retries, **dict.fromkeys(TOKEN_FIELDS, 0)}
+            _succeed(session, run, cached.payload, cache_hit_meta(cached.payload["meta"], cached), ledger)
+            return None, {"status": "succeeded", "run_id": str(run_id), "cache_hit": True, "reparsed": False}
+    except Exception as exc:
+        fail_generation(session, run_id, exc)
+        raise
+
+    return GenerationJob(run.id, model, prompt, cache_key, retries), {}
+
+
+def call_model(job: GenerationJob) -> Any:
+    with traced("openai.rate_limit.acquire", model=job.model, estimated_tokens=job.estimated_tokens):
+        acquire_capacity(job.model, job.estimated_tokens)
+    client = get_openai_client()
+    started = time.perf_counter()
+    with model_call_span(job) as span, observe_openai_call("responses.create", job.model):
+        if settings.generation_streaming_enabled:
+            response = stream_response(
+                client, job.run_id, job.request, on_headers=lambda headers: observe_rate_limit_headers(job.model, headers)
+            )
+        else:
+            raw = client.responses.with_raw_response.create(**job.request)
+            observe_rate_limit_headers(job.model, raw.headers)
+            response = raw.parse()
+        record_response_usage(span, response)
+    job.ledger["model_latency_ms"] = elapsed_ms(started, time.perf_counter())
+    record_usage(job.model, job.estimated_tokens, response)
+    return response
+
+
+def complete_generation(session: Session, job: GenerationJob, response: Any) -> dict[str, Any]:
+    job.ledger.update(usage_tokens(getattr(response, "usage", None)))
+    try:
+        store_run_response(session, job.run_id, job.model, response)
+        parse_started = time.perf_counter()
+        with traced("generation.parse_response", run_id=job.run_id, source="model"):
+            payload = parse_response_json(response)
+        job.ledger["parse_ms"] = elapsed_ms(parse_started, time.perf_counter())
+        if job.cache_key:
+            store_generation(session, job.cache_key, job.model, payload)
+        run = session.get(Run, job.run_id)
+        _succeed(session, run, payload, payload["meta"], job.ledger)
+    except Exception as exc:
+        fail_generation(session, job.run_id, exc, job.ledger)
+        raise
+    return {"status": "succeeded", "run_id": str(job.run_id), "cache_hit": False, "reparsed": False}
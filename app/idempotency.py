@@ -0,0 +1,103 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(payload: dict[str, Any]) -> str:
+    material = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def claim_idempotency_key(db: Session, scope: str, key: str, request_hash: str) -> IdempotencyKey | None:
+    now = datetime.now(timezone.utc)
+    db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.scope == scope, IdempotencyKey.key == key, IdempotencyKey.expires_at <= now
+        )
+    )
+
+    claimed = db.scalar(
+        pg_insert(IdempotencyKey)
+        .values(
+            scope=scope,
+            key=key,
+            request_hash=request_hash,
+            created_at=now,
+            expires_at=now + timedelta(seconds=settings.idempotency_ttl_seconds),
+        )
+        .on_conflict_do_nothing(index_elements=[IdempotencyKey.scope, IdempotencyKey.key])
+        .returning(IdempotencyKey.key)
+    )
+    if claimed is None:
+        # Take over a claim whose request died before recording a resource.
+        stale_before = now - timedelta(seconds=settings.idempotency_pending_timeout_seconds)
+        claimed = db.scalar(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.request_hash == request_hash,
+                IdempotencyKey.resource_id.is_(None),
+                IdempotencyKey.created_at < stale_before,
+            )
+            .values(created_at=now)
+            .returning(IdempotencyKey.key)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+    if claimed is not None:
+        return None
+    return db.get(IdempotencyKey, (scope, key))
+
+
+def ensure_replayable(record: IdempotencyKey, request_hash: str) -> None:
+    if record.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{IDEMPOTENCY_HEADER} was already used with a different request",
+        )
+    if record.resource_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A request with this {IDEMPOTENCY_HEADER} is still in progress",
+        )
+
+
+def mark_replayed(response: Response) -> None:
+    response.status_code = status.HTTP_200_OK
+    response.headers[REPLAYED_HEADER] = "true"
+
+
+def record_idempotency_result(db: Session, scope: str, key: str, resource_id: Any, task_id: str | None = None) -> None:
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+        .values(resource_id=resource_id, task_id=task_id)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def release_idempotency_key(db: Session, scope: str, key: str) -> None:
+    db.rollback()
+    db.execute(delete(IdempotencyKey).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key))
+    db.commit()
+
+
+def purge_expired_idempotency_keys(db: Session) -> int:
+    result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.now(timezone.utc)))
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Date, cast, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Run, RunLedgerEntry
+
+LEDGER_FIELDS = (
+    "model",
+    "mode",
+    "retries",
+    "queue_wait_ms",
+    "model_latency_ms",
+    "parse_ms",
+    "persist_ms",
+    "input_tokens",
+    "output_tokens",
+    "cached_tokens",
+    "total_tokens",
+)
+TOKEN_FIELDS = ("input_tokens", "output_tokens", "cached_tokens", "total_tokens")
+_MILLION = Decimal(1_000_000)
+
+
+def elapsed_ms(started: float, finished: float) -> int:
+    return int((finished - started) * 1000)
+
+
+def ms_between(start: datetime | None, end: datetime | None) -> int | None:
+    if start is None or end is None:
+        return None
+    return int((end - start).total_seconds() * 1000)
+
+
+def usage_tokens(usage: Any) -> dict[str, int | None]:
+    if usage is None:
+        return {}
+    if hasattr(usage, "model_dump"):
+        usage = usage.model_dump()
+    if not isinstance(usage, dict):
+        return {}
+    details = usage.get("input_tokens_details") or {}
+    return {
+        "input_tokens": usage.get("input_tokens"),
+        "output_tokens": usage.get("output_tokens"),
+        "cached_tokens": details.get("cached_tokens"),
+        "total_tokens": usage.get("total_tokens"),
+    }
+
+
+def model_prices(model: str) -> dict[str, float] | None:
+    # Dated snapshots (gpt-4.1-mini-2025-04-14) are priced like their base model.
+    matches = [name for name in settings.openai_prices if model == name or model.startswith(f"{name}-")]
+    return settings.openai_prices[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(model: str, tokens: dict[str, int | None], batch: bool = False) -> Decimal | None:
+    prices = model_prices(model)
+    if prices is None or tokens.get("input_tokens") is None:
+        return None
+    cached = tokens.get("cached_tokens") or 0
+    uncached = max(tokens["input_tokens"] - cached, 0)
+    cost = (
+        uncached * Decimal(str(prices["input"]))
+        + cached * Decimal(str(prices.get("cached_input", prices["input"])))
+        + (tokens.get("output_tokens") or 0) * Decimal(str(prices["output"]))
+    ) / _MILLION
+    if batch:
+        cost *= Decimal(str(settings.openai_batch_discount))
+    return cost.quantize(Decimal("0.000001"))
+
+
+def ledger_row(run: Run, fields: dict[str, Any]) -> dict[str, Any]:
+    row = {key: fields.get(key) for key in LEDGER_FIELDS}
+    row["model"] = row["model"] or run.model or settings.openai_model
+    row["retries"] = row["retries"] or 0
+    if row["queue_wait_ms"] is None and row["retries"] == 0:
+        row["queue_wait_ms"] = ms_between(run.created_at, run.started_at)
+    tokens = {key: row[key] for key in TOKEN_FIELDS}
+    return {
+        **row,
+        "run_id": run.id,
+        "status": run.status.value,
+        "enqueued_at": run.created_at,
+        "started_at": run.started_at,
+        "finished_at": run.finished_at,
+        "total_ms": ms_between(run.created_at, run.finished_at),
+        "cost_usd": estimate_cost(row["model"], tokens, batch=row["mode"] == "batch"),
+    }
+
+
+def record_ledger(session: Session, rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+    stmt = pg_insert(RunLedgerEntry).values(list({row["run_id"]: row for row in rows}.values()))
+    table = RunLedgerEntry.__table__
+    # A later attempt (retry, re-parse) only fills in what it measured and keeps the rest.
+    updates = {
+        column: func.coalesce(stmt.excluded[column], table.c[column])
+        for column in (*LEDGER_FIELDS, "started_at", "cost_usd")
+        if column not in ("mode", "retries")
+    }
+    updates.update(
+        retries=func.greatest(table.c.retries, stmt.excluded.retries),
+        mode=func.coalesce(table.c.mode, stmt.excluded.mode),
+        status=stmt.excluded.status,
+        enqueued_at=stmt.excluded.enqueued_at,
+        finished_at=stmt.excluded.finished_at,
+        total_ms=stmt.excluded.total_ms,
+        updated_at=func.now(),
+    )
+    session.execute(stmt.on_conflict_do_update(index_elements=[RunLedgerEntry.run_id], set_=updates))
+
+
+def _ledger_window(query: Any, since: datetime | None, until: datetime | None, mode: str | None) -> Any:
+    if since is not None:
+        query = query.where(RunLedgerEntry.finished_at >= since)
+    if until is not None:
+        query = query.where(RunLedgerEntry.finished_at < until)
+    if mode is not None:
+        query = query.where(RunLedgerEntry.mode == mode)
+    return query
+
+
+def _percentile(fraction: float, column: Any) -> Any:
+    return func.percentile_cont(fraction).within_group(column)
+
+
+def model_stats(
+    db: Session, since: datetime | None = None, until: datetime | None = None, mode: str | None = None
+) -> list[dict[str, Any]]:
+    entry = RunLedgerEntry
+    query = _ledger_window(
+        select(
+            entry.model,
+            entry.mode,
+            func.count().label("runs"),
+            func.count().filter(entry.status == "failed").label("failed"),
+            _percentile(0.5, entry.queue_wait_ms).label("queue_wait_p50_ms"),
+            _percentile(0.95, entry.queue_wait_ms).label("queue_wait_p95_ms"),
+            _percentile(0.5, entry.model_latency_ms).label("model_latency_p50_ms"),
+            _percentile(0.95, entry.model_latency_ms).label("model_latency_p95_ms"),
+            _percentile(0.5, entry.total_ms).label("total_p50_ms"),
+            _percentile(0.95, entry.total_ms).label("total_p95_ms"),
+            func.avg(entry.input_tokens).label("avg_input_tokens"),
+            func.avg(entry.output_tokens).label("avg_output_tokens"),
+            func.sum(entry.cost_usd).label("cost_usd"),
+            (func.sum(entry.cost_usd) / func.nullif(func.count(entry.cost_usd), 0)).label("avg_cost_usd"),
+        ).group_by(entry.model, entry.mode),
+        since,
+        until,
+        mode,
+    )
+    return [dict(row._mapping) for row in db.execute(query.order_by(entry.model, entry.mode))]
+
+
+def daily_usage(db: Session, days: int = 30, mode: str | None = None) -> list[dict[str, Any]]:
+    entry = RunLedgerEntry
+    day = cast(func.date_trunc("day", entry.finished_at), Date).label("day")
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    query = _ledger_window(
+        select(
+            day,
+            entry.model,
+            func.count().label("runs"),
+            func.coalesce(func.sum(entry.input_tokens), 0).label("input_tokens"),
+            func.coalesce(func.sum(entry.output_tokens), 0).label("output_tokens"),
+            func.coalesce(func.sum(entry.cached_tokens), 0).label("cached_tokens"),
+            func.coalesce(func.sum(entry.total_tokens), 0).label("total_tokens"),
+            func.sum(entry.cost_usd).label("cost_usd"),
+        ).group_by(day, entry.model),
+        since,
+        None,
+        mode,
+    )
+    return [dict(row._mapping) for row in db.execute(query.order_by(day.desc(), entry.model))]
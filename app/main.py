@@ -3,9 +3,15 @@ from fastapi.staticfiles import StaticFiles
 
 from app.admin.routes import router as admin_router
 from app.config import settings
+from app.metrics import MetricsMiddleware
+from app.tracing import TracingMiddleware, configure_tracing
 from app.routers import api_router
 
+configure_tracing("api")
+
 app = FastAPI(title=settings.app_name)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 app.include_router(api_router)
 app.include_router(admin_router)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -0,0 +1,84 @@
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import yaml
+
+from app.config import settings
+from app.models import Artifact
+
+try:
+    from yaml import CSafeDumper as FrontmatterDumper
+except ImportError:
+    from yaml import SafeDumper as FrontmatterDumper
+
+# libyaml escapes NEL and characters outside the BMP (emoji) even with allow_unicode, where the pure-Python
+# emitter writes them as-is; such frontmatter is dumped with SafeDumper so exports stay byte-identical.
+_LIBYAML_ESCAPED = re.compile("[\x85\U00010000-\U0010ffff]")
+
+
+def _needs_python_dumper(value: Any) -> bool:
+    if isinstance(value, str):
+        return _LIBYAML_ESCAPED.search(value) is not None
+    if isinstance(value, dict):
+        return any(_needs_python_dumper(key) or _needs_python_dumper(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return any(_needs_python_dumper(item) for item in value)
+    return False
+
+
+def render_mdx(frontmatter: dict[str, Any], body_mdx: str) -> str:
+    frontmatter = frontmatter or {}
+    dumper = yaml.SafeDumper if _needs_python_dumper(frontmatter) else FrontmatterDumper
+    fm_text = yaml.dump(frontmatter, Dumper=dumper, sort_keys=False, allow_unicode=True).strip()
+    return f"---\n{fm_text}\n---\n\n{(body_mdx or '').rstrip()}\n"
+
+
+class RenderCache:
+    def __init__(self, max_entries: int) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[UUID, datetime], str] = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[UUID, datetime]) -> str | None:
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rendered
+
+    def put(self, key: tuple[UUID, datetime], rendered: str) -> None:
+        with self._lock:
+            self._entries[key] = rendered
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+render_cache = RenderCache(settings.mdx_render_cache_size)
+
+
+def render_artifact(artifact: Artifact) -> str:
+    if artifact.id is None or artifact.updated_at is None or render_cache.max_entries <= 0:
+        return render_mdx(artifact.frontmatter, artifact.body_mdx)
+
+    key = (artifact.id, artifact.updated_at)
+    rendered = render_cache.get(key)
+    if rendered is None:
+        rendered = render_mdx(artifact.frontmatter, artifact.body_mdx)
+        render_cache.put(key, rendered)
+    return rendered
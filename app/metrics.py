@@ -0,0 +1,183 @@
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MODEL_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=HTTP_BUCKETS,
+)
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task run time by task name and outcome.",
+    ["task", "outcome"],
+    buckets=MODEL_BUCKETS,
+)
+OPENAI_REQUEST_DURATION = Histogram(
+    "openai_request_duration_seconds",
+    "OpenAI API call latency by operation, model and outcome (ok or the exception class).",
+    ["operation", "model", "outcome"],
+    buckets=MODEL_BUCKETS,
+)
+BATCH_INGEST_ROWS = Counter(
+    "batch_ingest_rows_total",
+    "Batch output rows ingested by outcome.",
+    ["outcome"],
+)
+BATCH_INGEST_SECONDS = Histogram(
+    "batch_ingest_chunk_seconds",
+    "Time to apply and commit one chunk of batch output rows.",
+    buckets=HTTP_BUCKETS,
+)
+EXPORT_FILES = Counter(
+    "export_files_total",
+    "MDX export files by outcome.",
+    ["outcome"],
+)
+EXPORT_WRITE_SECONDS = Histogram(
+    "export_file_write_seconds",
+    "Time to atomically write one MDX export file.",
+    buckets=HTTP_BUCKETS,
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Database pool connections by pool and state.",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database pool connection.",
+    ["pool"],
+    buckets=POOL_WAIT_BUCKETS,
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Database pool checkouts that timed out.",
+    ["pool"],
+)
+
+_task_started: dict[str, float] = {}
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def metrics_registry() -> CollectorRegistry:
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> bytes:
+    return generate_latest(metrics_registry())
+
+
+def start_metrics_server(port: int) -> None:
+    if port:
+        start_http_server(port, registry=metrics_registry())
+
+
+def mark_process_dead(pid: int) -> None:
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; labelling by raw path would explode cardinality.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, str(status)).observe(time.perf_counter() - started)
+
+
+def task_started(task_id: str) -> None:
+    _task_started[task_id] = time.perf_counter()
+
+
+def task_finished(task_id: str, task_name: str, state: str | None) -> None:
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        observe_task(task_name, (state or "unknown").lower(), time.perf_counter() - started)
+
+
+def observe_task(task_name: str, outcome: str, seconds: float) -> None:
+    CELERY_TASK_DURATION.labels(task_name, outcome).observe(seconds)
+
+
+@contextmanager
+def observe_openai_call(operation: str, model: str | None = None) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException as exc:
+        outcome = type(exc).__name__
+        raise
+    finally:
+        OPENAI_REQUEST_DURATION.labels(operation, model or "", outcome).observe(time.perf_counter() - started)
+
+
+def observe_batch_chunk(succeeded: int, failed: int, seconds: float) -> None:
+    BATCH_INGEST_ROWS.labels("succeeded").inc(succeeded)
+    BATCH_INGEST_ROWS.labels("failed").inc(failed)
+    BATCH_INGEST_SECONDS.observe(seconds)
+
+
+def record_export_result(result: dict[str, Any]) -> None:
+    EXPORT_FILES.labels("written").inc(len(result.get("written", ())))
+    EXPORT_FILES.labels("skipped").inc(len(result.get("skipped", ())))
+    if result.get("status") == "error":
+        EXPORT_FILES.labels("error").inc()
+
+
+def observe_pool_checkout(pool: str, wait_s: float, timed_out: bool) -> None:
+    if timed_out:
+        DB_POOL_CHECKOUT_TIMEOUTS.labels(pool).inc()
+    DB_POOL_CHECKOUT_WAIT.labels(pool).observe(wait_s)
+
+
+def set_pool_connections(pool: str, in_use: int, idle: int, overflow: int) -> None:
+    DB_POOL_CONNECTIONS.labels(pool, "in_use").set(in_use)
+    DB_POOL_CONNECTIONS.labels(pool, "idle").set(idle)
+    DB_POOL_CONNECTIONS.labels(pool, "overflow").set(overflow)
@@ -1,12 +1,27 @@
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Index, String, Text, func
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Enum as SQLEnum,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    Numeric,
+    String,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
+from app.tracing import current_trace_id
 
 
 class RunStatus(str, Enum):
@@ -49,6 +64,9 @@ class Topic(Base):
 
     __table_args__ = (
         Index("ix_topics_slug", "slug", unique=True),
+        Index("ix_topics_slug_pattern", "slug", postgresql_ops={"slug": "varchar_pattern_ops"}),
+        Index("ix_topics_created_at_id", "created_at", "id"),
+        Index("ix_topics_tags", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
     )
 
 
@@ -65,6 +83,7 @@ class Run(Base):
     model: Mapped[str | None] = mapped_column(String(255), nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
     meta: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    trace_id: Mapped[str | None] = mapped_column(String(32), nullable=True, default=current_trace_id)
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -102,7 +121,7 @@ class Artifact(Base):
     run: Mapped[Run] = relationship(back_populates="artifacts")
 
     __table_args__ = (
-        Index("ix_artifacts_run_id_lang", "run_id", "lang"),
+        Index("ix_artifacts_run_id_lang", "run_id", "lang", unique=True),
     )
 
 
@@ -118,12 +137,52 @@ class Batch(Base):
     )
     openai_batch_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    next_poll_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
     items: Mapped[list["BatchItem"]] = relationship(back_populates="batch", cascade="all, delete-orphan")
+    shards: Mapped[list["BatchShard"]] = relationship(
+        back_populates="batch", cascade="all, delete-orphan", order_by="BatchShard.shard_index"
+    )
+
+    __table_args__ = (
+        Index("ix_batches_running_next_poll_at", "next_poll_at", postgresql_where=text("status = 'running'")),
+    )
+
+
+class BatchShard(Base):
+    __tablename__ = "batch_shards"
+
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    batch_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("batches.id", ondelete="CASCADE"), nullable=False)
+    shard_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[BatchStatus] = mapped_column(
+        SQLEnum(BatchStatus, name="batch_status", values_callable=lambda obj: [e.value for e in obj]),
+        nullable=False,
+        default=BatchStatus.QUEUED,
+    )
+    openai_batch_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    input_file_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    output_file_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    ingested_lines: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    remote_status: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    request_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    byte_size: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    batch: Mapped[Batch] = relationship(back_populates="shards")
+    items: Mapped[list["BatchItem"]] = relationship(back_populates="shard")
+
+    __table_args__ = (
+        Index("ix_batch_shards_batch_id", "batch_id"),
+    )
 
 
 class BatchItem(Base):
@@ -133,6 +192,9 @@ class BatchItem(Base):
     batch_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("batches.id", ondelete="CASCADE"), nullable=False)
     run_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("runs.id", ondelete="CASCADE"), nullable=False)
     topic_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("topics.id", ondelete="CASCADE"), nullable=False)
+    shard_id: Mapped[UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("batch_shards.id", ondelete="SET NULL"), nullable=True
+    )
     custom_id: Mapped[str] = mapped_column(String(255), nullable=False)
     status: Mapped[BatchStatus] = mapped_column(
         SQLEnum(BatchStatus, name="batch_status", values_callable=lambda obj: [e.value for e in obj]),
@@ -149,10 +211,106 @@ class BatchItem(Base):
     batch: Mapped[Batch] = relationship(back_populates="items")
     run: Mapped[Run] = relationship(back_populates="batch_items")
     topic: Mapped[Topic] = relationship(back_populates="batch_items")
+    shard: Mapped[BatchShard | None] = relationship(back_populates="items")
 
     __table_args__ = (
         Index("ix_batch_items_batch_id", "batch_id"),
+        Index("ix_batch_items_shard_id", "shard_id"),
         Index("ix_batch_items_run_id", "run_id"),
         Index("ix_batch_items_topic_id", "topic_id"),
         Index("ix_batch_items_custom_id", "custom_id", unique=True),
     )
+
+
+class GenerationCacheEntry(Base):
+    __tablename__ = "generation_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_used_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_generation_cache_expires_at", "expires_at"),
+        Index("ix_generation_cache_last_used_at", "last_used_at"),
+    )
+
+
+class ExportManifestEntry(Base):
+    __tablename__ = "export_manifest"
+
+    slug: Mapped[str] = mapped_column(String(255), primary_key=True)
+    lang: Mapped[ArtifactLang] = mapped_column(
+        SQLEnum(ArtifactLang, name="artifact_lang", values_callable=lambda obj: [e.value for e in obj]),
+        primary_key=True,
+    )
+    path: Mapped[str] = mapped_column(Text, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    artifact_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    artifact_updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    exported_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    scope: Mapped[str] = mapped_column(String(255), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    resource_id: Mapped[UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    task_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+
+class RunResponse(Base):
+    __tablename__ = "run_responses"
+
+    run_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("runs.id", ondelete="CASCADE"), primary_key=True)
+    model: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    response_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    encoding: Mapped[str] = mapped_column(String(16), nullable=False, default="zlib")
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    compressed_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class RunLedgerEntry(Base):
+    __tablename__ = "run_ledger"
+
+    run_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("runs.id", ondelete="CASCADE"), primary_key=True)
+    model: Mapped[str] = mapped_column(String(255), nullable=False)
+    mode: Mapped[str] = mapped_column(String(16), nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    retries: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    enqueued_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    queue_wait_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    model_latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    parse_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    persist_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    total_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    input_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    output_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cached_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    total_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cost_usd: Mapped[Decimal | None] = mapped_column(Numeric(14, 6), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_run_ledger_finished_at", "finished_at"),
+        Index("ix_run_ledger_model_finished_at", "model", "finished_at"),
+    )
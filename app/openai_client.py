@@ -0,0 +1,73 @@
+import os
+import threading
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+from app.config import settings
+
+_client: OpenAI | None = None
+_async_client: AsyncOpenAI | None = None
+_client_lock = threading.Lock()
+
+
+def _build_client() -> OpenAI:
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry,
+        ),
+    )
+    return OpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url or None,
+        timeout=httpx.Timeout(settings.openai_read_timeout, connect=settings.openai_connect_timeout),
+        max_retries=settings.openai_max_retries,
+        http_client=http_client,
+    )
+
+
+def _build_async_client() -> AsyncOpenAI:
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=max(settings.openai_max_connections, settings.async_worker_concurrency),
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry,
+        ),
+    )
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url or None,
+        timeout=httpx.Timeout(settings.openai_read_timeout, connect=settings.openai_connect_timeout),
+        max_retries=settings.openai_max_retries,
+        http_client=http_client,
+    )
+
+
+def get_openai_client() -> OpenAI:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    # Only used from the async worker's single event loop, so no lock is needed.
+    global _async_client
+    if _async_client is None:
+        _async_client = _build_async_client()
+    return _async_client
+
+
+def reset_openai_client() -> None:
+    global _client, _async_client, _client_lock
+    # The pooled sockets are shared with the parent process after a fork, so drop them without closing.
+    _client = None
+    _async_client = None
+    _client_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=reset_openai_client)
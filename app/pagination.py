@@ -0,0 +1,82 @@
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+
+from app.models import Topic
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+TOPIC_SUMMARY_COLUMNS = (
+    Topic.id,
+    Topic.slug,
+    Topic.tags,
+    Topic.fr_content,
+    Topic.en_content,
+    Topic.created_at,
+    Topic.updated_at,
+)
+
+
+def encode_cursor(created_at: datetime, topic_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{topic_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at_text, topic_id_text = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at_text), UUID(topic_id_text)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _topic_page_query(cursor: str | None, slug_prefix: str | None, tag: str | None) -> Select:
+    query = select(Topic).options(load_only(*TOPIC_SUMMARY_COLUMNS))
+
+    if cursor:
+        created_at, topic_id = decode_cursor(cursor)
+        query = query.where(tuple_(Topic.created_at, Topic.id) < tuple_(created_at, topic_id))
+    if slug_prefix:
+        query = query.where(Topic.slug.startswith(slug_prefix, autoescape=True))
+    if tag:
+        query = query.where(Topic.tags.contains({"items": [tag]}))
+
+    return query.order_by(Topic.created_at.desc(), Topic.id.desc())
+
+
+def _split_page(topics: list[Topic], limit: int) -> tuple[list[Topic], str | None]:
+    next_cursor = None
+    if len(topics) > limit:
+        topics = topics[:limit]
+        last = topics[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return topics, next_cursor
+
+
+def paginate_topics(
+    db: Session,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    slug_prefix: str | None = None,
+    tag: str | None = None,
+) -> tuple[list[Topic], str | None]:
+    query = _topic_page_query(cursor, slug_prefix, tag).limit(limit + 1)
+    return _split_page(list(db.scalars(query)), limit)
+
+
+async def paginate_topics_async(
+    db: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    slug_prefix: str | None = None,
+    tag: str | None = None,
+) -> tuple[list[Topic], str | None]:
+    query = _topic_page_query(cursor, slug_prefix, tag).limit(limit + 1)
+    return _split_page(list(await db.scalars(query)), limit)
@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import math
+import re
+import time
+from collections.abc import Mapping
+from typing import Any
+
+from redis import RedisError
+
+from app.config import settings
+from app.generation import SYSTEM_PROMPT
+from app.redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+BUCKET_TTL_MS = 10 * 60 * 1000
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# Refills both buckets from the Redis clock, then takes the request if both have room.
+# Returns 0 when granted, otherwise the number of milliseconds to wait.
+_ACQUIRE_SCRIPT = """
+local key = KEYS[1]
+local requests = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call('HMGET', key, 'rpm', 'tpm', 'req', 'tok', 'ts', 'blocked_until')
+local rpm = tonumber(state[1]) or tonumber(ARGV[1])
+local tpm = tonumber(state[2]) or tonumber(ARGV[2])
+local tokens = math.min(tonumber(ARGV[4]), tpm)
+local blocked_until = tonumber(state[6]) or 0
+if blocked_until > now then
+  return blocked_until - now
+end
+local req = tonumber(state[3]) or rpm
+local tok = tonumber(state[4]) or tpm
+local elapsed = math.max(0, now - (tonumber(state[5]) or now))
+req = math.min(rpm, req + elapsed * rpm / 60000)
+tok = math.min(tpm, tok + elapsed * tpm / 60000)
+local wait = 0
+if req < requests then
+  wait = math.max(wait, (requests - req) * 60000 / rpm)
+end
+if tok < tokens then
+  wait = math.max(wait, (tokens - tok) * 60000 / tpm)
+end
+if wait == 0 then
+  req = req - requests
+  tok = tok - tokens
+end
+redis.call('HSET', key, 'req', req, 'tok', tok, 'ts', now)
+redis.call('PEXPIRE', key, ARGV[5])
+return math.ceil(wait)
+"""
+
+# Applies limits and remaining capacity reported by the provider; remaining values only lower the buckets.
+_OBSERVE_SCRIPT = """
+local key = KEYS[1]
+if ARGV[1] ~= '' then redis.call('HSET', key, 'rpm', ARGV[1]) end
+if ARGV[2] ~= '' then redis.call('HSET', key, 'tpm', ARGV[2]) end
+local state = redis.call('HMGET', key, 'req', 'tok')
+if ARGV[3] ~= '' and state[1] and tonumber(ARGV[3]) < tonumber(state[1]) then
+  redis.call('HSET', key, 'req', ARGV[3])
+end
+if ARGV[4] ~= '' and state[2] and tonumber(ARGV[4]) < tonumber(state[2]) then
+  redis.call('HSET', key, 'tok', ARGV[4])
+end
+if ARGV[5] ~= '' then
+  local t = redis.call('TIME')
+  local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+  redis.call('HSET', key, 'blocked_until', now + tonumber(ARGV[5]))
+end
+redis.call('PEXPIRE', key, ARGV[6])
+return 1
+"""
+
+
+class RateLimitTimeout(Exception):
+    def __init__(self, model: str, retry_after: float) -> None:
+        super().__init__(f"No rate limit capacity for model '{model}' within {settings.openai_rate_limit_max_wait_seconds}s")
+        self.retry_after = retry_after
+
+
+def _bucket_key(model: str) -> str:
+    return f"ratelimit:openai:{model}"
+
+
+def estimate_tokens(prompt: str) -> int:
+    input_tokens = math.ceil((len(SYSTEM_PROMPT) + len(prompt)) / CHARS_PER_TOKEN)
+    return input_tokens + settings.openai_rate_limit_output_tokens
+
+
+def parse_reset_duration(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+def retry_after_seconds(headers: Mapping[str, str] | None) -> float:
+    headers = headers or {}
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    candidates = [
+        parse_reset_duration(headers.get(name))
+        for name in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+    ]
+    return max((value for value in candidates if value is not None), default=1.0)
+
+
+def _int_header(headers: Mapping[str, str], name: str, scale: float = 1.0) -> str:
+    value = headers.get(name)
+    if value is None:
+        return ""
+    try:
+        return str(max(1, int(int(value) * scale)))
+    except ValueError:
+        return ""
+
+
+def _acquire_args(model: str, tokens: int, requests: int) -> tuple[Any, ...]:
+    return (
+        _ACQUIRE_SCRIPT,
+        1,
+        _bucket_key(model),
+        settings.openai_rate_limit_rpm,
+        settings.openai_rate_limit_tpm,
+        requests,
+        tokens,
+        BUCKET_TTL_MS,
+    )
+
+
+def _wait_seconds(model: str, wait_ms: int, deadline: float) -> float:
+    wait = wait_ms / 1000
+    if wait > deadline - time.monotonic():
+        raise RateLimitTimeout(model, wait)
+    return wait
+
+
+def acquire_capacity(model: str, tokens: int, requests: int = 1) -> None:
+    if not settings.openai_rate_limit_enabled:
+        return
+    deadline = time.monotonic() + settings.openai_rate_limit_max_wait_seconds
+    while True:
+        try:
+            wait_ms = get_redis().eval(*_acquire_args(model, tokens, requests))
+        except RedisError:
+            logger.warning("Rate limiter unavailable, calling model %s without waiting", model, exc_info=True)
+            return
+        if not wait_ms:
+            return
+        time.sleep(_wait_seconds(model, wait_ms, deadline))
+
+
+async def acquire_capacity_async(model: str, tokens: int, requests: int = 1) -> None:
+    if not settings.openai_rate_limit_enabled:
+        return
+    deadline = time.monotonic() + settings.openai_rate_limit_max_wait_seconds
+    while True:
+        try:
+            wait_ms = await get_async_redis().eval(*_acquire_args(model, tokens, requests))
+        except RedisError:
+            logger.warning("Rate limiter unavailable, calling model %s without waiting", model, exc_info=True)
+            return
+        if not wait_ms:
+            return
+        await asyncio.sleep(_wait_seconds(model, wait_ms, deadline))
+
+
+def _observe_args(model: str, headers: Mapping[str, str], blocked: bool) -> tuple[Any, ...]:
+    headroom = settings.openai_rate_limit_headroom
+    return (
+        _OBSERVE_SCRIPT,
+        1,
+        _bucket_key(model),
+        _int_header(headers, "x-ratelimit-limit-requests", headroom),
+        _int_header(headers, "x-ratelimit-limit-tokens", headroom),
+        _int_header(headers, "x-ratelimit-remaining-requests"),
+        _int_header(headers, "x-ratelimit-remaining-tokens"),
+        str(int(retry_after_seconds(headers) * 1000)) if blocked else "",
+        BUCKET_TTL_MS,
+    )
+
+
+def observe_rate_limit_headers(model: str, headers: Mapping[str, str] | None, blocked: bool = False) -> None:
+    if not settings.openai_rate_limit_enabled or headers is None:
+        return
+    try:
+        get_redis().eval(*_observe_args(model, headers, blocked))
+    except RedisError:
+        logger.warning("Failed to record rate limit headers for model %s", model, exc_info=True)
+
+
+async def observe_rate_limit_headers_async(model: str, headers: Mapping[str, str] | None, blocked: bool = False) -> None:
+    if not settings.openai_rate_limit_enabled or headers is None:
+        return
+    try:
+        await get_async_redis().eval(*_observe_args(model, headers, blocked))
+    except RedisError:
+        logger.warning("Failed to record rate limit headers for model %s", model, exc_info=True)
+
+
+def _usage_correction(estimated_tokens: int, response: Any) -> int | None:
+    if not settings.openai_rate_limit_enabled:
+        return None
+    usage = getattr(response, "usage", None)
+    actual = getattr(usage, "total_tokens", None)
+    if not isinstance(actual, int):
+        return None
+    return estimated_tokens - actual
+
+
+def record_usage(model: str, estimated_tokens: int, response: Any) -> None:
+    correction = _usage_correction(estimated_tokens, response)
+    if correction is None:
+        return
+    try:
+        get_redis().hincrbyfloat(_bucket_key(model), "tok", correction)
+    except RedisError:
+        logger.warning("Failed to correct token usage for model %s", model, exc_info=True)
+
+
+async def record_usage_async(model: str, estimated_tokens: int, response: Any) -> None:
+    correction = _usage_correction(estimated_tokens, response)
+    if correction is None:
+        return
+    try:
+        await get_async_redis().hincrbyfloat(_bucket_key(model), "tok", correction)
+    except RedisError:
+        logger.warning("Failed to correct token usage for model %s", model, exc_info=True)
@@ -0,0 +1,26 @@
+import threading
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+
+from app.config import settings
+
+_redis: Redis | None = None
+_async_redis: AsyncRedis | None = None
+_redis_lock = threading.Lock()
+
+
+def get_redis() -> Redis:
+    global _redis
+    if _redis is None:
+        with _redis_lock:
+            if _redis is None:
+                _redis = Redis.from_url(settings.redis_url, decode_responses=True)
+    return _redis
+
+
+def get_async_redis() -> AsyncRedis:
+    global _async_redis
+    if _async_redis is None:
+        _async_redis = AsyncRedis.from_url(settings.redis_url, decode_responses=True)
+    return _async_redis
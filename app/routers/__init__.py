@@ -1,10 +1,16 @@
 from fastapi import APIRouter
 
-from app.routers import batches, export, health, runs, topics
+from app.config import settings
+from app.routers import async_reads, batches, export, health, ledger, metrics, runs, topics
 
 api_router = APIRouter()
 api_router.include_router(health.router, tags=["health"])
+if settings.api_async_db:
+    # Registered first so these async handlers take precedence over the sync read routes below.
+    api_router.include_router(async_reads.router)
 api_router.include_router(topics.router)
 api_router.include_router(runs.router)
 api_router.include_router(export.router)
 api_router.include_router(batches.router)
+api_router.include_router(ledger.router)
+api_router.include_router(metrics.router)
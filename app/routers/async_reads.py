@@ -0,0 +1,64 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.dependencies import get_async_db
+from app.models import Artifact, Batch, Run, Topic
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate_topics_async
+from app.schemas import ArtifactOut, BatchOut, RunOut, TopicOut, TopicPage
+
+router = APIRouter()
+
+
+@router.get("/topics", response_model=TopicPage, tags=["topics"])
+async def list_topics_async(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    slug_prefix: str | None = None,
+    tag: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> TopicPage:
+    try:
+        topics, next_cursor = await paginate_topics_async(
+            db, limit=limit, cursor=cursor, slug_prefix=slug_prefix, tag=tag
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return TopicPage(items=topics, next_cursor=next_cursor)
+
+
+@router.get("/topics/{id}", response_model=TopicOut, tags=["topics"])
+async def get_topic_async(id: UUID, db: AsyncSession = Depends(get_async_db)) -> Topic:
+    topic = await db.get(Topic, id)
+    if topic is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
+    return topic
+
+
+@router.get("/runs/{id}", response_model=RunOut, tags=["runs"])
+async def get_run_async(id: UUID, db: AsyncSession = Depends(get_async_db)) -> Run:
+    run = await db.get(Run, id)
+    if run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+    return run
+
+
+@router.get("/runs/{id}/artifacts", response_model=list[ArtifactOut], tags=["runs"])
+async def list_run_artifacts_async(id: UUID, db: AsyncSession = Depends(get_async_db)) -> list[Artifact]:
+    run = await db.get(Run, id)
+    if run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+
+    artifacts = await db.scalars(select(Artifact).where(Artifact.run_id == id).order_by(Artifact.created_at.asc()))
+    return list(artifacts)
+
+
+@router.get("/batches/{id}", response_model=BatchOut, tags=["batches"])
+async def get_batch_async(id: UUID, db: AsyncSession = Depends(get_async_db)) -> Batch:
+    batch = await db.scalar(select(Batch).options(selectinload(Batch.shards), selectinload(Batch.items)).where(Batch.id == id))
+    if batch is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
+    return batch
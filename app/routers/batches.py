@@ -1,12 +1,21 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
 from app.batch_pipeline import create_openai_batch
 from app.batch_tasks import poll_batch
 from app.dependencies import get_db
+from app.idempotency import (
+    IDEMPOTENCY_HEADER,
+    claim_idempotency_key,
+    ensure_replayable,
+    mark_replayed,
+    record_idempotency_result,
+    release_idempotency_key,
+    request_fingerprint,
+)
 from app.models import Batch
 from app.schemas import BatchCreate, BatchOut, BatchPollResponse
 
@@ -14,23 +23,46 @@ router = APIRouter(tags=["batches"])
 
 
 @router.post("/batches", response_model=BatchOut, status_code=status.HTTP_201_CREATED)
-def create_batch(payload: BatchCreate, db: Session = Depends(get_db)) -> Batch:
+def create_batch(
+    payload: BatchCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER, max_length=255),
+) -> Batch:
     if not payload.topic_ids:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="topic_ids must not be empty")
 
+    request_hash = request_fingerprint(payload.model_dump())
+    if idempotency_key:
+        record = claim_idempotency_key(db, "batches", idempotency_key, request_hash)
+        if record is not None:
+            ensure_replayable(record, request_hash)
+            mark_replayed(response)
+            return db.scalar(
+                select(Batch)
+                .options(selectinload(Batch.shards), selectinload(Batch.items))
+                .where(Batch.id == record.resource_id)
+            )
+
     try:
-        batch = create_openai_batch(db, payload.topic_ids, payload.model)
+        batch = create_openai_batch(db, payload.topic_ids, payload.model, use_cache=payload.use_cache)
     except ValueError as exc:
+        if idempotency_key:
+            release_idempotency_key(db, "batches", idempotency_key)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
     except Exception as exc:
+        if idempotency_key:
+            release_idempotency_key(db, "batches", idempotency_key)
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Batch submission failed: {exc}") from exc
 
-    return db.scalar(select(Batch).options(selectinload(Batch.items)).where(Batch.id == batch.id))
+    if idempotency_key:
+        record_idempotency_result(db, "batches", idempotency_key, batch.id)
+    return db.scalar(select(Batch).options(selectinload(Batch.shards), selectinload(Batch.items)).where(Batch.id == batch.id))
 
 
 @router.get("/batches/{id}", response_model=BatchOut)
 def get_batch(id: UUID, db: Session = Depends(get_db)) -> Batch:
-    batch = db.scalar(select(Batch).options(selectinload(Batch.items)).where(Batch.id == id))
+    batch = db.scalar(select(Batch).options(selectinload(Batch.shards), selectinload(Batch.items)).where(Batch.id == id))
     if batch is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
     return batch
@@ -38,13 +70,13 @@ def get_batch(id: UUID, db: Session = Depends(get_db)) -> Batch:
 
 @router.post("/batches/{id}/poll", response_model=BatchPollResponse)
 def trigger_batch_poll(id: UUID, db: Session = Depends(get_db)) -> BatchPollResponse:
-    batch = db.get(Batch, id)
+    batch = db.scalar(select(Batch).options(selectinload(Batch.shards)).where(Batch.id == id))
     if batch is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
 
-    if not batch.openai_batch_id:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Batch has no openai_batch_id")
+    if not any(shard.openai_batch_id for shard in batch.shards):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Batch has no submitted shards")
 
     task = poll_batch.delay(str(id))
-    refreshed = db.scalar(select(Batch).options(selectinload(Batch.items)).where(Batch.id == id))
+    refreshed = db.scalar(select(Batch).options(selectinload(Batch.shards), selectinload(Batch.items)).where(Batch.id == id))
     return BatchPollResponse(batch=refreshed, task_id=task.id)
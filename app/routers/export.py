@@ -1,60 +1,58 @@
-from pathlib import Path
-from typing import Any
 from uuid import UUID
 
-import yaml
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
 from app.config import settings
 from app.dependencies import get_db
-from app.models import Artifact, ArtifactLang, Run, RunStatus
-from app.schemas import ExportResponse
+from app.export import export_gate_reasons, export_runs, load_export_runs
+from app.models import ArtifactLang, Run
+from app.schemas import ExportResponse, RunExportResult, RunsExportRequest, RunsExportResponse
 
 router = APIRouter(tags=["export"])
 
 
-def _render_mdx(frontmatter: dict[str, Any], body_mdx: str) -> str:
-    fm_text = yaml.safe_dump(frontmatter, sort_keys=False, allow_unicode=True).strip()
-    return f"---\n{fm_text}\n---\n\n{body_mdx.rstrip()}\n"
-
-
-def _validate_export_gates(run: Run, fr_artifact: Artifact | None, en_artifact: Artifact | None) -> list[str]:
-    reasons: list[str] = []
-
-    if run.status != RunStatus.SUCCEEDED:
-        reasons.append(f"run.status must be 'succeeded' (current: '{run.status.value}')")
-
-    if fr_artifact is None:
-        reasons.append("missing artifact for lang='fr'")
-    if en_artifact is None:
-        reasons.append("missing artifact for lang='en'")
-
-    if fr_artifact is not None and not fr_artifact.reviewed:
-        reasons.append("artifact 'fr' must have reviewed=true")
-    if en_artifact is not None and not en_artifact.reviewed:
-        reasons.append("artifact 'en' must have reviewed=true")
+@router.post("/runs:export", response_model=RunsExportResponse)
+def export_runs_bulk(payload: RunsExportRequest, db: Session = Depends(get_db)) -> RunsExportResponse:
+    if payload.run_ids is None and payload.batch_id is None and not payload.slug_prefix and not payload.tag:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide run_ids or at least one filter (batch_id, slug_prefix, tag)",
+        )
 
-    meta = run.meta if isinstance(run.meta, dict) else {}
-    claims_to_verify = meta.get("claims_to_verify")
-    if claims_to_verify:
-        reasons.append("run.meta.claims_to_verify must be empty or missing")
+    if not settings.blog_repo_path:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="BLOG_REPO_PATH is not configured")
 
-    return reasons
+    runs = load_export_runs(
+        db,
+        run_ids=payload.run_ids,
+        batch_id=payload.batch_id,
+        slug_prefix=payload.slug_prefix,
+        tag=payload.tag,
+    )
+    exported = export_runs(db, runs, requested_ids=payload.run_ids, force=payload.force)
+    results = [RunExportResult(**result) for result in exported]
+    return RunsExportResponse(
+        exported=sum(1 for result in results if result.status == "exported"),
+        unchanged=sum(1 for result in results if result.status == "unchanged"),
+        blocked=sum(1 for result in results if result.status in ("blocked", "not_found")),
+        failed=sum(1 for result in results if result.status == "error"),
+        files_written=sum(len(result.written) for result in results),
+        files_skipped=sum(len(result.skipped) for result in results),
+        results=results,
+    )
 
 
 @router.post("/runs/{id}/export", response_model=ExportResponse)
 def export_run(id: UUID, db: Session = Depends(get_db)) -> ExportResponse:
-    run = db.scalar(select(Run).options(selectinload(Run.topic)).where(Run.id == id))
+    run = db.scalar(select(Run).options(selectinload(Run.topic), selectinload(Run.artifacts)).where(Run.id == id))
     if run is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
 
-    artifacts = list(db.scalars(select(Artifact).where(Artifact.run_id == run.id)))
-    fr_artifact = next((a for a in artifacts if a.lang == ArtifactLang.FR), None)
-    en_artifact = next((a for a in artifacts if a.lang == ArtifactLang.EN), None)
+    artifacts = {artifact.lang: artifact for artifact in run.artifacts}
 
-    reasons = _validate_export_gates(run, fr_artifact, en_artifact)
+    reasons = export_gate_reasons(run, artifacts.get(ArtifactLang.FR), artifacts.get(ArtifactLang.EN))
     if reasons:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -67,18 +65,13 @@ def export_run(id: UUID, db: Session = Depends(get_db)) -> ExportResponse:
     if not settings.blog_repo_path:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="BLOG_REPO_PATH is not configured")
 
-    repo_root = Path(settings.blog_repo_path)
-    fr_path = repo_root / "src" / "content" / "blog" / "fr" / f"{run.topic.slug}.mdx"
-    en_path = repo_root / "src" / "content" / "blog" / "en" / f"{run.topic.slug}.mdx"
-
-    fr_path.parent.mkdir(parents=True, exist_ok=True)
-    en_path.parent.mkdir(parents=True, exist_ok=True)
-
-    fr_path.write_text(_render_mdx(fr_artifact.frontmatter, fr_artifact.body_mdx), encoding="utf-8")
-    en_path.write_text(_render_mdx(en_artifact.frontmatter, en_artifact.body_mdx), encoding="utf-8")
-
+    result = export_runs(db, [run])[0]
+    if result["status"] == "error":
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=result["reasons"][0])
     return ExportResponse(
         run_id=run.id,
         slug=run.topic.slug,
-        files={"fr": str(fr_path), "en": str(en_path)},
+        files=result["files"],
+        written=result["written"],
+        skipped=result["skipped"],
     )
@@ -1,8 +1,17 @@
+from typing import Any
+
 from fastapi import APIRouter
 
+from app.db import pool_metrics
+
 router = APIRouter()
 
 
 @router.get("/health")
 def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/health/db-pool")
+def db_pool_health() -> dict[str, Any]:
+    return pool_metrics()
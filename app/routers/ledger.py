@@ -0,0 +1,39 @@
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.dependencies import get_db
+from app.ledger import daily_usage, model_stats
+from app.models import RunLedgerEntry
+from app.schemas import LedgerDailyUsage, LedgerMode, LedgerModelStats, RunLedgerOut
+
+router = APIRouter(tags=["ledger"])
+
+
+@router.get("/runs/{id}/ledger", response_model=RunLedgerOut)
+def get_run_ledger(id: UUID, db: Session = Depends(get_db)) -> RunLedgerEntry:
+    entry = db.get(RunLedgerEntry, id)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No ledger entry for this run")
+    return entry
+
+
+@router.get("/ledger/models", response_model=list[LedgerModelStats])
+def get_ledger_model_stats(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    mode: LedgerMode | None = None,
+    db: Session = Depends(get_db),
+) -> list[dict]:
+    return model_stats(db, since=since, until=until, mode=mode)
+
+
+@router.get("/ledger/daily", response_model=list[LedgerDailyUsage])
+def get_ledger_daily_usage(
+    days: int = Query(30, ge=1, le=366),
+    mode: LedgerMode | None = None,
+    db: Session = Depends(get_db),
+) -> list[dict]:
+    return daily_usage(db, days=days, mode=mode)
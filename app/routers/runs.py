@@ -1,36 +1,81 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_db
+from app.events import run_status_stream
+from app.idempotency import (
+    IDEMPOTENCY_HEADER,
+    claim_idempotency_key,
+    ensure_replayable,
+    mark_replayed,
+    record_idempotency_result,
+    request_fingerprint,
+)
 from app.models import Artifact, Run, RunStatus, Topic
-from app.schemas import ArtifactOut, ArtifactPatch, RunCreate, RunCreateResponse, RunOut
-from app.tasks import generate_run
+from app.schemas import ArtifactOut, ArtifactPatch, RunCreate, RunCreateResponse, RunOut, RunPartialOut
+from app.streaming import read_partial
+from app.tasks import enqueue_generation
 
 router = APIRouter(tags=["runs"])
 
 
+def _enqueue_run(run: Run, payload: RunCreate) -> str:
+    try:
+        task = enqueue_generation(run.id, use_cache=payload.use_cache, bulk=payload.bulk)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Run created but task enqueue failed: {exc}",
+        ) from exc
+    return task.id
+
+
 @router.post("/topics/{id}/runs", response_model=RunCreateResponse, status_code=status.HTTP_201_CREATED)
-def create_topic_run(id: UUID, payload: RunCreate, db: Session = Depends(get_db)) -> RunCreateResponse:
+def create_topic_run(
+    id: UUID,
+    payload: RunCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(None, alias=IDEMPOTENCY_HEADER, max_length=255),
+) -> RunCreateResponse:
     topic = db.get(Topic, id)
     if topic is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Topic not found")
 
+    scope = f"topics/{id}/runs"
+    request_hash = request_fingerprint(payload.model_dump())
+    if idempotency_key:
+        record = claim_idempotency_key(db, scope, idempotency_key, request_hash)
+        if record is not None:
+            ensure_replayable(record, request_hash)
+            run = db.get(Run, record.resource_id)
+            if run is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+
+            task_id = record.task_id
+            if task_id is None and run.status == RunStatus.QUEUED:
+                task_id = _enqueue_run(run, payload)
+                record_idempotency_result(db, scope, idempotency_key, run.id, task_id)
+            mark_replayed(response)
+            return RunCreateResponse(run=run, task_id=task_id)
+
     run = Run(topic_id=topic.id, status=RunStatus.QUEUED, model=payload.model, meta={})
     db.add(run)
-    db.commit()
+    if idempotency_key:
+        db.flush()
+        record_idempotency_result(db, scope, idempotency_key, run.id)
+    else:
+        db.commit()
     db.refresh(run)
 
-    try:
-        task = generate_run.delay(str(run.id))
-    except Exception as exc:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Run created but task enqueue failed: {exc}",
-        ) from exc
-    return RunCreateResponse(run=run, task_id=task.id)
+    task_id = _enqueue_run(run, payload)
+    if idempotency_key:
+        record_idempotency_result(db, scope, idempotency_key, run.id, task_id)
+    return RunCreateResponse(run=run, task_id=task_id)
 
 
 @router.get("/runs/{id}", response_model=RunOut)
@@ -41,6 +86,22 @@ def get_run(id: UUID, db: Session = Depends(get_db)) -> Run:
     return run
 
 
+@router.get("/runs/{id}/events", response_class=StreamingResponse)
+async def stream_run_events(id: UUID) -> StreamingResponse:
+    response = await run_status_stream(id)
+    if response is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+    return response
+
+
+@router.get("/runs/{id}/partial", response_model=RunPartialOut)
+def get_run_partial(id: UUID) -> RunPartialOut:
+    partial = read_partial(id)
+    if partial is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No streamed output for run")
+    return RunPartialOut(run_id=id, **partial)
+
+
 @router.get("/runs/{id}/artifacts", response_model=list[ArtifactOut])
 def list_run_artifacts(id: UUID, db: Session = Depends(get_db)) -> list[Artifact]:
     run = db.get(Run, id)
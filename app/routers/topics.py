@@ -1,16 +1,84 @@
-from uuid import UUID
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.db import BIND_CHUNK_SIZE
 from app.dependencies import get_db
 from app.models import Topic
-from app.schemas import TopicCreate, TopicOut, TopicPatch
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate_topics
+from app.schemas import TopicBulkLineResult, TopicBulkReport, TopicCreate, TopicOut, TopicPage, TopicPatch
 
 router = APIRouter(prefix="/topics", tags=["topics"])
 
+BULK_UPDATE_COLUMNS = ("tags", "fr", "en", "context", "constraints", "author_inputs")
+
+
+def _topic_row(payload: TopicCreate) -> dict[str, Any]:
+    return {
+        "id": uuid4(),
+        "slug": payload.slug,
+        "tags": payload.tags,
+        "fr": payload.fr,
+        "en": payload.en,
+        "context": payload.context,
+        "constraints": payload.constraints,
+        "author_inputs": payload.author_inputs,
+    }
+
+
+def _validation_message(exc: ValidationError) -> str:
+    messages = []
+    for error in exc.errors():
+        location = ".".join(str(part) for part in error["loc"])
+        messages.append(f"{location}: {error['msg']}" if location else error["msg"])
+    return "; ".join(messages)
+
+
+def _upsert_topic_chunk(db: Session, rows: list[tuple[int, dict[str, Any]]]) -> list[TopicBulkLineResult]:
+    table = Topic.__table__
+    stmt = pg_insert(table).values([row for _, row in rows])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.slug],
+        set_={**{name: stmt.excluded[name] for name in BULK_UPDATE_COLUMNS}, "updated_at": func.now()},
+    ).returning(table.c.slug, literal_column("xmax = 0").label("inserted"))
+
+    try:
+        inserted_by_slug = {result.slug: result.inserted for result in db.execute(stmt)}
+        db.commit()
+    except SQLAlchemyError as exc:
+        db.rollback()
+        return [
+            TopicBulkLineResult(line=line, slug=row["slug"], status="error", error=f"Chunk upsert failed: {exc}")
+            for line, row in rows
+        ]
+
+    return [
+        TopicBulkLineResult(line=line, slug=row["slug"], status="created" if inserted_by_slug[row["slug"]] else "updated")
+        for line, row in rows
+    ]
+
+
+async def _iter_ndjson_lines(request: Request) -> AsyncIterator[tuple[int, bytes]]:
+    buffer = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if buffer.strip():
+        yield line_no + 1, buffer
+
 
 @router.post("", response_model=TopicOut, status_code=status.HTTP_201_CREATED)
 def create_topic(payload: TopicCreate, db: Session = Depends(get_db)) -> Topic:
@@ -33,9 +101,50 @@ def create_topic(payload: TopicCreate, db: Session = Depends(get_db)) -> Topic:
     return topic
 
 
-@router.get("", response_model=list[TopicOut])
-def list_topics(db: Session = Depends(get_db)) -> list[Topic]:
-    return list(db.scalars(select(Topic).order_by(Topic.created_at.desc())))
+@router.post(":bulk", response_model=TopicBulkReport)
+async def bulk_import_topics(request: Request, db: Session = Depends(get_db)) -> TopicBulkReport:
+    results: list[TopicBulkLineResult] = []
+    chunk: list[tuple[int, dict[str, Any]]] = []
+    chunk_slugs: set[str] = set()
+
+    async for line_no, line in _iter_ndjson_lines(request):
+        try:
+            payload = TopicCreate.model_validate_json(line)
+        except ValidationError as exc:
+            results.append(TopicBulkLineResult(line=line_no, status="error", error=_validation_message(exc)))
+            continue
+
+        if payload.slug in chunk_slugs or len(chunk) >= BIND_CHUNK_SIZE:
+            results.extend(await run_in_threadpool(_upsert_topic_chunk, db, chunk))
+            chunk, chunk_slugs = [], set()
+        chunk.append((line_no, _topic_row(payload)))
+        chunk_slugs.add(payload.slug)
+
+    if chunk:
+        results.extend(await run_in_threadpool(_upsert_topic_chunk, db, chunk))
+
+    results.sort(key=lambda result: result.line)
+    return TopicBulkReport(
+        created=sum(1 for result in results if result.status == "created"),
+        updated=sum(1 for result in results if result.status == "updated"),
+        errors=sum(1 for result in results if result.status == "error"),
+        results=results,
+    )
+
+
+@router.get("", response_model=TopicPage)
+def list_topics(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    slug_prefix: str | None = None,
+    tag: str | None = None,
+    db: Session = Depends(get_db),
+) -> TopicPage:
+    try:
+        topics, next_cursor = paginate_topics(db, limit=limit, cursor=cursor, slug_prefix=slug_prefix, tag=tag)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return TopicPage(items=topics, next_cursor=next_cursor)
 
 
 @router.get("/{id}", response_model=TopicOut)
@@ -0,0 +1,80 @@
+import json
+import zlib
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import RunResponse
+
+RESPONSE_ENCODING = "zlib"
+
+
+def response_body(response: Any) -> dict[str, Any]:
+    if isinstance(response, dict):
+        return response
+    return response.model_dump(mode="json")
+
+
+def run_response_row(run_id: UUID, model: str | None, body: dict[str, Any]) -> dict[str, Any]:
+    raw = json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    compressed = zlib.compress(raw, settings.run_response_compression_level)
+    response_id = body.get("id")
+    return {
+        "run_id": run_id,
+        "model": model or body.get("model"),
+        "response_id": response_id if isinstance(response_id, str) else None,
+        "encoding": RESPONSE_ENCODING,
+        "body": compressed,
+        "size_bytes": len(raw),
+        "compressed_bytes": len(compressed),
+    }
+
+
+def upsert_run_responses(db: Session, rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+    rows = list({row["run_id"]: row for row in rows}.values())
+    stmt = pg_insert(RunResponse).values(rows)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[RunResponse.run_id],
+            set_={
+                "model": stmt.excluded.model,
+                "response_id": stmt.excluded.response_id,
+                "encoding": stmt.excluded.encoding,
+                "body": stmt.excluded.body,
+                "size_bytes": stmt.excluded.size_bytes,
+                "compressed_bytes": stmt.excluded.compressed_bytes,
+                "created_at": func.now(),
+            },
+        )
+    )
+
+
+def store_run_response(db: Session, run_id: UUID, model: str | None, response: Any) -> dict[str, Any]:
+    body = response_body(response)
+    upsert_run_responses(db, [run_response_row(run_id, model, body)])
+    db.commit()
+    return body
+
+
+def decode_run_response(record: RunResponse) -> dict[str, Any]:
+    if record.encoding != RESPONSE_ENCODING:
+        raise ValueError(f"Unsupported run response encoding '{record.encoding}'")
+    return json.loads(zlib.decompress(record.body))
+
+
+def load_run_response(db: Session, run_id: UUID) -> dict[str, Any] | None:
+    record = db.get(RunResponse, run_id)
+    return decode_run_response(record) if record is not None else None
+
+
+def load_run_responses(db: Session, run_ids: list[UUID]) -> dict[UUID, dict[str, Any]]:
+    if not run_ids:
+        return {}
+    records = db.scalars(select(RunResponse).where(RunResponse.run_id.in_(run_ids)))
+    return {record.run_id: decode_run_response(record) for record in records}
@@ -1,5 +1,6 @@
-from datetime import datetime
-from typing import Any
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -42,8 +43,41 @@ class TopicOut(BaseModel):
     updated_at: datetime
 
 
+class TopicSummaryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    slug: str
+    tags: dict[str, Any]
+    fr_content: dict[str, Any] = Field(serialization_alias="fr")
+    en_content: dict[str, Any] = Field(serialization_alias="en")
+    created_at: datetime
+    updated_at: datetime
+
+
+class TopicPage(BaseModel):
+    items: list[TopicSummaryOut]
+    next_cursor: str | None = None
+
+
+class TopicBulkLineResult(BaseModel):
+    line: int
+    slug: str | None = None
+    status: Literal["created", "updated", "error"]
+    error: str | None = None
+
+
+class TopicBulkReport(BaseModel):
+    created: int
+    updated: int
+    errors: int
+    results: list[TopicBulkLineResult]
+
+
 class RunCreate(BaseModel):
     model: str | None = None
+    use_cache: bool | None = None
+    bulk: bool = False
 
 
 class RunOut(BaseModel):
@@ -55,12 +89,20 @@ class RunOut(BaseModel):
     model: str | None
     error: str | None
     meta: dict[str, Any]
+    trace_id: str | None
     started_at: datetime | None
     finished_at: datetime | None
     created_at: datetime
     updated_at: datetime
 
 
+class RunPartialOut(BaseModel):
+    run_id: UUID
+    fr: str
+    en: str
+    done: bool
+
+
 class ArtifactPatch(BaseModel):
     frontmatter: dict[str, Any] | None = None
     body_mdx: str | None = None
@@ -84,13 +126,43 @@ class ArtifactOut(BaseModel):
 
 class RunCreateResponse(BaseModel):
     run: RunOut
-    task_id: str
+    task_id: str | None
 
 
 class ExportResponse(BaseModel):
     run_id: UUID
     slug: str
     files: dict[str, str]
+    written: list[str] = Field(default_factory=list)
+    skipped: list[str] = Field(default_factory=list)
+
+
+class RunsExportRequest(BaseModel):
+    run_ids: list[UUID] | None = None
+    batch_id: UUID | None = None
+    slug_prefix: str | None = None
+    tag: str | None = None
+    force: bool = False
+
+
+class RunExportResult(BaseModel):
+    run_id: UUID
+    slug: str | None
+    status: Literal["exported", "unchanged", "blocked", "not_found", "error"]
+    files: dict[str, str] = Field(default_factory=dict)
+    written: list[str] = Field(default_factory=list)
+    skipped: list[str] = Field(default_factory=list)
+    reasons: list[str] = Field(default_factory=list)
+
+
+class RunsExportResponse(BaseModel):
+    exported: int
+    unchanged: int
+    blocked: int
+    failed: int
+    files_written: int
+    files_skipped: int
+    results: list[RunExportResult]
 
 
 class ExportConflictResponse(BaseModel):
@@ -101,6 +173,7 @@ class ExportConflictResponse(BaseModel):
 class BatchCreate(BaseModel):
     topic_ids: list[UUID]
     model: str | None = None
+    use_cache: bool | None = None
 
 
 class BatchItemOut(BaseModel):
@@ -110,6 +183,7 @@ class BatchItemOut(BaseModel):
     batch_id: UUID
     run_id: UUID
     topic_id: UUID
+    shard_id: UUID | None
     custom_id: str
     status: BatchStatus
     response_code: int | None
@@ -118,6 +192,24 @@ class BatchItemOut(BaseModel):
     updated_at: datetime
 
 
+class BatchShardOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    shard_index: int
+    status: BatchStatus
+    openai_batch_id: str | None
+    input_file_id: str | None
+    output_file_id: str | None
+    remote_status: str | None
+    request_count: int
+    byte_size: int
+    ingested_lines: int
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+
+
 class BatchOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -126,11 +218,67 @@ class BatchOut(BaseModel):
     status: BatchStatus
     openai_batch_id: str | None
     error: str | None
+    next_poll_at: datetime | None
     created_at: datetime
     updated_at: datetime
+    shards: list[BatchShardOut] = Field(default_factory=list)
     items: list[BatchItemOut] = Field(default_factory=list)
 
 
 class BatchPollResponse(BaseModel):
     batch: BatchOut
     task_id: str
+
+
+LedgerMode = Literal["realtime", "batch", "cache", "reparse"]
+
+
+class RunLedgerOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    run_id: UUID
+    model: str
+    mode: LedgerMode
+    status: str
+    retries: int
+    enqueued_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+    queue_wait_ms: int | None
+    model_latency_ms: int | None
+    parse_ms: int | None
+    persist_ms: int | None
+    total_ms: int | None
+    input_tokens: int | None
+    output_tokens: int | None
+    cached_tokens: int | None
+    total_tokens: int | None
+    cost_usd: Decimal | None
+
+
+class LedgerModelStats(BaseModel):
+    model: str
+    mode: LedgerMode
+    runs: int
+    failed: int
+    queue_wait_p50_ms: float | None
+    queue_wait_p95_ms: float | None
+    model_latency_p50_ms: float | None
+    model_latency_p95_ms: float | None
+    total_p50_ms: float | None
+    total_p95_ms: float | None
+    avg_input_tokens: float | None
+    avg_output_tokens: float | None
+    cost_usd: Decimal | None
+    avg_cost_usd: Decimal | None
+
+
+class LedgerDailyUsage(BaseModel):
+    day: date
+    model: str
+    runs: int
+    input_tokens: int
+    output_tokens: int
+    cached_tokens: int
+    total_tokens: int
+    cost_usd: Decimal | None
@@ -0,0 +1,220 @@
+import logging
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+from uuid import UUID
+
+from openai import AsyncOpenAI, OpenAI
+from redis import RedisError
+
+from app.config import settings
+from app.redis_client import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+STREAM_LANGS = ("fr", "en")
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class PartialArtifactParser:
+    def __init__(self) -> None:
+        self.bodies: dict[str, str] = {lang: "" for lang in STREAM_LANGS}
+        self._stack: list[dict[str, Any]] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._key_buffer = ""
+        self._capture_lang: str | None = None
+        self._escape = False
+        self._unicode: str | None = None
+        self._high_surrogate: int | None = None
+
+    def feed(self, text: str) -> None:
+        for char in text:
+            if self._in_string:
+                self._feed_string_char(char)
+            else:
+                self._feed_structural_char(char)
+
+    def _path(self) -> tuple[str, ...]:
+        return tuple(frame["key"] for frame in self._stack if frame["type"] == "object" and frame["key"] is not None)
+
+    def _emit(self, char: str) -> None:
+        if self._string_is_key:
+            self._key_buffer += char
+        elif self._capture_lang is not None:
+            self.bodies[self._capture_lang] += char
+
+    def _emit_code_point(self, code_point: int) -> None:
+        if 0xD800 <= code_point <= 0xDBFF:
+            self._high_surrogate = code_point
+            return
+        if 0xDC00 <= code_point <= 0xDFFF and self._high_surrogate is not None:
+            code_point = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code_point - 0xDC00)
+        self._high_surrogate = None
+        self._emit(chr(code_point))
+
+    def _feed_string_char(self, char: str) -> None:
+        if self._unicode is not None:
+            self._unicode += char
+            if len(self._unicode) == 4:
+                code_point = int(self._unicode, 16)
+                self._unicode = None
+                self._emit_code_point(code_point)
+        elif self._escape:
+            self._escape = False
+            if char == "u":
+                self._unicode = ""
+            else:
+                self._emit(_ESCAPES.get(char, char))
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._string_is_key:
+                self._stack[-1]["key"] = self._key_buffer
+            self._capture_lang = None
+        else:
+            self._emit(char)
+
+    def _feed_structural_char(self, char: str) -> None:
+        top = self._stack[-1] if self._stack else None
+        if char == '"':
+            self._in_string = True
+            self._string_is_key = top is not None and top["type"] == "object" and top["expect"] == "key"
+            self._key_buffer = ""
+            self._capture_lang = None
+            if not self._string_is_key:
+                path = self._path()
+                if len(path) == 3 and path[0] == "artifacts" and path[1] in STREAM_LANGS and path[2] == "body_mdx":
+                    self._capture_lang = path[1]
+        elif char == "{":
+            self._stack.append({"type": "object", "key": None, "expect": "key"})
+        elif char == "[":
+            self._stack.append({"type": "array", "key": None, "expect": "value"})
+        elif char in "}]":
+            if self._stack:
+                self._stack.pop()
+        elif char == ":" and top is not None:
+            top["expect"] = "value"
+        elif char == "," and top is not None and top["type"] == "object":
+            top["expect"] = "key"
+            top["key"] = None
+
+
+def _partial_key(run_id: UUID | str) -> str:
+    return f"run:{run_id}:partial"
+
+
+def write_partial(run_id: UUID | str, bodies: dict[str, str]) -> None:
+    try:
+        pipeline = get_redis().pipeline()
+        pipeline.hset(_partial_key(run_id), mapping={**bodies, "done": "0"})
+        pipeline.expire(_partial_key(run_id), settings.generation_stream_ttl_seconds)
+        pipeline.execute()
+    except RedisError:
+        logger.warning("Failed to write partial generation for run %s", run_id, exc_info=True)
+
+
+async def write_partial_async(run_id: UUID | str, bodies: dict[str, str]) -> None:
+    try:
+        pipeline = get_async_redis().pipeline()
+        pipeline.hset(_partial_key(run_id), mapping={**bodies, "done": "0"})
+        pipeline.expire(_partial_key(run_id), settings.generation_stream_ttl_seconds)
+        await pipeline.execute()
+    except RedisError:
+        logger.warning("Failed to write partial generation for run %s", run_id, exc_info=True)
+
+
+def finish_partial(run_id: UUID | str) -> None:
+    try:
+        pipeline = get_redis().pipeline()
+        pipeline.hset(_partial_key(run_id), "done", "1")
+        pipeline.expire(_partial_key(run_id), 300)
+        pipeline.execute()
+    except RedisError:
+        logger.warning("Failed to finish partial generation for run %s", run_id, exc_info=True)
+
+
+async def finish_partial_async(run_id: UUID | str) -> None:
+    try:
+        pipeline = get_async_redis().pipeline()
+        pipeline.hset(_partial_key(run_id), "done", "1")
+        pipeline.expire(_partial_key(run_id), 300)
+        await pipeline.execute()
+    except RedisError:
+        logger.warning("Failed to finish partial generation for run %s", run_id, exc_info=True)
+
+
+def read_partial(run_id: UUID | str) -> dict[str, Any] | None:
+    try:
+        data = get_redis().hgetall(_partial_key(run_id))
+    except RedisError:
+        logger.warning("Failed to read partial generation for run %s", run_id, exc_info=True)
+        return None
+    if not data:
+        return None
+    return {**{lang: data.get(lang, "") for lang in STREAM_LANGS}, "done": data.get("done") == "1"}
+
+
+class _StreamCollector:
+    def __init__(self, run_id: UUID) -> None:
+        self.run_id = run_id
+        self.parser = PartialArtifactParser()
+        self.final_response = None
+        self.last_flush = 0.0
+
+    def handle(self, event: Any) -> bool:
+        if event.type == "response.output_text.delta":
+            self.parser.feed(event.delta)
+            if time.monotonic() - self.last_flush >= settings.generation_stream_flush_interval:
+                self.last_flush = time.monotonic()
+                return True
+        elif event.type == "response.completed":
+            self.final_response = event.response
+        elif event.type in ("response.failed", "response.incomplete"):
+            error = getattr(event.response, "error", None) or getattr(event.response, "incomplete_details", None)
+            raise RuntimeError(f"OpenAI stream ended with {event.type}: {error}")
+        elif event.type == "error":
+            raise RuntimeError(f"OpenAI stream error: {getattr(event, 'message', event)}")
+        return False
+
+    def finish(self) -> Any:
+        if self.final_response is None:
+            raise RuntimeError("OpenAI stream ended without response.completed")
+        return self.final_response
+
+
+def stream_response(
+    client: OpenAI,
+    run_id: UUID,
+    request: dict[str, Any],
+    on_headers: Callable[[Mapping[str, str]], None] | None = None,
+) -> Any:
+    collector = _StreamCollector(run_id)
+    with client.responses.create(**request, stream=True) as stream:
+        if on_headers is not None:
+            on_headers(stream.response.headers)
+        for event in stream:
+            if collector.handle(event):
+                write_partial(run_id, collector.parser.bodies)
+    response = collector.finish()
+    write_partial(run_id, collector.parser.bodies)
+    return response
+
+
+async def astream_response(
+    client: AsyncOpenAI,
+    run_id: UUID,
+    request: dict[str, Any],
+    on_headers: Callable[[Mapping[str, str]], Awaitable[None]] | None = None,
+) -> Any:
+    collector = _StreamCollector(run_id)
+    async with await client.responses.create(**request, stream=True) as stream:
+        if on_headers is not None:
+            await on_headers(stream.response.headers)
+        async for event in stream:
+            if collector.handle(event):
+                await write_partial_async(run_id, collector.parser.bodies)
+    response = collector.finish()
+    await write_partial_async(run_id, collector.parser.bodies)
+    return response
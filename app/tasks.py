@@ -1,15 +1,26 @@
-from datetime import datetime, timezone
 from uuid import UUID
 
-from openai import OpenAI
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from celery.result import AsyncResult
 
-from app.celery_app import celery_app
+from app.celery_app import (
+    BULK_GENERATION_QUEUE,
+    BULK_PRIORITY,
+    INTERACTIVE_GENERATION_QUEUE,
+    INTERACTIVE_PRIORITY,
+    celery_app,
+)
 from app.config import settings
 from app.db import SessionLocal
-from app.generation import RESPONSE_SCHEMA, build_prompt, parse_response_json, upsert_artifact
-from app.models import ArtifactLang, Run, RunStatus
+from app.generation_runner import (
+    RATE_LIMIT_ERRORS,
+    begin_generation,
+    call_model,
+    complete_generation,
+    fail_generation,
+    requeue_generation,
+)
+from app.generation_cache import evict_generation_cache
+from app.idempotency import purge_expired_idempotency_keys
 
 
 @celery_app.task(
@@ -19,60 +30,42 @@ from app.models import ArtifactLang, Run, RunStatus
     retry_jitter=True,
     max_retries=5,
 )
-def generate_run(self, run_id: str) -> dict:
+def generate_run(self, run_id: str, use_cache: bool | None = None) -> dict:
     with SessionLocal() as session:
-        run = session.scalar(select(Run).options(selectinload(Run.topic)).where(Run.id == UUID(run_id)))
-        if run is None:
-            return {"status": "not_found", "run_id": run_id}
+        job, result = begin_generation(session, UUID(run_id), use_cache, self.request.retries)
+        if job is None:
+            return result
 
-        if run.status in (RunStatus.RUNNING, RunStatus.SUCCEEDED):
-            return {"status": "skipped", "reason": f"run already {run.status.value}", "run_id": run_id}
+        try:
+            response = call_model(job)
+        except RATE_LIMIT_ERRORS as exc:
+            if self.request.retries >= settings.openai_rate_limit_max_requeues:
+                fail_generation(session, job.run_id, exc, job.ledger)
+                raise
+            countdown = requeue_generation(session, job, exc)
+            raise self.retry(exc=exc, countdown=countdown, max_retries=settings.openai_rate_limit_max_requeues)
+        except Exception as exc:
+            fail_generation(session, job.run_id, exc, job.ledger)
+            raise
 
-        run.status = RunStatus.RUNNING
-        run.started_at = datetime.now(timezone.utc)
-        run.error = None
-        session.commit()
+        return complete_generation(session, job, response)
 
-        try:
-            client = OpenAI(api_key=settings.openai_api_key)
-            response = client.responses.create(
-                model=run.model or settings.openai_model,
-                input=[
-                    {
-                        "role": "system",
-                        "content": [{"type": "input_text", "text": "You are a precise content generation engine."}],
-                    },
-                    {
-                        "role": "user",
-                        "content": [{"type": "input_text", "text": build_prompt(run.topic)}],
-                    },
-                ],
-                text={
-                    "format": {
-                        "type": "json_schema",
-                        "name": RESPONSE_SCHEMA["name"],
-                        "strict": RESPONSE_SCHEMA["strict"],
-                        "schema": RESPONSE_SCHEMA["schema"],
-                    }
-                },
-            )
 
-            payload = parse_response_json(response)
-            run.meta = payload["meta"]
+def enqueue_generation(run_id: UUID | str, use_cache: bool | None = None, bulk: bool = False) -> AsyncResult:
+    if bulk:
+        options = {"queue": BULK_GENERATION_QUEUE, "priority": BULK_PRIORITY}
+    else:
+        options = {"queue": INTERACTIVE_GENERATION_QUEUE, "priority": INTERACTIVE_PRIORITY}
+    return generate_run.apply_async(args=(str(run_id),), kwargs={"use_cache": use_cache}, **options)
 
-            upsert_artifact(session, run.id, ArtifactLang.FR, payload["artifacts"]["fr"])
-            upsert_artifact(session, run.id, ArtifactLang.EN, payload["artifacts"]["en"])
 
-            run.status = RunStatus.SUCCEEDED
-            run.finished_at = datetime.now(timezone.utc)
-            run.error = None
-            session.commit()
+@celery_app.task
+def purge_idempotency_keys() -> dict:
+    with SessionLocal() as session:
+        return {"purged": purge_expired_idempotency_keys(session)}
 
-            return {"status": "succeeded", "run_id": run_id}
 
-        except Exception as exc:
-            run.status = RunStatus.FAILED
-            run.finished_at = datetime.now(timezone.utc)
-            run.error = str(exc)
-            session.commit()
-            raise
+@celery_app.task
+def evict_generation_cache_entries() -> dict:
+    with SessionLocal() as session:
+        return {"evicted": evict_generation_cache(session)}
@@ -0,0 +1,311 @@
+import argparse
+import json
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode, format_span_id, format_trace_id
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+SQL_STATEMENT_MAX_LENGTH = 2000
+TRACE_ID_HEADER = "x-trace-id"
+
+T = TypeVar("T")
+
+tracer = trace.get_tracer("app")
+_configured = False
+_task_spans: dict[str, tuple[Span, object]] = {}
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(_span_record(span), default=str) + "\n" for span in spans)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock, self.path.open("a", encoding="utf-8") as handle:
+                handle.write(lines)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _span_record(span: ReadableSpan) -> dict[str, Any]:
+    return {
+        "trace_id": format_trace_id(span.context.trace_id),
+        "span_id": format_span_id(span.context.span_id),
+        "parent_id": format_span_id(span.parent.span_id) if span.parent else None,
+        "name": span.name,
+        "kind": span.kind.name,
+        "service": span.resource.attributes.get("service.name"),
+        "start_ns": span.start_time,
+        "end_ns": span.end_time,
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {}),
+        "events": [{"name": item.name, "attributes": dict(item.attributes or {})} for item in span.events],
+    }
+
+
+def _build_exporter() -> SpanExporter:
+    if settings.tracing_exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    if settings.tracing_exporter == "console":
+        return ConsoleSpanExporter()
+    return JsonLinesSpanExporter(settings.tracing_file_path)
+
+
+def tracing_enabled() -> bool:
+    return settings.tracing_exporter != "none"
+
+
+def configure_tracing(component: str) -> None:
+    global _configured
+    if _configured or not tracing_enabled():
+        return
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": f"{settings.tracing_service_name}-{component}"}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_build_exporter()))
+    trace.set_tracer_provider(provider)
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_sql_error)
+    _configured = True
+
+
+def _attribute(value: Any) -> Any:
+    return value if isinstance(value, (bool, int, float, str)) else str(value)
+
+
+@contextmanager
+def traced(name: str, kind: SpanKind = SpanKind.INTERNAL, **attributes: Any) -> Iterator[Span]:
+    clean = {key: _attribute(value) for key, value in attributes.items() if value is not None}
+    with tracer.start_as_current_span(name, kind=kind, attributes=clean) as span:
+        yield span
+
+
+def current_trace_id() -> str | None:
+    span_context = trace.get_current_span().get_span_context()
+    return format_trace_id(span_context.trace_id) if span_context.is_valid else None
+
+
+def trace_url(trace_id: str | None) -> str | None:
+    if not trace_id or not settings.tracing_trace_url:
+        return None
+    return settings.tracing_trace_url.format(trace_id=trace_id)
+
+
+def with_current_context(fn: Callable[..., T]) -> Callable[..., T]:
+    # Executor threads start with an empty context; carry the caller's span so their spans join its trace.
+    parent = otel_context.get_current()
+
+    def run(*args: Any, **kwargs: Any) -> T:
+        token = otel_context.attach(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            otel_context.detach(token)
+
+    return run
+
+
+def inject_trace_headers(headers: dict[str, Any]) -> None:
+    propagate.inject(headers)
+
+
+def trace_header_fields() -> set[str]:
+    return propagate.get_global_textmap().fields
+
+
+def start_task_span(task_id: str, task_name: str, carrier: Mapping[str, str]) -> None:
+    span = tracer.start_span(
+        f"celery.task {task_name}",
+        context=propagate.extract(carrier),
+        kind=SpanKind.CONSUMER,
+        attributes={"celery.task_id": task_id, "celery.task_name": task_name},
+    )
+    token = otel_context.attach(trace.set_span_in_context(span))
+    _task_spans[task_id] = (span, token)
+
+
+def record_task_exception(task_id: str, exc: BaseException) -> None:
+    entry = _task_spans.get(task_id)
+    if entry is not None:
+        entry[0].record_exception(exc)
+
+
+def end_task_span(task_id: str, state: str | None) -> None:
+    entry = _task_spans.pop(task_id, None)
+    if entry is None:
+        return
+    span, token = entry
+    span.set_attribute("celery.state", state or "UNKNOWN")
+    if state == "FAILURE":
+        span.set_status(Status(StatusCode.ERROR))
+    otel_context.detach(token)
+    span.end()
+
+
+@contextmanager
+def task_span(task_id: str, task_name: str, carrier: Mapping[str, str]) -> Iterator[Span]:
+    with tracer.start_as_current_span(
+        f"celery.task {task_name}",
+        context=propagate.extract(carrier),
+        kind=SpanKind.CONSUMER,
+        attributes={"celery.task_id": task_id, "celery.task_name": task_name},
+    ) as span:
+        yield span
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    # Statements outside a traced request or task (pool pings, beat) would each become a one-span trace.
+    if not trace.get_current_span().get_span_context().is_valid:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    span = tracer.start_span(
+        f"SQL {operation}",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": "postgresql",
+            "db.statement": statement[:SQL_STATEMENT_MAX_LENGTH],
+            "db.executemany": executemany,
+        },
+    )
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    spans = conn.info.get("trace_spans")
+    if not spans:
+        return
+    span = spans.pop()
+    if cursor.rowcount is not None and cursor.rowcount >= 0:
+        span.set_attribute("db.rowcount", cursor.rowcount)
+    span.end()
+
+
+def _handle_sql_error(exception_context: Any) -> None:
+    connection = exception_context.connection
+    spans = connection.info.get("trace_spans") if connection is not None else None
+    if not spans:
+        return
+    span = spans.pop()
+    span.record_exception(exception_context.original_exception)
+    span.set_status(Status(StatusCode.ERROR, type(exception_context.original_exception).__name__))
+    span.end()
+
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        method = scope["method"]
+        with tracer.start_as_current_span(
+            method,
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.method": method, "http.target": scope["path"]},
+        ) as span:
+            trace_id = current_trace_id()
+
+            async def send_with_trace_id(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                    if trace_id:
+                        message = {
+                            **message,
+                            "headers": [*message.get("headers", []), (TRACE_ID_HEADER.encode(), trace_id.encode())],
+                        }
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    span.set_attribute("http.route", route)
+                    span.update_name(f"{method} {route}")
+
+
+def load_trace(paths: list[str], trace_id: str) -> list[dict[str, Any]]:
+    spans: list[dict[str, Any]] = []
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if trace_id in line:
+                    record = json.loads(line)
+                    if record["trace_id"] == trace_id:
+                        spans.append(record)
+    return sorted(spans, key=lambda record: record["start_ns"])
+
+
+def format_trace(spans: list[dict[str, Any]]) -> list[str]:
+    if not spans:
+        return []
+    known = {span["span_id"] for span in spans}
+    children: dict[str | None, list[dict[str, Any]]] = defaultdict(list)
+    for span in spans:
+        children[span["parent_id"] if span["parent_id"] in known else None].append(span)
+
+    origin = spans[0]["start_ns"]
+    lines: list[str] = []
+
+    def walk(parent_id: str | None, depth: int) -> None:
+        for span in children[parent_id]:
+            offset_ms = (span["start_ns"] - origin) / 1e6
+            duration_ms = (span["end_ns"] - span["start_ns"]) / 1e6
+            status = "" if span["status"] != "ERROR" else "  ERROR"
+            lines.append(
+                f"{offset_ms:>10.1f}ms {duration_ms:>10.1f}ms  {'  ' * depth}{span['name']}  [{span['service']}]{status}"
+            )
+            walk(span["span_id"], depth + 1)
+
+    walk(None, 0)
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print one trace from JSON-lines span files as a tree.")
+    parser.add_argument("trace_id")
+    parser.add_argument("files", nargs="*", help=f"Span files (default: {settings.tracing_file_path})")
+    args = parser.parse_args()
+
+    spans = load_trace(args.files or [settings.tracing_file_path], args.trace_id)
+    if not spans:
+        parser.exit(1, f"trace {args.trace_id} not found\n")
+    print(f"{'start':>12} {'duration':>12}  span")
+    print("\n".join(format_trace(spans)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_load(base_url: str, paths: list[str], requests: int, concurrency: int) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            for index in counter:
+                path = paths[index % len(paths)]
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "req_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+    }
+
+
+def _wait_for_health(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"API at {base_url} did not become healthy")
+
+
+def run_against_server(api_async_db: bool, port: int, workers: int, args: argparse.Namespace) -> dict[str, float]:
+    env = {**os.environ, "API_ASYNC_DB": "true" if api_async_db else "false"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_for_health(base_url)
+        asyncio.run(run_load(base_url, args.path, min(args.requests, 200), args.concurrency))
+        return asyncio.run(run_load(base_url, args.path, args.requests, args.concurrency))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare req/s and p99 latency of the sync and async API read paths.")
+    parser.add_argument("--path", action="append", help="GET path to exercise (repeatable), e.g. /runs/<id>")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--base-url", help="Benchmark an already running API instead of spawning sync/async servers")
+    args = parser.parse_args()
+    args.path = args.path or ["/topics?limit=50"]
+
+    if args.base_url:
+        results = {"external": asyncio.run(run_load(args.base_url, args.path, args.requests, args.concurrency))}
+    else:
+        results = {
+            "sync": run_against_server(False, args.port, args.workers, args),
+            "async": run_against_server(True, args.port, args.workers, args),
+        }
+
+    print(f"{'mode':<10}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<10}{result['requests']:>10}{result['errors']:>8}"
+            f"{result['req_per_s']:>10.1f}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+from benchmarks.openai_client import CANNED_RESPONSE
+
+
+class _SlowStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 1.0
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        body = json.dumps(CANNED_RESPONSE).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def _rss_kib(field: str) -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field):
+                return int(line.split()[1])
+    return 0
+
+
+def _jobs(count: int) -> list:
+    from app.generation_runner import GenerationJob
+
+    return [GenerationJob(uuid4(), "bench-model", "{}", None) for _ in range(count)]
+
+
+def _run_async(jobs: list) -> None:
+    from app.async_worker import acall_model
+
+    async def run_all() -> None:
+        await asyncio.gather(*(acall_model(job) for job in jobs))
+
+    asyncio.run(run_all())
+
+
+def _run_threads(jobs: list) -> None:
+    from app.generation_runner import call_model
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        list(pool.map(call_model, jobs))
+
+
+def _child(mode: str, concurrency: int, base_url: str) -> None:
+    from app.config import settings
+
+    settings.openai_base_url = base_url
+    settings.openai_api_key = settings.openai_api_key or "bench"
+    settings.openai_rate_limit_enabled = False
+    settings.generation_streaming_enabled = False
+    settings.openai_max_connections = max(settings.openai_max_connections, concurrency)
+    settings.async_worker_concurrency = concurrency
+
+    baseline = _rss_kib("VmRSS:")
+    jobs = _jobs(concurrency)
+    started = time.perf_counter()
+    if mode == "asyncio":
+        _run_async(jobs)
+    else:
+        _run_threads(jobs)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"baseline_kib": baseline, "peak_kib": _rss_kib("VmHWM:"), "elapsed": elapsed}))
+
+
+def _measure(mode: str, concurrency: int, base_url: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.async_worker", "--child", mode, str(concurrency), "--base-url", base_url],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory and wall time of in-flight generations: asyncio vs threads vs prefork.")
+    parser.add_argument("--levels", default="10,50,100,200,500", help="Comma-separated in-flight generation counts")
+    parser.add_argument("--latency", type=float, default=2.0, help="Seconds the stand-in model takes per call")
+    parser.add_argument("--base-url", help="Existing OpenAI-compatible endpoint; defaults to a local stand-in server")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "CONCURRENCY"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child[0], int(args.child[1]), args.base_url)
+        return
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        _SlowStandInHandler.latency = args.latency
+        server = _Server(("127.0.0.1", 0), _SlowStandInHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    from app.config import settings
+
+    async_pool = settings.async_worker_db_pool_size + settings.async_worker_db_max_overflow
+    print(f"model latency: {args.latency}s (prefork = one process per in-flight generation at the idle process RSS)")
+    print(f"{'in-flight':>10}{'mode':>10}{'wall s':>9}{'RSS MiB':>10}{'KiB/gen':>10}{'DB conns':>10}")
+    try:
+        for level in (int(value) for value in args.levels.split(",")):
+            for mode in ("asyncio", "threads"):
+                result = _measure(mode, level, base_url)
+                delta = result["peak_kib"] - result["baseline_kib"]
+                db_conns = async_pool if mode == "asyncio" else level
+                print(
+                    f"{level:>10}{mode:>10}{result['elapsed']:>9.2f}{result['peak_kib'] / 1024:>10.1f}"
+                    f"{delta / level:>10.1f}{db_conns:>10}"
+                )
+            print(f"{level:>10}{'prefork':>10}{'-':>9}{result['baseline_kib'] * level / 1024:>10.1f}{result['baseline_kib']:>10}{level:>10}")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
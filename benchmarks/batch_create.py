@@ -0,0 +1,125 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, insert
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.endswith("/files"):
+            payload = {
+                "id": f"file-{uuid4().hex}",
+                "object": "file",
+                "bytes": 0,
+                "created_at": 0,
+                "filename": "batch.jsonl",
+                "purpose": "batch",
+                "status": "processed",
+            }
+        else:
+            payload = {
+                "id": f"batch_{uuid4().hex}",
+                "object": "batch",
+                "endpoint": "/v1/responses",
+                "input_file_id": "file-bench",
+                "completion_window": "24h",
+                "status": "validating",
+                "created_at": 0,
+            }
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+def _seed_topics(count: int, prefix: str) -> list[UUID]:
+    from app.db import SessionLocal
+    from app.models import Topic
+
+    rows = [
+        {
+            "id": uuid4(),
+            "slug": f"{prefix}-{index}",
+            "tags": {"items": ["bench"]},
+            "fr_content": {"title": f"Sujet {index}", "summary": "Résumé de test pour le benchmark."},
+            "en_content": {"title": f"Topic {index}", "summary": "Benchmark summary used to size request lines."},
+            "context": {},
+            "constraints_json": {},
+            "author_inputs": {},
+        }
+        for index in range(count)
+    ]
+    with SessionLocal() as db:
+        db.execute(insert(Topic), rows)
+        db.commit()
+    return [row["id"] for row in rows]
+
+
+def _cleanup(prefix: str, batch_id: UUID) -> None:
+    from app.db import SessionLocal
+    from app.models import Batch, Topic
+
+    with SessionLocal() as db:
+        db.execute(delete(Batch).where(Batch.id == batch_id))
+        db.execute(delete(Topic).where(Topic.slug.startswith(f"{prefix}-")))
+        db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time create_openai_batch as the number of topics grows.")
+    parser.add_argument("--sizes", default="100,1000,10000,50000", help="Comma-separated topic counts")
+    parser.add_argument("--base-url", help="Existing OpenAI-compatible endpoint; defaults to a local stand-in server")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    from app.config import settings
+
+    settings.openai_base_url = base_url
+    settings.openai_api_key = settings.openai_api_key or "bench"
+
+    from app.batch_pipeline import create_openai_batch
+    from app.db import SessionLocal
+
+    prefix = f"bench-batch-{uuid4().hex[:8]}"
+    results = []
+    try:
+        for size in sizes:
+            topic_ids = _seed_topics(size, f"{prefix}-{size}")
+            with SessionLocal() as db:
+                started = time.perf_counter()
+                batch = create_openai_batch(db, topic_ids, "bench-model", use_cache=False)
+                elapsed = time.perf_counter() - started
+                results.append((size, len(batch.shards), elapsed))
+                batch_id = batch.id
+            _cleanup(f"{prefix}-{size}", batch_id)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print(f"{'topics':>8}{'shards':>8}{'total s':>10}{'ms/topic':>10}{'topics/s':>11}")
+    for size, shard_count, elapsed in results:
+        print(f"{size:>8}{shard_count:>8}{elapsed:>10.2f}{elapsed * 1000 / size:>10.3f}{size / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
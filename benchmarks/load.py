@@ -0,0 +1,332 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+from uuid import UUID, uuid4
+
+import httpx
+from sqlalchemy import delete, func, insert, select, update
+
+from benchmarks.openai_stand_in import add_stand_in_arguments, start_stand_in
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+ALL_QUEUES = "generation.interactive,generation.bulk,batches.polling,maintenance"
+COMPARED_FIELDS = (("per_s", -1), ("p95_ms", 1))
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summary(samples: list[float], elapsed: float, count: int, errors: int) -> dict[str, float]:
+    return {
+        "count": count,
+        "errors": errors,
+        "per_s": count / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": statistics.median(samples) * 1000 if samples else 0.0,
+        "p95_ms": _percentile(samples, 95) * 1000 if samples else 0.0,
+        "p99_ms": _percentile(samples, 99) * 1000 if samples else 0.0,
+    }
+
+
+def _seed_topics(count: int, prefix: str) -> list[UUID]:
+    from app.db import SessionLocal
+    from app.models import Topic
+
+    rows = [
+        {
+            "id": uuid4(),
+            "slug": f"{prefix}-{index}",
+            "tags": {"items": ["bench"]},
+            "fr_content": {"title": f"Sujet {index}", "summary": "Résumé de test pour le benchmark."},
+            "en_content": {"title": f"Topic {index}", "summary": "Benchmark summary used to size request lines."},
+            "context": {},
+            "constraints_json": {},
+            "author_inputs": {},
+        }
+        for index in range(count)
+    ]
+    with SessionLocal() as db:
+        db.execute(insert(Topic), rows)
+        db.commit()
+    return [row["id"] for row in rows]
+
+
+def _cleanup(prefix: str) -> None:
+    from app.db import SessionLocal
+    from app.models import Batch, BatchItem, ExportManifestEntry, Run, Topic
+
+    with SessionLocal() as db:
+        topic_ids = select(Topic.id).where(Topic.slug.startswith(f"{prefix}-"))
+        batch_ids = select(BatchItem.batch_id).join(Run, Run.id == BatchItem.run_id).where(Run.topic_id.in_(topic_ids))
+        db.execute(delete(Batch).where(Batch.id.in_(batch_ids)))
+        db.execute(delete(ExportManifestEntry).where(ExportManifestEntry.slug.startswith(f"{prefix}-")))
+        db.execute(delete(Topic).where(Topic.slug.startswith(f"{prefix}-")))
+        db.commit()
+
+
+def _wait_for_health(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"API at {base_url} did not become healthy")
+
+
+def _start_services(args: argparse.Namespace, openai_base_url: str, export_dir: str) -> list[subprocess.Popen]:
+    env = {
+        **os.environ,
+        "OPENAI_BASE_URL": openai_base_url,
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "bench",
+        "BLOG_REPO_PATH": export_dir,
+        "BATCH_AUTO_POLL_ENABLED": "false",
+        "WORKER_METRICS_PORT": "0",
+    }
+    quiet = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL} if not args.verbose else {}
+    commands = [
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--workers", str(args.api_workers), "--log-level", "warning"],
+    ]
+    if args.worker == "async":
+        commands.append([sys.executable, "-m", "app.async_worker", "--concurrency", str(args.worker_concurrency)])
+        queues = "batches.polling,maintenance"
+    else:
+        queues = ALL_QUEUES
+    commands.append(
+        [
+            sys.executable, "-m", "celery", "-A", "app.celery_app.celery_app", "worker", "--loglevel=WARNING",
+            "-n", f"bench-{uuid4().hex[:6]}@%h", "-Q", queues, "--concurrency", str(args.worker_concurrency),
+        ]
+    )
+    return [subprocess.Popen(command, env=env, **quiet) for command in commands]
+
+
+def _stop_services(processes: list[subprocess.Popen]) -> None:
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def _create_runs(base_url: str, topic_ids: list[UUID], concurrency: int) -> tuple[dict[str, float], list[UUID]]:
+    latencies: list[float] = []
+    run_ids: list[UUID] = []
+    errors = 0
+    pending = iter(topic_ids)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            for topic_id in pending:
+                started = time.perf_counter()
+                try:
+                    response = await client.post(f"/topics/{topic_id}/runs", json={"use_cache": False})
+                    response.raise_for_status()
+                    run_ids.append(UUID(response.json()["run"]["id"]))
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return _summary(latencies, elapsed, len(run_ids), errors), run_ids
+
+
+def _wait_for_runs(run_ids: list[UUID], timeout: float) -> dict[str, float]:
+    from app.db import SessionLocal
+    from app.models import Run, RunStatus
+
+    deadline = time.monotonic() + timeout
+    with SessionLocal() as db:
+        while time.monotonic() < deadline:
+            pending = db.scalar(
+                select(func.count())
+                .select_from(Run)
+                .where(Run.id.in_(run_ids), Run.status.in_((RunStatus.QUEUED, RunStatus.RUNNING)))
+            )
+            if not pending:
+                break
+            db.rollback()
+            time.sleep(0.5)
+        rows = db.execute(select(Run.status, Run.created_at, Run.finished_at).where(Run.id.in_(run_ids))).all()
+
+    finished = [row for row in rows if row.status == RunStatus.SUCCEEDED and row.finished_at]
+    durations = [(row.finished_at - row.created_at).total_seconds() for row in finished]
+    errors = len(rows) - len(finished)
+    elapsed = (max(row.finished_at for row in finished) - min(row.created_at for row in rows)).total_seconds() if finished else 0.0
+    return _summary(durations, elapsed, len(finished), errors)
+
+
+def _poll_until_done(client: httpx.Client, batch_id: str, openai_base_url: str, timeout: float) -> dict[str, Any]:
+    from openai import OpenAI
+
+    from app.celery_app import celery_app
+
+    openai = OpenAI(api_key="bench", base_url=openai_base_url)
+    deadline = time.monotonic() + timeout
+    ingest_seconds: list[float] = []
+    while time.monotonic() < deadline:
+        batch = client.get(f"/batches/{batch_id}").json()
+        if batch["status"] in TERMINAL_STATUSES:
+            break
+        remote_ids = [shard["openai_batch_id"] for shard in batch["shards"] if shard["status"] == "running"]
+        # Only trigger the poll once the remote side is done, so the task time is ingestion time.
+        if remote_ids and all(openai.batches.retrieve(remote_id).status == "completed" for remote_id in remote_ids):
+            started = time.perf_counter()
+            task_id = client.post(f"/batches/{batch_id}/poll").json()["task_id"]
+            celery_app.AsyncResult(task_id).get(timeout=max(deadline - time.monotonic(), 1.0), propagate=False)
+            ingest_seconds.append(time.perf_counter() - started)
+            continue
+        time.sleep(0.5)
+    return {"ingest_seconds": sum(ingest_seconds), "status": batch["status"], "items": len(batch["items"]), "batch": batch}
+
+
+def _run_batch(base_url: str, openai_base_url: str, topic_ids: list[UUID], timeout: float) -> dict[str, dict[str, float]]:
+    with httpx.Client(base_url=base_url, timeout=max(timeout, 60.0)) as client:
+        started = time.perf_counter()
+        response = client.post("/batches", json={"topic_ids": [str(topic_id) for topic_id in topic_ids], "use_cache": False})
+        submit_elapsed = time.perf_counter() - started
+        submitted = response.status_code < 400
+        results = {"batch submit": _summary([submit_elapsed], submit_elapsed, len(topic_ids) if submitted else 0, 0 if submitted else 1)}
+        if not submitted:
+            return results
+
+        polled = _poll_until_done(client, response.json()["id"], openai_base_url, timeout)
+        succeeded = sum(item["status"] == "succeeded" for item in polled["batch"]["items"])
+        ingest = polled["ingest_seconds"]
+        per_item = [ingest / polled["items"]] if polled["items"] else []
+        results["batch ingest"] = _summary(per_item, ingest, succeeded, polled["items"] - succeeded)
+        return results
+
+
+def _mark_reviewed(run_ids: list[UUID]) -> None:
+    from app.db import SessionLocal
+    from app.models import Artifact
+
+    with SessionLocal() as db:
+        db.execute(update(Artifact).where(Artifact.run_id.in_(run_ids)).values(reviewed=True))
+        db.commit()
+
+
+def _run_export(base_url: str, prefix: str, run_ids: list[UUID]) -> dict[str, dict[str, float]]:
+    _mark_reviewed(run_ids)
+    results: dict[str, dict[str, float]] = {}
+    with httpx.Client(base_url=base_url, timeout=600.0) as client:
+        for label in ("export", "export unchanged"):
+            started = time.perf_counter()
+            response = client.post("/runs:export", json={"slug_prefix": f"{prefix}-"})
+            elapsed = time.perf_counter() - started
+            body = response.json() if response.status_code < 400 else {}
+            files = body.get("files_written", 0) + body.get("files_skipped", 0)
+            per_file = [elapsed / files] if files else []
+            results[label] = _summary(per_file, elapsed, files, body.get("failed", 1 if response.status_code >= 400 else 0))
+    return results
+
+
+def _compare(results: dict[str, dict[str, float]], baseline_path: str, tolerance: float) -> list[str]:
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)["results"]
+    regressions = []
+    for scenario, result in results.items():
+        previous = baseline.get(scenario)
+        if not previous:
+            continue
+        for field, direction in COMPARED_FIELDS:
+            if not previous[field]:
+                continue
+            change = (result[field] - previous[field]) / previous[field]
+            if change * direction > tolerance:
+                regressions.append(f"{scenario}: {field} {previous[field]:.1f} -> {result[field]:.1f} ({change:+.0%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="End-to-end throughput and latency of the API and workers against a local OpenAI stand-in."
+    )
+    parser.add_argument("--runs", type=int, default=200, help="Realtime generations to create")
+    parser.add_argument("--batch-size", type=int, default=500, help="Topics submitted as one OpenAI batch (0 skips)")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent run creation requests")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--api-workers", type=int, default=1)
+    parser.add_argument("--worker", choices=("celery", "async"), default="celery", help="Generation worker to run")
+    parser.add_argument("--worker-concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds to wait for generations and batches")
+    parser.add_argument("--openai-base-url", help="Existing stand-in to use instead of starting one in-process")
+    parser.add_argument("--output", help="Write results as JSON (use as a later --baseline)")
+    parser.add_argument("--baseline", help="Previous --output file; exit 1 if a scenario regressed")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop / p95 increase vs baseline")
+    parser.add_argument("--verbose", action="store_true", help="Show API and worker logs")
+    add_stand_in_arguments(parser)
+    args = parser.parse_args()
+
+    stand_in = None
+    openai_base_url = args.openai_base_url
+    if openai_base_url is None:
+        stand_in = start_stand_in(args)
+        openai_base_url = stand_in.base_url
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    prefix = f"bench-load-{uuid4().hex[:8]}"
+    export_dir = tempfile.mkdtemp(prefix="bench-export-")
+    results: dict[str, dict[str, float]] = {}
+    processes = _start_services(args, openai_base_url, export_dir)
+    try:
+        _wait_for_health(base_url)
+        if args.runs:
+            topic_ids = _seed_topics(args.runs, f"{prefix}-rt")
+            results["run create"], run_ids = asyncio.run(_create_runs(base_url, topic_ids, args.concurrency))
+            results["generation"] = _wait_for_runs(run_ids, args.timeout)
+            results.update(_run_export(base_url, f"{prefix}-rt", run_ids))
+        if args.batch_size:
+            topic_ids = _seed_topics(args.batch_size, f"{prefix}-batch")
+            results.update(_run_batch(base_url, openai_base_url, topic_ids, args.timeout))
+    finally:
+        _stop_services(processes)
+        if stand_in is not None:
+            stand_in.shutdown()
+        _cleanup(prefix)
+        shutil.rmtree(export_dir, ignore_errors=True)
+
+    print(f"model latency: {args.latency} median {args.latency_ms:.0f}ms, worker: {args.worker} x{args.worker_concurrency}")
+    print(f"{'scenario':<18}{'count':>8}{'errors':>8}{'per s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for scenario, result in results.items():
+        print(
+            f"{scenario:<18}{result['count']:>8}{result['errors']:>8}{result['per_s']:>10.1f}"
+            f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+        )
+    if stand_in is not None:
+        print(f"stand-in calls: {json.dumps(stand_in.state.counts, sort_keys=True)}")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"args": {key: value for key, value in vars(args).items() if key != "baseline"}, "results": results}, handle, indent=2)
+    if args.baseline:
+        regressions = _compare(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import yaml
+
+WORDS = "data pipeline latency warehouse streaming schema index partition cache replica query cost".split()
+# Accented, typographic and emoji words keep the output comparison honest for non-ASCII frontmatter.
+UNICODE_WORDS = "données requête élevée coût « entrepôt » — “schéma” 🚀 📈 ✅ 😀".split()
+
+
+def _sentence(rng: random.Random, words: int, vocabulary: list[str] = WORDS) -> str:
+    return " ".join(rng.choice(vocabulary) for _ in range(words)).capitalize() + "."
+
+
+def _synthetic_artifacts(count: int, seed: int) -> list[SimpleNamespace]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    artifacts = []
+    for index in range(count):
+        # One artifact in four is French-style text with emoji, the rest plain ASCII.
+        vocabulary = WORDS + UNICODE_WORDS if index % 4 == 0 else WORDS
+        frontmatter = {
+            "title": _sentence(rng, 8, vocabulary),
+            "description": _sentence(rng, 25, vocabulary),
+            "pubDate": now.date().isoformat(),
+            "lang": rng.choice(["fr", "en"]),
+            "slug": f"article-{index}",
+            "tags": [rng.choice(WORDS) for _ in range(5)],
+            "author": {"name": "DataSaaS Lab", "url": "https://example.com"},
+            "faq": [{"q": _sentence(rng, 10, vocabulary), "a": _sentence(rng, 30, vocabulary)} for _ in range(4)],
+            "draft": False,
+        }
+        body = "\n\n".join(f"## {_sentence(rng, 4)}\n\n{_sentence(rng, 120)}" for _ in range(8))
+        artifacts.append(SimpleNamespace(id=uuid4(), updated_at=now, frontmatter=frontmatter, body_mdx=body))
+    return artifacts
+
+
+def _db_artifacts(limit: int) -> list:
+    from sqlalchemy import select
+
+    from app.db import SessionLocal
+    from app.models import Artifact
+
+    with SessionLocal() as db:
+        artifacts = list(db.scalars(select(Artifact).limit(limit)))
+        db.expunge_all()
+    return artifacts
+
+
+def _pure_python(artifact: SimpleNamespace) -> str:
+    fm_text = yaml.safe_dump(artifact.frontmatter or {}, sort_keys=False, allow_unicode=True).strip()
+    return f"---\n{fm_text}\n---\n\n{(artifact.body_mdx or '').rstrip()}\n"
+
+
+def _time(label: str, render, artifacts: list) -> float:
+    started = time.perf_counter()
+    for artifact in artifacts:
+        render(artifact)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28}{elapsed * 1000:>10.1f}{elapsed * 1e6 / len(artifacts):>12.1f}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare MDX frontmatter rendering strategies.")
+    parser.add_argument("--count", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--from-db", action="store_true", help="Render artifacts from DATABASE_URL instead of synthetic ones")
+    args = parser.parse_args()
+
+    from app.mdx import FrontmatterDumper, render_artifact, render_cache, render_mdx
+
+    artifacts = _db_artifacts(args.count) if args.from_db else _synthetic_artifacts(args.count, args.seed)
+    if not artifacts:
+        raise SystemExit("No artifacts to render")
+
+    mismatches = sum(
+        1 for artifact in artifacts if _pure_python(artifact) != render_mdx(artifact.frontmatter, artifact.body_mdx)
+    )
+    render_cache.clear()
+    render_cache.max_entries = max(render_cache.max_entries, len(artifacts))
+
+    print(f"artifacts: {len(artifacts)}  dumper: {FrontmatterDumper.__name__}  output mismatches: {mismatches}")
+    print(f"{'strategy':<28}{'total ms':>10}{'us/render':>12}")
+    baseline = _time("yaml.safe_dump", _pure_python, artifacts)
+    dumper = _time(FrontmatterDumper.__name__, lambda artifact: render_mdx(artifact.frontmatter, artifact.body_mdx), artifacts)
+    _time("render_artifact (cold)", render_artifact, artifacts)
+    cached = _time("render_artifact (warm)", render_artifact, artifacts)
+    print(f"speedup: dumper x{baseline / dumper:.1f}, warm cache x{baseline / cached:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from openai import OpenAI
+
+CANNED_RESPONSE = {
+    "id": "resp_bench",
+    "object": "response",
+    "created_at": 0,
+    "model": "bench-model",
+    "status": "completed",
+    "output": [
+        {
+            "id": "msg_bench",
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": "{}", "annotations": []}],
+        }
+    ],
+    "parallel_tool_calls": False,
+    "tool_choice": "auto",
+    "tools": [],
+}
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(CANNED_RESPONSE).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+def _call(client: OpenAI) -> None:
+    client.responses.create(model="bench-model", input="ping")
+
+
+def _measure(calls: int, base_url: str, shared: bool) -> list[float]:
+    from app.openai_client import get_openai_client
+
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        if shared:
+            _call(get_openai_client())
+        else:
+            client = OpenAI(api_key="bench", base_url=base_url)
+            _call(client)
+            client.close()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-call overhead of a fresh OpenAI client vs the shared pooled client.")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--base-url", help="Existing OpenAI-compatible endpoint (e.g. a TLS stand-in); defaults to a local HTTP server")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    from app.config import settings
+
+    settings.openai_base_url = base_url
+    settings.openai_api_key = settings.openai_api_key or "bench"
+
+    try:
+        results = {
+            "fresh client": _measure(args.calls, base_url, shared=False),
+            "shared client": _measure(args.calls, base_url, shared=True),
+        }
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print(f"{'mode':<16}{'calls':>8}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode, latencies in results.items():
+        ordered = sorted(latencies)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        print(
+            f"{mode:<16}{len(latencies):>8}{statistics.mean(latencies) * 1000:>10.2f}"
+            f"{statistics.median(latencies) * 1000:>10.2f}{p99 * 1000:>10.2f}"
+        )
+    saved = statistics.mean(results["fresh client"]) - statistics.mean(results["shared client"])
+    print(f"per-call overhead saved: {saved * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
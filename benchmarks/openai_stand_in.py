@@ -0,0 +1,425 @@
+import argparse
+import email.parser
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from uuid import uuid4
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+_BATCH_PHASES = ((0.1, "validating"), (0.9, "in_progress"), (1.0, "finalizing"))
+
+
+class StandInState:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.canned_output = json.loads(open(args.canned_output).read()) if args.canned_output else None
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.files: dict[str, dict[str, Any]] = {}
+        self.batches: dict[str, dict[str, Any]] = {}
+        self.window_started = time.monotonic()
+        self.window_requests = 0
+        self.window_tokens = 0
+        self.counts: dict[str, int] = {}
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def chance(self, rate: float) -> bool:
+        with self.lock:
+            return rate > 0 and self.rng.random() < rate
+
+    def latency_seconds(self) -> float:
+        args = self.args
+        with self.lock:
+            if args.latency == "uniform":
+                factor = self.rng.uniform(max(0.0, 1 - args.latency_spread), 1 + args.latency_spread)
+            elif args.latency == "lognormal":
+                factor = math.exp(self.rng.gauss(0.0, args.latency_spread))
+            else:
+                factor = 1.0
+        return args.latency_ms * factor / 1000
+
+    def admit(self, tokens: int) -> tuple[bool, dict[str, str]]:
+        # Fixed one-minute window, enough to exercise the client's limiter and its 429 handling.
+        args = self.args
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_started >= 60:
+                self.window_started, self.window_requests, self.window_tokens = now, 0, 0
+            reset = f"{max(0.0, 60 - (now - self.window_started)):.3f}s"
+            over = (args.rpm and self.window_requests >= args.rpm) or (args.tpm and self.window_tokens + tokens > args.tpm)
+            if not over:
+                self.window_requests += 1
+                self.window_tokens += tokens
+            headers = {}
+            if args.rpm:
+                headers["x-ratelimit-limit-requests"] = str(args.rpm)
+                headers["x-ratelimit-remaining-requests"] = str(max(args.rpm - self.window_requests, 0))
+                headers["x-ratelimit-reset-requests"] = reset
+            if args.tpm:
+                headers["x-ratelimit-limit-tokens"] = str(args.tpm)
+                headers["x-ratelimit-remaining-tokens"] = str(max(args.tpm - self.window_tokens, 0))
+                headers["x-ratelimit-reset-tokens"] = reset
+            return not over, headers
+
+
+def _prompt_topic(request: dict[str, Any]) -> dict[str, Any]:
+    for message in request.get("input") or []:
+        if not isinstance(message, dict) or message.get("role") != "user":
+            continue
+        for content in message.get("content") or []:
+            try:
+                return json.loads(content.get("text", "")).get("topic") or {}
+            except (ValueError, AttributeError):
+                return {}
+    return {}
+
+
+def structured_output(state: StandInState, request: dict[str, Any]) -> str:
+    if state.chance(state.args.invalid_output_rate):
+        return '{"meta": {}, "artifacts": {"fr": '
+    if state.canned_output is not None:
+        return json.dumps(state.canned_output)
+
+    topic = _prompt_topic(request)
+    slug = topic.get("slug") or "stand-in"
+    paragraph = " ".join(f"word{index}" for index in range(state.args.body_words))
+    artifacts = {}
+    for lang in ("fr", "en"):
+        title = (topic.get(lang) or {}).get("title") or slug
+        artifacts[lang] = {
+            "frontmatter": {"title": title, "description": f"{title} ({lang})", "slug": slug, "tags": ["stand-in"]},
+            "body_mdx": f"# {title}\n\n{paragraph}\n",
+        }
+    meta = {"claims_to_verify": [], "questions_for_author": [], "diagram_suggestions": [], "tables_to_include": []}
+    return json.dumps({"meta": meta, "artifacts": artifacts}, ensure_ascii=False)
+
+
+def response_body(state: StandInState, request: dict[str, Any], text: str, input_tokens: int) -> dict[str, Any]:
+    output_tokens = max(1, len(text) // 4)
+    return {
+        "id": f"resp_{uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": request.get("model") or "stand-in",
+        "status": "completed",
+        "output": [
+            {
+                "id": f"msg_{uuid4().hex}",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+def _batch_output_line(state: StandInState, line: bytes) -> str:
+    request = json.loads(line)
+    row: dict[str, Any] = {"id": f"batch_req_{uuid4().hex}", "custom_id": request.get("custom_id"), "error": None}
+    if state.chance(state.args.batch_error_rate):
+        body = {"error": {"message": "Stand-in batch item failure", "type": "server_error"}}
+        row["response"] = {"status_code": 500, "request_id": uuid4().hex, "body": body}
+    else:
+        body = response_body(state, request["body"], structured_output(state, request["body"]), len(line) // 4)
+        row["response"] = {"status_code": 200, "request_id": uuid4().hex, "body": body}
+    return json.dumps(row, ensure_ascii=False)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "StandInServer"
+
+    @property
+    def state(self) -> StandInState:
+        return self.server.state
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+    def _send_json(self, payload: Any, status: int = 200, headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, error_type: str, headers: dict[str, str] | None = None) -> None:
+        self._send_json({"error": {"message": message, "type": error_type, "code": None}}, status, headers)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self) -> None:
+        body = self._read_body()
+        if self.path.endswith("/responses"):
+            self._create_response(json.loads(body or b"{}"))
+        elif self.path.endswith("/files"):
+            self._create_file(body)
+        elif self.path.endswith("/batches"):
+            self._create_batch(json.loads(body or b"{}"))
+        else:
+            self._send_error(404, f"Unknown path {self.path}", "invalid_request_error")
+
+    def do_GET(self) -> None:
+        parts = self.path.split("?", 1)[0].rstrip("/").split("/")
+        if len(parts) >= 3 and parts[-3] == "files" and parts[-1] == "content":
+            self._file_content(parts[-2])
+        elif len(parts) >= 2 and parts[-2] == "files":
+            self._file_object(parts[-1])
+        elif len(parts) >= 2 and parts[-2] == "batches":
+            self._retrieve_batch(parts[-1])
+        else:
+            self._send_error(404, f"Unknown path {self.path}", "invalid_request_error")
+
+    def _create_response(self, request: dict[str, Any]) -> None:
+        state = self.state
+        state.count("responses")
+        input_tokens = len(json.dumps(request)) // 4
+        admitted, headers = state.admit(input_tokens)
+        if not admitted or state.chance(state.args.rate_limit_rate):
+            state.count("responses_429")
+            headers.setdefault("x-ratelimit-reset-requests", "1s")
+            self._send_error(429, "Rate limit reached (stand-in)", "requests", {**headers, "retry-after": "1"})
+            return
+
+        latency = state.latency_seconds()
+        if state.chance(state.args.error_rate):
+            state.count("responses_500")
+            time.sleep(latency)
+            self._send_error(500, "Stand-in server error", "server_error", headers)
+            return
+
+        body = response_body(state, request, structured_output(state, request), input_tokens)
+        if request.get("stream"):
+            self._stream_response(body, latency, headers)
+        else:
+            time.sleep(latency)
+            self._send_json(body, headers=headers)
+
+    def _stream_response(self, body: dict[str, Any], latency: float, headers: dict[str, str]) -> None:
+        text = body["output"][0]["content"][0]["text"]
+        chunks = max(1, self.state.args.stream_chunks)
+        size = math.ceil(len(text) / chunks) or 1
+        deltas = [text[start : start + size] for start in range(0, len(text), size)] or [""]
+        in_progress = {**body, "status": "in_progress", "output": [], "usage": None}
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.close_connection = True
+
+        sequence = 0
+
+        def emit(event: dict[str, Any]) -> None:
+            nonlocal sequence
+            event["sequence_number"] = sequence
+            sequence += 1
+            self.wfile.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        # A fifth of the latency goes to the first token, the rest is spread over the deltas.
+        time.sleep(latency * 0.2)
+        emit({"type": "response.created", "response": in_progress})
+        item_id = body["output"][0]["id"]
+        for delta in deltas:
+            time.sleep(latency * 0.8 / len(deltas))
+            emit({"type": "response.output_text.delta", "item_id": item_id, "output_index": 0, "content_index": 0, "delta": delta, "logprobs": []})
+        emit({"type": "response.completed", "response": body})
+
+    def _create_file(self, body: bytes) -> None:
+        state = self.state
+        state.count("files.create")
+        message = email.parser.BytesParser().parsebytes(
+            f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode("latin-1") + body
+        )
+        content, filename, purpose = b"", "upload.jsonl", "batch"
+        for part in message.get_payload() if message.is_multipart() else []:
+            name = part.get_param("name", header="content-disposition")
+            if name == "file":
+                content = part.get_payload(decode=True) or b""
+                filename = part.get_filename() or filename
+            elif name == "purpose":
+                purpose = (part.get_payload(decode=True) or b"batch").decode()
+        file_object = self._register_file(content, filename, purpose)
+        self._send_json(file_object)
+
+    def _register_file(self, content: bytes, filename: str, purpose: str) -> dict[str, Any]:
+        file_id = f"file-{uuid4().hex}"
+        file_object = {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+        }
+        with self.state.lock:
+            self.state.files[file_id] = {"object": file_object, "content": content}
+        return file_object
+
+    def _file_object(self, file_id: str) -> None:
+        stored = self.state.files.get(file_id)
+        if stored is None:
+            self._send_error(404, f"No such file {file_id}", "invalid_request_error")
+            return
+        self._send_json(stored["object"])
+
+    def _file_content(self, file_id: str) -> None:
+        self.state.count("files.content")
+        stored = self.state.files.get(file_id)
+        if stored is None:
+            self._send_error(404, f"No such file {file_id}", "invalid_request_error")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(stored["content"])))
+        self.end_headers()
+        self.wfile.write(stored["content"])
+
+    def _create_batch(self, request: dict[str, Any]) -> None:
+        state = self.state
+        state.count("batches.create")
+        stored = state.files.get(request.get("input_file_id", ""))
+        if stored is None:
+            self._send_error(400, "input_file_id not found", "invalid_request_error")
+            return
+        total = sum(1 for line in stored["content"].splitlines() if line.strip())
+        batch = {
+            "id": f"batch_{uuid4().hex}",
+            "object": "batch",
+            "endpoint": request.get("endpoint", "/v1/responses"),
+            "input_file_id": request["input_file_id"],
+            "completion_window": request.get("completion_window", "24h"),
+            "status": "validating",
+            "created_at": int(time.time()),
+            "request_counts": {"total": total, "completed": 0, "failed": 0},
+        }
+        with state.lock:
+            state.batches[batch["id"]] = {"object": batch, "started": time.monotonic()}
+        self._send_json(batch)
+
+    def _retrieve_batch(self, batch_id: str) -> None:
+        state = self.state
+        completing = False
+        with state.lock:
+            stored = state.batches.get(batch_id)
+            if stored is not None:
+                batch = stored["object"]
+                if batch["status"] != "completed" and not stored.get("completing"):
+                    progress = (time.monotonic() - stored["started"]) / max(state.args.batch_seconds, 0.001)
+                    status = next((name for bound, name in _BATCH_PHASES if progress < bound), "completed")
+                    if status == "in_progress" and "in_progress_at" not in batch:
+                        batch["in_progress_at"] = int(time.time())
+                    # Exactly one retrieve claims completion; concurrent ones keep reporting finalizing.
+                    completing = status == "completed"
+                    stored["completing"] = completing
+                    batch["status"] = "finalizing" if completing else status
+                snapshot = dict(batch)
+        if stored is None:
+            self._send_error(404, f"No such batch {batch_id}", "invalid_request_error")
+            return
+        self._send_json(self._complete_batch(stored) if completing else snapshot)
+
+    def _complete_batch(self, stored: dict[str, Any]) -> dict[str, Any]:
+        state = self.state
+        batch = stored["object"]
+        lines = [line for line in state.files[batch["input_file_id"]]["content"].splitlines() if line.strip()]
+        output = [_batch_output_line(state, line) for line in lines]
+        failed = sum('"status_code": 500' in line for line in output)
+        output_file = self._register_file(("\n".join(output) + "\n").encode("utf-8"), "output.jsonl", "batch_output")
+        with state.lock:
+            batch.update(
+                status="completed",
+                output_file_id=output_file["id"],
+                completed_at=int(time.time()),
+                request_counts={"total": len(lines), "completed": len(lines) - failed, "failed": failed},
+            )
+            stored["completing"] = False
+            return dict(batch)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: tuple[str, int], state: StandInState) -> None:
+        super().__init__(address, StandInHandler)
+        self.state = state
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+def start_stand_in(args: argparse.Namespace, host: str = "127.0.0.1", port: int = 0) -> StandInServer:
+    server = StandInServer((host, port), StandInState(args))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_stand_in_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("OpenAI stand-in")
+    group.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal", help="Model latency distribution")
+    group.add_argument("--latency-ms", type=float, default=800.0, help="Median model latency")
+    group.add_argument("--latency-spread", type=float, default=0.5, help="Lognormal sigma, or +/- fraction for uniform")
+    group.add_argument("--stream-chunks", type=int, default=20, help="Text deltas per streamed response")
+    group.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses.create calls answered with 500")
+    group.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of responses.create calls answered with 429")
+    group.add_argument("--invalid-output-rate", type=float, default=0.0, help="Fraction of outputs that are truncated JSON")
+    group.add_argument("--rpm", type=int, default=0, help="Requests per minute before 429s (0 = unlimited)")
+    group.add_argument("--tpm", type=int, default=0, help="Tokens per minute before 429s (0 = unlimited)")
+    group.add_argument("--body-words", type=int, default=400, help="Words per generated body_mdx")
+    group.add_argument("--canned-output", help="JSON file returned as the structured output instead of a generated one")
+    group.add_argument("--batch-seconds", type=float, default=5.0, help="Time from batches.create to completed")
+    group.add_argument("--batch-error-rate", type=float, default=0.0, help="Fraction of batch output rows that fail")
+    group.add_argument("--seed", type=int, help="Random seed for latency and error sampling")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI responses, files and batches endpoints.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    add_stand_in_arguments(parser)
+    args = parser.parse_args()
+
+    server = StandInServer((args.host, args.port), StandInState(args))
+    print(f"OpenAI stand-in listening on {server.base_url} (set OPENAI_BASE_URL to it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.state.counts, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()